@@ -0,0 +1,33 @@
+from abc import ABC, abstractmethod
+from typing import Any, Dict
+
+class Cache(ABC):
+    @abstractmethod
+    def get(self, key: str) -> Any | None:
+        """Get a value, or None if the key is missing or expired"""
+        pass
+
+    @abstractmethod
+    def set(self, key: str, value: Any) -> None:
+        """Store a value"""
+        pass
+
+    @abstractmethod
+    def increment(self, key: str, amount: int = 1) -> None:
+        """Add to a numeric value in place, keeping its expiry. Missing keys stay missing"""
+        pass
+
+    @abstractmethod
+    def delete(self, key: str) -> None:
+        """Remove a value if present"""
+        pass
+
+    @abstractmethod
+    def clear(self) -> None:
+        """Remove every value"""
+        pass
+
+    @abstractmethod
+    def stats(self) -> Dict[str, int]:
+        """Get hit, miss and eviction counters"""
+        pass
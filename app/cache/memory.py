@@ -0,0 +1,88 @@
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict
+
+from app.cache import Cache
+
+class InMemoryCache(Cache):
+    """Bounded in-process cache with LRU eviction and per-entry TTL.
+
+    Attributes:
+        max_size (int): Maximum number of entries kept before evicting the least recently used.
+        ttl (float): Seconds an entry stays valid after being stored.
+    """
+
+    def __init__(self, max_size: int = 10000, ttl: float = 60.0) -> None:
+        """Initialize the cache.
+
+        Args:
+            max_size (int, optional): Maximum number of entries. Defaults to 10000.
+            ttl (float, optional): Entry lifetime in seconds. Defaults to 60.
+        """
+        self.max_size = max_size
+        self.ttl = ttl
+        self._entries: OrderedDict[str, tuple[float, Any]] = OrderedDict()
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+        self._expirations = 0
+
+    def get(self, key: str) -> Any | None:
+        """Get a value, or None if the key is missing or expired"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self._misses += 1
+                return None
+            expires_at, value = entry
+            if expires_at <= time.monotonic():
+                del self._entries[key]
+                self._expirations += 1
+                self._misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self._hits += 1
+            return value
+
+    def set(self, key: str, value: Any) -> None:
+        """Store a value, evicting the least recently used entry when full"""
+        with self._lock:
+            self._entries[key] = (time.monotonic() + self.ttl, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+                self._evictions += 1
+
+    def increment(self, key: str, amount: int = 1) -> None:
+        """Add to a numeric value in place, keeping its expiry. Missing or expired keys stay missing"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return
+            expires_at, value = entry
+            if expires_at <= time.monotonic():
+                return
+            self._entries[key] = (expires_at, value + amount)
+
+    def delete(self, key: str) -> None:
+        """Remove a value if present"""
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def clear(self) -> None:
+        """Remove every value"""
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> Dict[str, int]:
+        """Get hit, miss, eviction and expiration counters and the current size"""
+        with self._lock:
+            return {
+                "hits": self._hits,
+                "misses": self._misses,
+                "evictions": self._evictions,
+                "expirations": self._expirations,
+                "size": len(self._entries),
+            }
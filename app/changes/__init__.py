@@ -0,0 +1,15 @@
+from abc import ABC, abstractmethod
+from typing import List
+
+from app.schemas.user import ChangeEvent
+
+class ChangeSink(ABC):
+    @abstractmethod
+    def position(self) -> int:
+        """Get the sequence number of the last change delivered, 0 if none"""
+        pass
+
+    @abstractmethod
+    def deliver(self, changes: List[ChangeEvent]) -> None:
+        """Deliver a batch of changes, in order"""
+        pass
@@ -0,0 +1,83 @@
+import logging
+import threading
+
+from app.changes import ChangeSink
+from app.database import Database
+from app.repositories.change_repository import ChangeRepository
+from app.schemas.user import ChangeEvent
+from app.utils.metrics import CHANGES_DISPATCHED
+
+logger = logging.getLogger(__name__)
+
+class ChangeDispatcher:
+    """Background thread delivering the user change log to a sink in batches.
+
+    Delivery is at least once: the sink's position only moves after a batch
+    is delivered, so a batch interrupted by a crash is delivered again.
+
+    Attributes:
+        database (Database): Database the change log is read from.
+        sink (ChangeSink): Destination of the changes.
+        batch_size (int): Maximum number of changes per delivery.
+        interval (float): Seconds to wait between polls once caught up.
+    """
+
+    def __init__(self, database: Database, sink: ChangeSink, batch_size: int = 500, interval: float = 1.0) -> None:
+        """Initialize the dispatcher.
+
+        Args:
+            database (Database): Database the change log is read from.
+            sink (ChangeSink): Destination of the changes.
+            batch_size (int, optional): Maximum number of changes per delivery. Defaults to 500.
+            interval (float, optional): Seconds to wait between polls once caught up. Defaults to 1.
+        """
+        self.database = database
+        self.sink = sink
+        self.batch_size = batch_size
+        self.interval = interval
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+
+    def dispatch(self) -> int:
+        """Deliver every pending change.
+
+        Returns:
+            int: Number of changes delivered.
+        """
+        delivered = 0
+        while True:
+            for session in self.database.get_session():
+                changes = ChangeRepository(session).get_since(self.sink.position(), self.batch_size)
+            if not changes:
+                return delivered
+            self.sink.deliver([ChangeEvent.model_validate(change) for change in changes])
+            CHANGES_DISPATCHED.inc(amount=len(changes))
+            delivered += len(changes)
+            logger.debug("Delivered changes up to: %s", changes[-1].seq)
+            if len(changes) < self.batch_size:
+                return delivered
+
+    def start(self) -> None:
+        """Start delivering in a background thread, unless already started"""
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="change-dispatcher", daemon=True)
+        self._thread.start()
+        logger.info("Change dispatcher started from position: %s", self.sink.position())
+
+    def stop(self) -> None:
+        """Stop the background thread after its current delivery"""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+            logger.info("Change dispatcher stopped at position: %s", self.sink.position())
+
+    def _run(self) -> None:
+        while not self._stop.is_set():
+            try:
+                self.dispatch()
+            except Exception:
+                logger.exception("Change delivery failed, retrying in %s seconds", self.interval)
+            self._stop.wait(self.interval)
@@ -0,0 +1,59 @@
+import json
+import os
+from typing import List
+
+from app.changes import ChangeSink
+from app.schemas.user import ChangeEvent
+
+# Bytes read from the end of the file at a time when looking for the last line.
+TAIL_BLOCK_SIZE = 4096
+
+class FileSink(ChangeSink):
+    """Sink appending changes to a file as NDJSON, one change per line.
+
+    The position is read back from the last line of the file, so delivery
+    resumes where it stopped after a restart.
+
+    Attributes:
+        path (str): File the changes are appended to.
+    """
+
+    def __init__(self, path: str) -> None:
+        """Initialize the sink.
+
+        Args:
+            path (str): File the changes are appended to, created if missing.
+        """
+        self.path = path
+        self._position = self._read_position()
+
+    def position(self) -> int:
+        """Get the sequence number of the last change delivered, 0 if none"""
+        return self._position
+
+    def deliver(self, changes: List[ChangeEvent]) -> None:
+        """Append the batch to the file and flush it to disk"""
+        with open(self.path, "ab") as file:
+            file.write(b"".join(change.model_dump_json().encode() + b"\n" for change in changes))
+            file.flush()
+            os.fsync(file.fileno())
+        self._position = changes[-1].seq
+
+    def _read_position(self) -> int:
+        """Read the sequence number of the last complete line of the file"""
+        try:
+            file = open(self.path, "rb")
+        except FileNotFoundError:
+            return 0
+        with file:
+            end = start = file.seek(0, os.SEEK_END)
+            while start > 0:
+                start = max(0, start - TAIL_BLOCK_SIZE)
+                file.seek(start)
+                lines = file.read(end - start).split(b"\n")
+                # The piece after the last newline is an unfinished write, and the
+                # first one may be cut by the block boundary.
+                complete = [line for line in lines[1 if start else 0:-1] if line]
+                if complete:
+                    return json.loads(complete[-1])["seq"]
+            return 0
@@ -0,0 +1,34 @@
+import queue
+from typing import List
+
+from app.changes import ChangeSink
+from app.schemas.user import ChangeEvent
+
+class QueueSink(ChangeSink):
+    """Sink putting every batch of changes on an in-process queue.
+
+    Stands in for a message broker. The position is not persisted, so a new
+    sink starts from the beginning of the change log.
+
+    Attributes:
+        queue (queue.Queue): Queue receiving one list of changes per batch.
+    """
+
+    def __init__(self, maxsize: int = 0) -> None:
+        """Initialize the sink.
+
+        Args:
+            maxsize (int, optional): Maximum number of queued batches, 0 for no limit.
+                Delivery blocks while the queue is full. Defaults to 0.
+        """
+        self.queue: queue.Queue = queue.Queue(maxsize)
+        self._position = 0
+
+    def position(self) -> int:
+        """Get the sequence number of the last change delivered, 0 if none"""
+        return self._position
+
+    def deliver(self, changes: List[ChangeEvent]) -> None:
+        """Put the batch on the queue"""
+        self.queue.put(changes)
+        self._position = changes[-1].seq
@@ -0,0 +1,42 @@
+import asyncio
+import threading
+from contextlib import contextmanager
+from typing import Iterator, Set, Tuple
+
+class ChangeNotifier:
+    """Wakes up requests waiting for changes when changes are committed in this process.
+
+    Writers call ``notify`` from any thread. Waiters are asyncio events, each
+    set on the loop of the request that registered it.
+
+    Attributes:
+        generation (int): Number of ``notify`` calls so far. Work started under an
+            earlier generation may not see the latest writes of this process.
+    """
+
+    def __init__(self) -> None:
+        self.generation = 0
+        self._waiters: Set[Tuple[asyncio.AbstractEventLoop, asyncio.Event]] = set()
+        self._lock = threading.Lock()
+
+    def notify(self) -> None:
+        """Advance the generation and wake up every registered waiter"""
+        with self._lock:
+            self.generation += 1
+            waiters = list(self._waiters)
+        for loop, event in waiters:
+            loop.call_soon_threadsafe(event.set)
+
+    @contextmanager
+    def listen(self) -> Iterator[asyncio.Event]:
+        """Register an event set by every following ``notify``, for the duration of the block"""
+        waiter = (asyncio.get_running_loop(), asyncio.Event())
+        with self._lock:
+            self._waiters.add(waiter)
+        try:
+            yield waiter[1]
+        finally:
+            with self._lock:
+                self._waiters.discard(waiter)
+
+CHANGE_NOTIFIER = ChangeNotifier()
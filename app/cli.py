@@ -0,0 +1,50 @@
+import argparse
+import sys
+from pathlib import Path
+from typing import Iterator
+
+from app.config import get_settings
+from app.dependencies import Services
+from app.repositories.user_repository import UserRepository
+from app.utils.user_import import PARSERS, import_users
+
+CHUNK_SIZE = 1 << 16
+
+def read_chunks(path: Path) -> Iterator[bytes]:
+    """Read a file, or stdin for "-", in fixed-size chunks"""
+    if str(path) == "-":
+        yield from iter(lambda: sys.stdin.buffer.read(CHUNK_SIZE), b"")
+        return
+    with path.open("rb") as file:
+        yield from iter(lambda: file.read(CHUNK_SIZE), b"")
+
+def import_users_command(args: argparse.Namespace) -> int:
+    """Import users from an NDJSON or CSV file into the configured database"""
+    file_format = args.format or ("csv" if args.path.suffix == ".csv" else "ndjson")
+    db = Services(get_settings()).db
+    db.create_db_and_tables()
+    for session in db.get_session():
+        summary = import_users(
+            UserRepository(session),
+            read_chunks(args.path),
+            format=file_format,
+            batch_size=args.batch_size,
+        )
+    print(summary.model_dump_json(indent=2))
+    return 0 if summary.rejected == 0 else 1
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m app.cli", description="User Management API commands")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    import_parser = commands.add_parser("import-users", help=import_users_command.__doc__)
+    import_parser.add_argument("path", type=Path, help="file to import, or - for stdin")
+    import_parser.add_argument("--format", choices=list(PARSERS), help="defaults to csv for .csv files, ndjson otherwise")
+    import_parser.add_argument("--batch-size", type=int, default=get_settings().import_batch_size)
+    import_parser.set_defaults(handler=import_users_command)
+
+    args = parser.parse_args(argv)
+    return args.handler(args)
+
+if __name__ == "__main__":
+    sys.exit(main())
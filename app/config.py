@@ -0,0 +1,135 @@
+import os
+from functools import lru_cache
+from typing import List, Literal
+
+from pydantic import BaseModel, field_validator
+
+class Settings(BaseModel):
+    """Application settings.
+
+    Every attribute can be overridden with the environment variable of the same
+    name in upper case, e.g. ``DATABASE_URL`` or ``DATABASE_ASYNC``.
+
+    Attributes:
+        log_level (str): Level of the application logs. Defaults to "INFO".
+        log_format (str): "text" for human readable lines or "json" for one JSON
+            object per line, both including the request ID. Defaults to "text".
+        database_url (str): SQLAlchemy URL of the database. ``sqlite://`` URLs use
+            ``SQLiteDatabase`` and ``postgresql://`` URLs use ``PostgreSQLDatabase``.
+        database_async (bool): Serve the user routes with the async database layer
+            instead of the threadpool-bound sync one. Defaults to False.
+        database_echo (bool): Log every SQL statement. Defaults to False.
+        database_init_schema (bool): Create missing tables and columns on startup.
+            ``app.server`` does it once before starting the workers and turns it off
+            for them. Defaults to True.
+        database_replica_urls (List[str]): URLs of read replicas, comma separated in the
+            environment. For SQLite, a replica can be a read-only connection to the WAL
+            database, e.g. ``sqlite:///file:database.db?mode=ro&uri=true``. Defaults to none.
+        database_read_your_writes (float): Seconds after a write during which reads
+            are served by the primary. Defaults to 0 (disabled).
+        sqlite_profile (str): Set of pragmas applied to every SQLite connection, one of
+            ``SQLITE_PROFILES``. Defaults to "performance" (WAL journaling).
+        database_pool_size (int): Connections kept open in the pool. Defaults to 5.
+        database_max_overflow (int): Extra connections opened when the pool is
+            exhausted. Defaults to 10.
+        database_pool_timeout (float): Seconds to wait for a free connection before
+            failing. Defaults to 30.
+        database_pool_recycle (int): Seconds after which a PostgreSQL connection is
+            replaced. Defaults to 1800.
+        database_statement_timeout (int): Milliseconds after which PostgreSQL cancels
+            a statement. Defaults to 30000.
+        import_batch_size (int): Default number of rows written per transaction by
+            user imports. Defaults to 1000.
+        user_cache_enabled (bool): Cache users looked up by ID in process. Defaults to True,
+            except that ``app.server`` disables it with more than one worker unless set.
+        user_cache_max_size (int): Maximum number of cached users. Defaults to 10000.
+        user_cache_ttl (float): Seconds a cached user stays valid. Bounds staleness
+            when several instances write to the same database. Defaults to 30.
+        user_count_ttl (float): Seconds after which a cached user count is recomputed
+            with ``COUNT(*)``, reconciling writes made by other instances. Defaults to 60.
+        web_workers (int): Worker processes started by ``app.server``. Defaults to 0,
+            one per CPU core.
+        change_sink_path (str): File the user change log is delivered to as NDJSON by
+            a background dispatcher. ``app.server`` runs it in the parent process
+            only. Defaults to "" (no dispatcher).
+        change_dispatch_interval (float): Seconds between change log polls once the
+            dispatcher caught up. Defaults to 1.
+        change_dispatch_batch_size (int): Maximum number of changes per delivery.
+            Defaults to 500.
+        admission_max_reads (int): GET requests served at once per worker. 0 disables
+            the limit. Defaults to 64.
+        admission_max_writes (int): Write requests served at once per worker. 0 disables
+            the limit. Defaults to 16.
+        admission_queue_size (int): Requests of each budget waiting for a slot before
+            new ones are rejected with 503. Defaults to 100.
+        admission_queue_timeout (float): Seconds a request waits for a slot before it
+            is rejected with 503. Defaults to 2.
+        admission_retry_after (int): ``Retry-After`` seconds sent with the 503.
+            Defaults to 1.
+        slow_query_threshold (float): Seconds from which a SQL statement is logged
+            with its parameters and duration. Defaults to 0 (disabled).
+        server_timing (bool): Add a ``Server-Timing`` header breaking every response
+            time down into validation, endpoint, database and serialization.
+            Defaults to False.
+        profile_sample_rate (float): Fraction of requests whose endpoint runs under
+            cProfile. Defaults to 0.
+        profile_token (str): Requests sending this value in the ``X-Profile`` header
+            are profiled. Defaults to "" (header ignored).
+        profile_dir (str): Directory profiles are saved to as ``<request id>.prof``,
+            in addition to the report logged. Defaults to "" (only logged).
+    """
+    log_level: str = "INFO"
+    log_format: Literal["text", "json"] = "text"
+    database_url: str = "sqlite:///database.db"
+    database_async: bool = False
+    database_echo: bool = False
+    database_init_schema: bool = True
+    database_replica_urls: List[str] = []
+    database_read_your_writes: float = 0.0
+    sqlite_profile: Literal["default", "performance"] = "performance"
+    database_pool_size: int = 5
+    database_max_overflow: int = 10
+    database_pool_timeout: float = 30.0
+    database_pool_recycle: int = 1800
+    database_statement_timeout: int = 30000
+    import_batch_size: int = 1000
+    user_cache_enabled: bool = True
+    user_cache_max_size: int = 10000
+    user_cache_ttl: float = 30.0
+    user_count_ttl: float = 60.0
+    web_workers: int = 0
+    change_sink_path: str = ""
+    change_dispatch_interval: float = 1.0
+    change_dispatch_batch_size: int = 500
+    admission_max_reads: int = 64
+    admission_max_writes: int = 16
+    admission_queue_size: int = 100
+    admission_queue_timeout: float = 2.0
+    admission_retry_after: int = 1
+    slow_query_threshold: float = 0.0
+    server_timing: bool = False
+    profile_sample_rate: float = 0.0
+    profile_token: str = ""
+    profile_dir: str = ""
+
+    @field_validator("database_replica_urls", mode="before")
+    @classmethod
+    def split_urls(cls, value: str | List[str]) -> List[str]:
+        if isinstance(value, str):
+            return [url.strip() for url in value.split(",") if url.strip()]
+        return value
+
+    @classmethod
+    def from_env(cls) -> "Settings":
+        """Build the settings from environment variables"""
+        values = {
+            name: os.environ[name.upper()]
+            for name in cls.model_fields
+            if name.upper() in os.environ
+        }
+        return cls(**values)
+
+@lru_cache
+def get_settings() -> Settings:
+    """Get the application settings, read once from the environment"""
+    return Settings.from_env()
@@ -19,7 +19,11 @@ class Database(ABC):
         """Get database session"""
         pass
 
+    def get_read_session(self) -> Generator[Session, None, None]:
+        """Get database session for read-only work, the regular session unless overridden"""
+        yield from self.get_session()
+
     @abstractmethod
     def get_engine(self) -> Any:
         """Get database engine"""
-        pass 
\ No newline at end of file
+        pass
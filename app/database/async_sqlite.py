@@ -0,0 +1,82 @@
+import logging
+from typing import AsyncGenerator, Any, Dict
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncEngine, create_async_engine
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from app.database import Database
+from app.database.instrumentation import instrument_engine
+from app.database.migrations import create_schema
+from app.database.sqlite import apply_pragmas
+
+logger = logging.getLogger(__name__)
+
+def to_async_url(url: str) -> str:
+    """Convert a sqlite:// URL into one using the aiosqlite driver"""
+    if url.startswith("sqlite://"):
+        return "sqlite+aiosqlite://" + url[len("sqlite://"):]
+    return url
+
+class AsyncSQLiteDatabase(Database):
+    def __init__(
+        self,
+        url: str,
+        pragmas: Dict[str, Any] | None = None,
+        slow_query_threshold: float | None = None,
+        **kwargs: Any
+    ) -> None:
+        """Initialize async SQLite database connection
+
+        Args:
+            url (str): Database URL in format sqlite+aiosqlite:///path/to/database.db
+            pragmas (Dict[str, Any] | None): Pragmas to set on every new connection.
+                Defaults to None.
+            slow_query_threshold (float | None): Seconds from which statements are
+                logged as slow. Defaults to None (disabled).
+            **kwargs: Additional arguments
+        """
+        self.url = url
+        self.pragmas = pragmas or {}
+        self.slow_query_threshold = slow_query_threshold
+        self.kwargs = kwargs
+        self._engine = None
+
+    def get_engine(self) -> AsyncEngine:
+        """Get or create async SQLite engine"""
+        if self._engine is None:
+            logger.debug("Creating new async SQLite engine with URL: %s", self.url)
+            self._engine = create_async_engine(
+                self.url,
+                **self.kwargs
+            )
+            instrument_engine(self._engine.sync_engine, self.slow_query_threshold)
+            if self.pragmas:
+                event.listen(self._engine.sync_engine, "connect", self._on_connect)
+        return self._engine
+
+    def _on_connect(self, dbapi_connection: Any, connection_record: Any) -> None:
+        """Apply the configured pragmas to a newly opened connection"""
+        apply_pragmas(dbapi_connection, self.pragmas)
+
+    async def create_db_and_tables(self) -> None:
+        """Create database and tables"""
+        logger.info("Creating SQLite database and tables")
+        async with self.get_engine().begin() as connection:
+            await connection.run_sync(create_schema)
+
+    async def get_session(self) -> AsyncGenerator[AsyncSession, None]:
+        """Get async database session
+
+        Objects are not expired on commit, since lazy-loading expired attributes
+        is not possible outside of an awaitable context.
+        """
+        logger.debug("Creating new async SQLite database session")
+        async with AsyncSession(self.get_engine(), expire_on_commit=False) as session:
+            yield session
+
+    async def close_connection(self) -> None:
+        """Close database connection"""
+        if self._engine is not None:
+            logger.info("Closing async SQLite database connection")
+            await self._engine.dispose()
+            self._engine = None
@@ -0,0 +1,89 @@
+import logging
+import time
+from typing import Any
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from app.utils.metrics import DB_CONNECTION_HOLD, DB_POOL_CHECKOUT, DB_QUERIES, DB_QUERY_LATENCY
+from app.utils.request_context import request_stats
+
+slow_query_logger = logging.getLogger("app.database.slow_queries")
+
+# Longest parameters representation written to the slow query log.
+MAX_LOGGED_PARAMETERS = 1000
+
+def instrument_engine(engine: Engine, slow_query_threshold: float | None = None) -> None:
+    """Record statement count, statement latency, pool checkout wait and connection hold time for an engine
+
+    Timings are exported as metrics and added to the stats of the request being
+    served, if any.
+
+    Args:
+        engine (Engine): Synchronous engine, e.g. ``AsyncEngine.sync_engine``.
+        slow_query_threshold (float | None, optional): Seconds from which a statement
+            is logged as slow, with its parameters and duration. Defaults to None
+            (disabled).
+    """
+    event.listen(engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(engine, "after_cursor_execute", _after_cursor_execute)
+    if slow_query_threshold is not None:
+        # Registered after the listener that times the statement, so it runs after it.
+        event.listen(engine, "after_cursor_execute", _log_slow_query(slow_query_threshold))
+    event.listen(engine, "handle_error", _handle_error)
+    event.listen(engine, "checkout", _checkout)
+    event.listen(engine, "checkin", _checkin)
+
+    # The pool has no "before checkout" event, so time the checkout call itself.
+    pool = engine.pool
+    connect = pool.connect
+
+    def timed_connect() -> Any:
+        start = time.perf_counter()
+        try:
+            return connect()
+        finally:
+            elapsed = time.perf_counter() - start
+            DB_POOL_CHECKOUT.observe(elapsed)
+            stats = request_stats.get()
+            if stats is not None:
+                stats.pool_wait += elapsed
+
+    pool.connect = timed_connect
+
+def _checkout(dbapi_connection: Any, connection_record: Any, connection_proxy: Any) -> None:
+    connection_record.info["checked_out_at"] = time.perf_counter()
+
+def _checkin(dbapi_connection: Any, connection_record: Any) -> None:
+    checked_out_at = connection_record.info.pop("checked_out_at", None)
+    if checked_out_at is not None:
+        DB_CONNECTION_HOLD.observe(time.perf_counter() - checked_out_at)
+
+def _before_cursor_execute(connection: Any, cursor: Any, statement: str, parameters: Any, context: Any, executemany: bool) -> None:
+    connection.info.setdefault("query_start", []).append(time.perf_counter())
+
+def _after_cursor_execute(connection: Any, cursor: Any, statement: str, parameters: Any, context: Any, executemany: bool) -> None:
+    _record(connection)
+
+def _handle_error(exception_context: Any) -> None:
+    if exception_context.connection is not None and exception_context.connection.info.get("query_start"):
+        _record(exception_context.connection)
+
+def _log_slow_query(threshold: float) -> Any:
+    def log_slow_query(connection: Any, cursor: Any, statement: str, parameters: Any, context: Any, executemany: bool) -> None:
+        elapsed = connection.info["query_elapsed"]
+        if elapsed >= threshold:
+            slow_query_logger.warning(
+                "Slow query took %.1f ms: %s parameters: %.*s",
+                elapsed * 1000, statement, MAX_LOGGED_PARAMETERS, repr(parameters)
+            )
+    return log_slow_query
+
+def _record(connection: Any) -> None:
+    elapsed = time.perf_counter() - connection.info["query_start"].pop()
+    connection.info["query_elapsed"] = elapsed
+    DB_QUERIES.inc()
+    DB_QUERY_LATENCY.observe(elapsed)
+    stats = request_stats.get()
+    if stats is not None:
+        stats.db_queries += 1
+        stats.db_time += elapsed
@@ -0,0 +1,90 @@
+import logging
+from contextlib import contextmanager
+from typing import Any, Iterator, List
+
+from sqlalchemy import Column, MetaData, inspect
+from sqlalchemy.engine import Connection
+from sqlmodel import SQLModel
+
+# Registers the tables on the metadata, whoever creates the schema first.
+import app.models.user  # noqa: F401
+import app.models.user_change  # noqa: F401
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+
+logger = logging.getLogger(__name__)
+
+@contextmanager
+def file_lock(path: str) -> Iterator[None]:
+    """Hold an exclusive lock on a file, shared by every process on the host.
+
+    Used to run schema creation once when several workers start together.
+    Where ``fcntl`` is not available, the block runs without a lock.
+
+    Args:
+        path (str): Lock file, created if missing.
+    """
+    with open(path, "a") as lock_file:
+        if fcntl is not None:
+            fcntl.flock(lock_file, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            if fcntl is not None:
+                fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+def column_default(column: Column) -> Any:
+    """Get the value a new column is backfilled with, or None if it has no default"""
+    default = column.default
+    if default is None:
+        return None
+    if default.is_callable:
+        return default.arg(None)
+    if default.is_scalar:
+        return default.arg
+    return None
+
+def add_missing_columns(connection: Connection, metadata: MetaData) -> List[str]:
+    """Add columns declared on the models but missing from existing tables.
+
+    ``create_all`` only creates missing tables, so a column added to a model
+    would otherwise never reach a database created by an earlier release. Each
+    missing column is added as nullable and existing rows are backfilled with
+    its default.
+
+    Args:
+        connection (Connection): Connection to run the DDL on.
+        metadata (MetaData): Metadata describing the expected schema.
+
+    Returns:
+        List[str]: Added columns, as ``table.column``.
+    """
+    inspector = inspect(connection)
+    preparer = connection.dialect.identifier_preparer
+    added = []
+    for table in metadata.sorted_tables:
+        if not inspector.has_table(table.name):
+            continue
+        existing = {column["name"] for column in inspector.get_columns(table.name)}
+        for column in table.columns:
+            if column.name in existing:
+                continue
+            column_type = column.type.compile(dialect=connection.dialect)
+            connection.exec_driver_sql(
+                f"ALTER TABLE {preparer.format_table(table)} "
+                f"ADD COLUMN {preparer.format_column(column)} {column_type}"
+            )
+            default = column_default(column)
+            if default is not None:
+                connection.execute(table.update().values({column.name: default}))
+            logger.info("Added column %s.%s", table.name, column.name)
+            added.append(f"{table.name}.{column.name}")
+    return added
+
+def create_schema(connection: Connection) -> None:
+    """Create missing tables and add missing columns to existing ones"""
+    SQLModel.metadata.create_all(connection)
+    add_missing_columns(connection, SQLModel.metadata)
@@ -0,0 +1,76 @@
+import itertools
+import logging
+import threading
+import time
+from typing import Generator, Any, List
+from sqlalchemy import event
+from sqlmodel import Session
+
+from app.database import Database
+
+logger = logging.getLogger(__name__)
+
+class ReplicatedDatabase(Database):
+    def __init__(
+        self,
+        primary: Database,
+        replicas: List[Database] | None = None,
+        read_your_writes: float = 0.0,
+        **kwargs: Any
+    ) -> None:
+        """Initialize a primary database with read replicas
+
+        Writes always go to the primary. Read sessions rotate over the replicas,
+        unless this process committed to the primary within the last
+        ``read_your_writes`` seconds, in which case they also use the primary so
+        that a client reading right after a write sees its own changes.
+
+        Args:
+            primary (Database): Database receiving every write.
+            replicas (List[Database] | None): Databases serving reads in round-robin.
+                Defaults to None (reads go to the primary).
+            read_your_writes (float): Seconds after a commit during which reads stay
+                on the primary. Defaults to 0 (disabled).
+            **kwargs: Additional arguments
+        """
+        self.url = primary.url
+        self.primary = primary
+        self.replicas = replicas or []
+        self.read_your_writes = read_your_writes
+        self._rotation = itertools.cycle(self.replicas)
+        self._lock = threading.Lock()
+        self._last_write = float("-inf")
+
+    def get_engine(self) -> Any:
+        """Get the primary engine"""
+        return self.primary.get_engine()
+
+    def create_db_and_tables(self) -> None:
+        """Create database and tables on the primary"""
+        self.primary.create_db_and_tables()
+
+    def get_session(self) -> Generator[Session, None, None]:
+        """Get a session on the primary, recording the time of every commit"""
+        for session in self.primary.get_session():
+            event.listen(session, "after_commit", self._mark_write)
+            yield session
+
+    def get_read_session(self) -> Generator[Session, None, None]:
+        """Get a session on the next replica, or on the primary if none applies"""
+        if not self.replicas or self._within_write_window():
+            yield from self.primary.get_session()
+            return
+        with self._lock:
+            replica = next(self._rotation)
+        yield from replica.get_session()
+
+    def close_connection(self) -> None:
+        """Close primary and replica connections"""
+        for database in [self.primary, *self.replicas]:
+            database.close_connection()
+
+    def _mark_write(self, session: Session) -> None:
+        self._last_write = time.monotonic()
+
+    def _within_write_window(self) -> bool:
+        return time.monotonic() - self._last_write < self.read_your_writes
@@ -1,37 +1,87 @@
 import logging
-from typing import Generator, Any
-from sqlmodel import Session, SQLModel, create_engine
+from typing import Dict, Generator, Any
+from sqlalchemy import event
+from sqlmodel import Session, create_engine
 
 from app.database import Database
+from app.database.instrumentation import instrument_engine
+from app.database.migrations import create_schema
 
 logger = logging.getLogger(__name__)
 
+# Pragmas applied to every pooled connection by the "performance" profile.
+# WAL lets readers proceed while a writer commits, NORMAL synchronous is safe
+# under WAL (only the last transactions may be lost on power failure), and
+# busy_timeout makes competing writers wait instead of failing immediately.
+PERFORMANCE_PRAGMAS: Dict[str, Any] = {
+    "journal_mode": "WAL",
+    "synchronous": "NORMAL",
+    "cache_size": -64000,
+    "mmap_size": 268435456,
+    "temp_store": "MEMORY",
+    "busy_timeout": 5000,
+}
+
+SQLITE_PROFILES: Dict[str, Dict[str, Any]] = {
+    "default": {},
+    "performance": PERFORMANCE_PRAGMAS,
+}
+
+def apply_pragmas(dbapi_connection: Any, pragmas: Dict[str, Any]) -> None:
+    """Run ``PRAGMA name = value`` on a raw DBAPI connection for every given pragma"""
+    cursor = dbapi_connection.cursor()
+    try:
+        for name, value in pragmas.items():
+            cursor.execute(f"PRAGMA {name} = {value}")
+    finally:
+        cursor.close()
+
 class SQLiteDatabase(Database):
-    def __init__(self, url: str, **kwargs: Any) -> None:
+    def __init__(
+        self,
+        url: str,
+        pragmas: Dict[str, Any] | None = None,
+        slow_query_threshold: float | None = None,
+        **kwargs: Any
+    ) -> None:
         """Initialize SQLite database connection
         
         Args:
             url (str): Database URL in format sqlite:///path/to/database.db
+            pragmas (Dict[str, Any] | None): Pragmas to set on every new connection,
+                e.g. ``PERFORMANCE_PRAGMAS``. Defaults to None.
+            slow_query_threshold (float | None): Seconds from which statements are
+                logged as slow. Defaults to None (disabled).
             **kwargs: Additional arguments
         """
         self.url = url
+        self.pragmas = pragmas or {}
+        self.slow_query_threshold = slow_query_threshold
         self.kwargs = kwargs
         self._engine = None
 
     def get_engine(self) -> Any:
         """Get or create SQLite engine"""
         if self._engine is None:
-            logger.debug(f"Creating new SQLite engine with URL: {self.url}")
+            logger.debug("Creating new SQLite engine with URL: %s", self.url)
             self._engine = create_engine(
                 self.url,
                 **self.kwargs
             )
+            instrument_engine(self._engine, self.slow_query_threshold)
+            if self.pragmas:
+                event.listen(self._engine, "connect", self._on_connect)
         return self._engine
 
+    def _on_connect(self, dbapi_connection: Any, connection_record: Any) -> None:
+        """Apply the configured pragmas to a newly opened connection"""
+        apply_pragmas(dbapi_connection, self.pragmas)
+
     def create_db_and_tables(self) -> None:
         """Create database and tables"""
         logger.info("Creating SQLite database and tables")
-        SQLModel.metadata.create_all(self.get_engine())
+        with self.get_engine().begin() as connection:
+            create_schema(connection)
 
     def get_session(self) -> Generator[Session, None, None]:
         """Get database session"""
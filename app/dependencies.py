@@ -1,22 +1,221 @@
 import logging
-from typing import Generator
+import os
+import tempfile
+from typing import AsyncGenerator, Generator, List
+from fastapi import Depends, Request
 from sqlmodel import Session
+from sqlmodel.ext.asyncio.session import AsyncSession
 
-from app.database.sqlite import SQLiteDatabase
+from app.cache import Cache
+from app.cache.memory import InMemoryCache
+from app.changes.dispatcher import ChangeDispatcher
+from app.changes.file import FileSink
+from app.config import Settings
+from app.database import Database
+from app.database.replicated import ReplicatedDatabase
+from app.database.sqlite import SQLiteDatabase, SQLITE_PROFILES
+from app.utils.admission import AdmissionLimiter
+from app.utils.metrics import Metric, cache_metrics
 
 logger = logging.getLogger(__name__)
 
-SQLITE_FILE_NAME = "database.db"
-SQLITE_URL = f"sqlite:///{SQLITE_FILE_NAME}"
 SQLITE_CONNECT_ARGS = {"check_same_thread": False}
+# Serializes schema creation between the workers of a host.
+SCHEMA_LOCK_PATH = os.path.join(tempfile.gettempdir(), "crud-schema.lock")
 
-db = SQLiteDatabase(
-    url=SQLITE_URL,
-    connect_args=SQLITE_CONNECT_ARGS,
-    echo=True
-)
+def is_sqlite_url(url: str) -> bool:
+    return url.startswith("sqlite")
 
-def get_session() -> Generator[Session, None, None]:
+def pool_args(settings: Settings) -> dict:
+    return {
+        "pool_size": settings.database_pool_size,
+        "max_overflow": settings.database_max_overflow,
+        "pool_timeout": settings.database_pool_timeout,
+    }
+
+def create_database(url: str, settings: Settings, replica: bool = False) -> Database:
+    """Build the Database implementation matching the scheme of the URL
+
+    Args:
+        url (str): SQLAlchemy database URL.
+        settings (Settings): Settings the engine is tuned with.
+        replica (bool): Whether the database only serves reads. SQLite replicas do
+            not try to switch the journal mode, which is a write. Defaults to False.
+
+    Returns:
+        Database: ``SQLiteDatabase`` or ``PostgreSQLDatabase``.
+
+    Raises:
+        ValueError: If the URL scheme is not supported.
+    """
+    slow_query_threshold = settings.slow_query_threshold or None
+    if is_sqlite_url(url):
+        pragmas = SQLITE_PROFILES[settings.sqlite_profile]
+        if replica:
+            pragmas = {name: value for name, value in pragmas.items() if name != "journal_mode"}
+        return SQLiteDatabase(
+            url=url,
+            pragmas=pragmas,
+            connect_args=SQLITE_CONNECT_ARGS,
+            echo=settings.database_echo,
+            slow_query_threshold=slow_query_threshold,
+            **pool_args(settings)
+        )
+    if url.startswith(("postgresql", "postgres")):
+        # Imported here, so that SQLite deployments never load the PostgreSQL driver.
+        from app.database.postgres import PostgreSQLDatabase
+
+        return PostgreSQLDatabase(
+            url=url,
+            pool_recycle=settings.database_pool_recycle,
+            statement_timeout=settings.database_statement_timeout,
+            echo=settings.database_echo,
+            slow_query_threshold=slow_query_threshold,
+            **pool_args(settings)
+        )
+    raise ValueError(f"Unsupported database URL scheme: {url.split(':', 1)[0]}")
+
+def create_limiter(name: str, limit: int, settings: Settings) -> AdmissionLimiter | None:
+    """Build the admission budget of a kind of request, None when unlimited"""
+    if limit <= 0:
+        return None
+    return AdmissionLimiter(
+        name=name,
+        limit=limit,
+        queue_size=settings.admission_queue_size,
+        queue_timeout=settings.admission_queue_timeout
+    )
+
+class Services:
+    """Databases, caches and limiters shared by the requests of an application.
+
+    Built from the settings by the application factory, or by the command line
+    entry points. Nothing connects on construction: engines are created on
+    first use, so building the services is cheap.
+
+    Attributes:
+        settings (Settings): Settings the services were built from.
+        db (ReplicatedDatabase): Primary database and its read replicas.
+        async_db (Database | None): Async SQLite database, only built when
+            ``database_async`` is set.
+        user_cache (Cache | None): Users looked up by ID, None when disabled.
+        user_count_cache (Cache | None): User counts, None when disabled.
+        change_dispatcher (ChangeDispatcher | None): Delivers the change log to
+            ``change_sink_path``, None when not configured.
+        read_admission (AdmissionLimiter | None): Budget of read requests, None when unlimited.
+        write_admission (AdmissionLimiter | None): Budget of write requests, None when unlimited.
+    """
+
+    def __init__(self, settings: Settings) -> None:
+        """Build the services.
+
+        Args:
+            settings (Settings): Application settings.
+
+        Raises:
+            ValueError: If the database URL is not supported, or ``database_async`` is
+                set with a database other than SQLite.
+        """
+        self.settings = settings
+        self.db = ReplicatedDatabase(
+            primary=create_database(settings.database_url, settings),
+            replicas=[create_database(url, settings, replica=True) for url in settings.database_replica_urls],
+            read_your_writes=settings.database_read_your_writes
+        )
+
+        self.async_db = None
+        if settings.database_async:
+            if not is_sqlite_url(settings.database_url):
+                raise ValueError("DATABASE_ASYNC is only supported with SQLite database URLs")
+            # Imported here, so that the sync service does not load aiosqlite.
+            from app.database.async_sqlite import AsyncSQLiteDatabase, to_async_url
+
+            self.async_db = AsyncSQLiteDatabase(
+                url=to_async_url(settings.database_url),
+                pragmas=SQLITE_PROFILES[settings.sqlite_profile],
+                echo=settings.database_echo,
+                slow_query_threshold=settings.slow_query_threshold or None,
+                **pool_args(settings)
+            )
+
+        self.user_cache = InMemoryCache(
+            max_size=settings.user_cache_max_size,
+            ttl=settings.user_cache_ttl
+        ) if settings.user_cache_enabled else None
+        self.user_count_cache = InMemoryCache(
+            max_size=1000,
+            ttl=settings.user_count_ttl
+        ) if settings.user_cache_enabled else None
+
+        self.change_dispatcher = ChangeDispatcher(
+            database=self.db,
+            sink=FileSink(settings.change_sink_path),
+            batch_size=settings.change_dispatch_batch_size,
+            interval=settings.change_dispatch_interval
+        ) if settings.change_sink_path else None
+
+        self.read_admission = create_limiter("read", settings.admission_max_reads, settings)
+        self.write_admission = create_limiter("write", settings.admission_max_writes, settings)
+
+    def metrics(self) -> List[Metric]:
+        """Metrics of the caches, rendered with those of the process on ``/metrics``"""
+        if self.user_cache is None:
+            return []
+        return [
+            *cache_metrics("user_cache", self.user_cache.stats()),
+            *cache_metrics("user_count_cache", self.user_count_cache.stats()),
+        ]
+
+    def saturation(self) -> List[str]:
+        """Describe the exhausted resources: full admission queues and the primary connection pool"""
+        reasons = [
+            f"{limiter.name} requests over capacity"
+            for limiter in (self.read_admission, self.write_admission)
+            if limiter is not None and limiter.saturated()
+        ]
+        pool = self.db.get_engine().pool
+        max_overflow = self.settings.database_max_overflow
+        if (
+            hasattr(pool, "overflow")
+            and max_overflow >= 0
+            and pool.overflow() >= max_overflow
+            and pool.checkedin() == 0
+        ):
+            reasons.append("database connection pool exhausted")
+        return reasons
+
+# Sessions only check out a connection on their first statement, so requests
+# rejected by validation or served from a cache never touch the pool, and the
+# repositories return the connection as soon as their last statement is done.
+
+def get_services(request: Request) -> Services:
+    """Dependency for getting the services of the application serving the request"""
+    return request.app.state.services
+
+def get_session(services: Services = Depends(get_services)) -> Generator[Session, None, None]:
     """Dependency for getting database session"""
     logger.debug("Creating new database session")
-    yield from db.get_session() 
\ No newline at end of file
+    yield from services.db.get_session()
+
+def get_read_session(services: Services = Depends(get_services)) -> Generator[Session, None, None]:
+    """Dependency for getting database session for read-only work, served by a replica when configured"""
+    logger.debug("Creating new read database session")
+    yield from services.db.get_read_session()
+
+async def get_async_session(services: Services = Depends(get_services)) -> AsyncGenerator[AsyncSession, None]:
+    """Dependency for getting async database session"""
+    logger.debug("Creating new async database session")
+    async for session in services.async_db.get_session():
+        yield session
+
+def get_user_cache(services: Services = Depends(get_services)) -> Cache | None:
+    """Dependency for getting the user cache, None when caching is disabled"""
+    return services.user_cache
+
+def get_user_count_cache(services: Services = Depends(get_services)) -> Cache | None:
+    """Dependency for getting the user count cache, None when caching is disabled"""
+    return services.user_count_cache
+
+def get_saturation(services: Services = Depends(get_services)) -> List[str]:
+    """Dependency describing the exhausted resources, see ``Services.saturation``"""
+    return services.saturation()
@@ -26,4 +26,31 @@ class UserAlreadyExistsError(UserException):
         email (str): Email address that caused the conflict.
     """
     def __init__(self, email: str):
-        super().__init__(status_code=400, detail=f"User with email {email} already exists") 
\ No newline at end of file
+        super().__init__(status_code=400, detail=f"User with email {email} already exists")
+
+class InvalidCursorError(UserException):
+    """Exception raised when a pagination cursor cannot be decoded.
+
+    Args:
+        cursor (str): The cursor value received from the client.
+    """
+    def __init__(self, cursor: str):
+        super().__init__(status_code=400, detail=f"Invalid pagination cursor: {cursor}")
+
+class PreconditionFailedError(UserException):
+    """Exception raised when a conditional update targets an outdated version of a user.
+
+    Args:
+        user_id (int): ID of the user whose version did not match.
+    """
+    def __init__(self, user_id: int):
+        super().__init__(status_code=412, detail=f"User with id {user_id} has been modified")
+
+class SearchNotSupportedError(UserException):
+    """Exception raised when full-text search is requested on a database without a search index.
+
+    Args:
+        dialect (str): Name of the database dialect in use.
+    """
+    def __init__(self, dialect: str):
+        super().__init__(status_code=400, detail=f"Full-text search is not supported on {dialect}")
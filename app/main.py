@@ -1,39 +1,123 @@
-import logging
-import os
-from fastapi import FastAPI
-from app.routes import users, health
-from app.dependencies import db
-
-log_level = os.getenv("LOG_LEVEL", "INFO").upper()
-logging.basicConfig(
-    level=log_level,
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
-)
-logger = logging.getLogger(__name__)
-
-app = FastAPI(
-    title="User Management API",
-    description="User management API with SQLite database",
-    version="1.0.0",
-    root_path="/api/v1"
-)
-
-logger.info("Starting application")
-
-app.include_router(users.router)
-logger.debug("Included users router")
-
-app.include_router(health.router)
-logger.debug("Included health router")
-
-@app.on_event("startup")
-def on_startup():
-    """Initialize database on startup"""
-    logger.info("Initializing database")
-    db.create_db_and_tables()
-
-@app.on_event("shutdown")
-def on_shutdown():
-    """Close database connection on shutdown"""
-    logger.info("Closing database connection")
-    db.close_connection()
+import time
+
+# Taken before the framework imports below, which dominate a cold start.
+IMPORT_STARTED = time.perf_counter()
+
+import logging
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator
+from fastapi import FastAPI
+from app.config import Settings, get_settings
+from app.database.migrations import file_lock
+from app.dependencies import Services, SCHEMA_LOCK_PATH
+from app.middleware.admission import AdmissionControlMiddleware
+from app.middleware.metrics import MetricsMiddleware
+from app.middleware.request_id import RequestIdMiddleware
+from app.utils.log import configure_logging
+from app.utils.profiling import configure_profiling
+from app.utils.startup import StartupTimer
+
+IMPORT_FINISHED = time.perf_counter()
+
+logger = logging.getLogger(__name__)
+
+def create_app(settings: Settings | None = None) -> FastAPI:
+    """Build the application from its settings
+
+    Only the router of the configured mode is imported and built. Databases
+    are not connected until the first request, or the startup schema creation.
+
+    Args:
+        settings (Settings | None, optional): Application settings. Defaults to None,
+            read from the environment.
+
+    Returns:
+        FastAPI: The configured application.
+    """
+    settings = settings or get_settings()
+    timer = StartupTimer(IMPORT_STARTED)
+    timer.record("import", IMPORT_FINISHED - IMPORT_STARTED)
+
+    configure_logging(level=settings.log_level, format=settings.log_format)
+
+    with timer.phase("services"):
+        services = Services(settings)
+
+    @asynccontextmanager
+    async def lifespan(app: FastAPI) -> AsyncIterator[None]:
+        """Initialize database on startup and close it on shutdown
+
+        Schema creation runs under a file lock, so that workers starting together
+        do not race on it. The change dispatcher, when configured, runs for the
+        lifetime of the application.
+        """
+        if settings.database_init_schema:
+            logger.info("Initializing database")
+            with timer.phase("schema"), file_lock(SCHEMA_LOCK_PATH):
+                if settings.database_async:
+                    await services.async_db.create_db_and_tables()
+                else:
+                    services.db.create_db_and_tables()
+        if services.change_dispatcher is not None:
+            services.change_dispatcher.start()
+        timer.ready()
+        yield
+        if services.change_dispatcher is not None:
+            services.change_dispatcher.stop()
+        logger.info("Closing database connection")
+        if settings.database_async:
+            await services.async_db.close_connection()
+        else:
+            services.db.close_connection()
+
+    app = FastAPI(
+        title="User Management API",
+        description="User management API with SQLite database",
+        version="1.0.0",
+        root_path="/api/v1",
+        lifespan=lifespan
+    )
+    app.state.services = services
+    app.state.profiling = configure_profiling(
+        sample_rate=settings.profile_sample_rate,
+        token=settings.profile_token,
+        directory=settings.profile_dir
+    )
+
+    logger.info("Starting application")
+
+    with timer.phase("routers"):
+        if settings.database_async:
+            from app.routes import async_users
+            app.include_router(async_users.router)
+            logger.debug("Included async users router")
+        else:
+            from app.routes import users
+            app.include_router(users.router)
+            logger.debug("Included users router")
+
+        from app.routes import health, metrics
+        app.include_router(health.router)
+        logger.debug("Included health router")
+
+        app.include_router(metrics.router)
+        logger.debug("Included metrics router")
+
+    app.add_middleware(
+        AdmissionControlMiddleware,
+        reads=services.read_admission,
+        writes=services.write_admission,
+        retry_after=settings.admission_retry_after
+    )
+    app.add_middleware(MetricsMiddleware, server_timing=settings.server_timing)
+    app.add_middleware(RequestIdMiddleware)
+    return app
+
+def __getattr__(name: str) -> Any:
+    """Build ``app`` on first access, so that ``uvicorn app.main:app`` keeps working
+    while importing this module, e.g. for ``create_app``, builds nothing
+    """
+    if name == "app":
+        app = globals()["app"] = create_app()
+        return app
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -0,0 +1,64 @@
+from typing import Any, Awaitable, Callable, MutableMapping
+
+from app.utils.admission import AdmissionLimiter
+
+Scope = MutableMapping[str, Any]
+Receive = Callable[[], Awaitable[MutableMapping[str, Any]]]
+Send = Callable[[MutableMapping[str, Any]], Awaitable[None]]
+
+READ_METHODS = frozenset({"GET", "HEAD", "OPTIONS"})
+# Probes and scrapes must answer under overload, and long polls hold no
+# connection while they wait.
+EXEMPT_PATHS = ("/health", "/metrics", "/users/changes")
+SHED_BODY = b'{"detail":"Server overloaded, retry later"}'
+
+class AdmissionControlMiddleware:
+    """ASGI middleware limiting the requests served at once, with separate budgets for reads and writes.
+
+    Requests over their budget queue for a bounded time and are otherwise
+    answered right away with a 503 and a ``Retry-After`` header, before any
+    work is done. A budget of None is unlimited.
+    """
+
+    def __init__(
+        self,
+        app: Callable[[Scope, Receive, Send], Awaitable[None]],
+        reads: AdmissionLimiter | None = None,
+        writes: AdmissionLimiter | None = None,
+        retry_after: int = 1
+    ) -> None:
+        self.app = app
+        self.reads = reads
+        self.writes = writes
+        self.retry_after = str(retry_after).encode()
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        limiter = self.reads if scope["method"] in READ_METHODS else self.writes
+        path = scope["path"]
+        root_path = scope.get("root_path", "")
+        if root_path and path.startswith(root_path):
+            path = path[len(root_path):]
+        if limiter is None or path.startswith(EXEMPT_PATHS):
+            await self.app(scope, receive, send)
+            return
+
+        if not await limiter.acquire():
+            await send({
+                "type": "http.response.start",
+                "status": 503,
+                "headers": [
+                    (b"content-type", b"application/json"),
+                    (b"content-length", str(len(SHED_BODY)).encode()),
+                    (b"retry-after", self.retry_after),
+                ],
+            })
+            await send({"type": "http.response.body", "body": SHED_BODY})
+            return
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            limiter.release()
@@ -0,0 +1,66 @@
+import time
+from typing import Any, Awaitable, Callable, MutableMapping
+
+from app.utils.metrics import (
+    DB_QUERIES_PER_REQUEST,
+    DB_TIME_PER_REQUEST,
+    HTTP_IN_FLIGHT,
+    HTTP_LATENCY,
+    HTTP_REQUESTS,
+)
+from app.utils.profiling import server_timing
+from app.utils.request_context import RequestStats, request_stats
+
+Scope = MutableMapping[str, Any]
+Receive = Callable[[], Awaitable[MutableMapping[str, Any]]]
+Send = Callable[[MutableMapping[str, Any]], Awaitable[None]]
+
+UNMATCHED_ROUTE = "unmatched"
+
+class MetricsMiddleware:
+    """ASGI middleware recording request count, in-flight requests and latency per route.
+
+    Routes are labelled with their template (e.g. ``/users/{user_id}``) rather than
+    the raw path, so that the number of series stays bounded. The SQL statements
+    executed while serving the request are recorded against the same label.
+    With ``server_timing``, the response also carries a ``Server-Timing`` header
+    breaking the request time down into validation, endpoint, database and
+    serialization.
+    """
+
+    def __init__(self, app: Callable[[Scope, Receive, Send], Awaitable[None]], server_timing: bool = False) -> None:
+        self.app = app
+        self.server_timing = server_timing
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        status_code = 500
+        stats = RequestStats()
+        token = request_stats.set(stats)
+
+        async def send_wrapper(message: MutableMapping[str, Any]) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+                if self.server_timing:
+                    timing = server_timing(stats, time.perf_counter() - start)
+                    message["headers"] = [*message.get("headers", []), (b"server-timing", timing.encode())]
+            await send(message)
+
+        HTTP_IN_FLIGHT.inc()
+        start = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            elapsed = time.perf_counter() - start
+            HTTP_IN_FLIGHT.dec()
+            request_stats.reset(token)
+            route = scope.get("route")
+            template = getattr(route, "path", UNMATCHED_ROUTE)
+            HTTP_REQUESTS.inc(scope["method"], template, str(status_code))
+            HTTP_LATENCY.observe(elapsed, scope["method"], template)
+            DB_QUERIES_PER_REQUEST.observe(stats.db_queries, template)
+            DB_TIME_PER_REQUEST.observe(stats.db_time, template)
@@ -0,0 +1,44 @@
+import re
+import uuid
+from typing import Any, Awaitable, Callable, MutableMapping
+
+from app.utils.request_context import request_id
+
+Scope = MutableMapping[str, Any]
+Receive = Callable[[], Awaitable[MutableMapping[str, Any]]]
+Send = Callable[[MutableMapping[str, Any]], Awaitable[None]]
+
+REQUEST_ID_HEADER = b"x-request-id"
+# Client supplied IDs end up in the logs, so only short, plain ones are kept.
+VALID_REQUEST_ID = re.compile(rb"^[A-Za-z0-9._:-]{1,128}$")
+
+class RequestIdMiddleware:
+    """ASGI middleware giving every request an ID, available to the logs while it is served.
+
+    The ID is taken from the ``X-Request-ID`` header when the client or a proxy
+    sends a valid one, generated otherwise, and returned in the response headers.
+    """
+
+    def __init__(self, app: Callable[[Scope, Receive, Send], Awaitable[None]]) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        value = dict(scope["headers"]).get(REQUEST_ID_HEADER)
+        if value is None or not VALID_REQUEST_ID.match(value):
+            value = uuid.uuid4().hex.encode()
+        token = request_id.set(value.decode())
+
+        async def send_wrapper(message: MutableMapping[str, Any]) -> None:
+            if message["type"] == "http.response.start":
+                message.setdefault("headers", [])
+                message["headers"] = [*message["headers"], (REQUEST_ID_HEADER, value)]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            request_id.reset(token)
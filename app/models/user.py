@@ -1,5 +1,14 @@
+from datetime import datetime, timezone
+from typing import Any
+
+from sqlalchemy import event
+from sqlalchemy.engine import Connection
 from sqlmodel import Field, SQLModel
 
+def utcnow() -> datetime:
+    """Current UTC time as a naive datetime, the way the database returns it"""
+    return datetime.now(timezone.utc).replace(tzinfo=None)
+
 class User(SQLModel, table=True):
     """User model representing a user in the system.
 
@@ -10,9 +19,49 @@ class User(SQLModel, table=True):
         name (str): The user's full name. Indexed for faster searches.
         email (str): The user's email address. Must be unique and is indexed.
         is_active (bool): Flag indicating if the user account is active. Defaults to True.
+        version (int): Incremented on every update. Used for ETags and optimistic concurrency.
+        updated_at (datetime): UTC time of the creation or last update.
     """
 
     id: int | None = Field(default=None, primary_key=True)
     name: str = Field(index=True)
     email: str = Field(unique=True, index=True)
-    is_active: bool = Field(default=True) 
\ No newline at end of file
+    is_active: bool = Field(default=True)
+    version: int = Field(default=1)
+    updated_at: datetime = Field(default_factory=utcnow)
+
+
+# SQLite full-text index on name and email. It is an external-content FTS5
+# table, so it stores no copy of the rows, and it is kept in sync with the
+# user table by triggers, whichever code path writes to it.
+USER_SEARCH_TABLE = "user_fts"
+
+USER_SEARCH_DDL = [
+    f"""CREATE VIRTUAL TABLE {USER_SEARCH_TABLE} USING fts5(
+        name, email, content='user', content_rowid='id'
+    )""",
+    f"""CREATE TRIGGER IF NOT EXISTS {USER_SEARCH_TABLE}_insert AFTER INSERT ON "user" BEGIN
+        INSERT INTO {USER_SEARCH_TABLE}(rowid, name, email) VALUES (new.id, new.name, new.email);
+    END""",
+    f"""CREATE TRIGGER IF NOT EXISTS {USER_SEARCH_TABLE}_delete AFTER DELETE ON "user" BEGIN
+        INSERT INTO {USER_SEARCH_TABLE}({USER_SEARCH_TABLE}, rowid, name, email) VALUES ('delete', old.id, old.name, old.email);
+    END""",
+    f"""CREATE TRIGGER IF NOT EXISTS {USER_SEARCH_TABLE}_update AFTER UPDATE OF name, email ON "user" BEGIN
+        INSERT INTO {USER_SEARCH_TABLE}({USER_SEARCH_TABLE}, rowid, name, email) VALUES ('delete', old.id, old.name, old.email);
+        INSERT INTO {USER_SEARCH_TABLE}(rowid, name, email) VALUES (new.id, new.name, new.email);
+    END""",
+]
+
+@event.listens_for(SQLModel.metadata, "after_create")
+def create_user_search_index(target: Any, connection: Connection, **kwargs: Any) -> None:
+    """Create the full-text index after the tables, indexing existing rows once"""
+    if connection.dialect.name != "sqlite":
+        return
+    exists = connection.exec_driver_sql(
+        "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = ?", (USER_SEARCH_TABLE,)
+    ).first()
+    if exists:
+        return
+    for statement in USER_SEARCH_DDL:
+        connection.exec_driver_sql(statement)
+    connection.exec_driver_sql(f"INSERT INTO {USER_SEARCH_TABLE}({USER_SEARCH_TABLE}) VALUES ('rebuild')")
@@ -0,0 +1,52 @@
+from datetime import datetime
+from typing import Any, Dict
+
+from sqlalchemy import JSON, event
+from sqlalchemy.orm import Session
+from sqlmodel import Field, SQLModel
+
+from app.models.user import User, utcnow
+
+class UserChange(SQLModel, table=True):
+    """Entry of the user change log, written in the transaction of the change.
+
+    Attributes:
+        seq (int | None): Position in the log. Auto-incremented and never reused.
+        user_id (int): ID of the changed user.
+        operation (str): "create", "update" or "delete".
+        data (Dict[str, Any] | None): The user after the change. None for deletes.
+        created_at (datetime): UTC time the change was recorded.
+    """
+
+    __tablename__ = "user_change"
+    __table_args__ = {"sqlite_autoincrement": True}
+
+    seq: int | None = Field(default=None, primary_key=True)
+    user_id: int
+    operation: str
+    data: Dict[str, Any] | None = Field(default=None, sa_type=JSON)
+    created_at: datetime = Field(default_factory=utcnow)
+
+    @classmethod
+    def of(cls, operation: str, user: User) -> "UserChange":
+        """Record a create or an update of ``user``"""
+        return cls(user_id=user.id, operation=operation, data=user.model_dump(mode="json"))
+
+    @classmethod
+    def deleted(cls, user_id: int) -> "UserChange":
+        """Record the deletion of the user with ID ``user_id``"""
+        return cls(user_id=user_id, operation="delete")
+
+# Readers of the log page with ``seq > since``. On PostgreSQL, sequence values
+# are handed out at insert time but become visible at commit, so a transaction
+# holding seq 1 could commit after one holding seq 2 was read, and change 1
+# would be skipped for good. Appends therefore take a lock that only other
+# appends wait on, held until commit: changes become visible in seq order.
+# SQLite already serializes writers.
+@event.listens_for(Session, "before_flush")
+def lock_change_log(session: Session, flush_context: Any, instances: Any) -> None:
+    """Serialize the appends to the change log until the end of their transaction"""
+    if not any(isinstance(obj, UserChange) for obj in session.new):
+        return
+    if session.get_bind().dialect.name == "postgresql":
+        session.connection().exec_driver_sql(f"LOCK TABLE {UserChange.__tablename__} IN EXCLUSIVE MODE")
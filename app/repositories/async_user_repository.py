@@ -0,0 +1,181 @@
+import logging
+from typing import Any, List
+from sqlalchemy import delete, update
+from sqlalchemy.exc import IntegrityError
+from sqlmodel import select
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from app.changes.notifier import CHANGE_NOTIFIER
+from app.models.user import User, utcnow
+from app.models.user_change import UserChange
+from app.exceptions import UserNotFoundError, UserAlreadyExistsError
+from app.repositories.user_repository import UPDATABLE_FIELDS, keyset_filter, ordering
+
+logger = logging.getLogger(__name__)
+
+class AsyncUserRepository:
+    """Async variant of ``UserRepository``.
+
+    Covers the core CRUD subset served by the async router: create, listing by
+    offset or keyset page in ascending order, lookup by ID, update and delete,
+    each recorded in the change log. Filters, descending order, caching,
+    If-Match, bulk operations and upsert are only available synchronously. It
+    awaits the database instead of blocking a threadpool worker.
+
+    Attributes:
+        session (AsyncSession): The SQLModel async session for database operations.
+    """
+
+    def __init__(self, session: AsyncSession):
+        """Initialize the AsyncUserRepository.
+
+        Args:
+            session (AsyncSession): Async database session to use for operations.
+        """
+        self.session = session
+
+    async def create(self, user: User) -> User:
+        """Create a new user in the database.
+
+        Args:
+            user (User): The user object to create.
+
+        Returns:
+            User: The created user with updated ID.
+
+        Raises:
+            UserAlreadyExistsError: If a user with the same email already exists.
+        """
+        logger.debug("Creating user with email: %s", user.email)
+        self.session.add(user)
+        try:
+            await self.session.flush()
+        except IntegrityError as e:
+            await self.session.rollback()
+            raise UserAlreadyExistsError(user.email) from e
+        self.session.add(UserChange.of("create", user))
+        await self.session.commit()
+        CHANGE_NOTIFIER.notify()
+        logger.info("User created successfully with id: %s", user.id)
+        return user
+
+    async def get_all(self, offset: int = 0, limit: int = 100, sort_by: str = "id") -> List[User]:
+        """Retrieve all users with pagination.
+
+        Args:
+            offset (int, optional): Number of records to skip. Defaults to 0.
+            limit (int, optional): Maximum number of records to return. Defaults to 100.
+            sort_by (str, optional): Column to order by, one of ``SORTABLE_COLUMNS``.
+                Defaults to "id".
+
+        Returns:
+            List[User]: List of users matching the pagination criteria.
+        """
+        logger.debug("Fetching users with offset: %s and limit: %s", offset, limit)
+        statement = select(User).order_by(*ordering(sort_by))
+        users = (await self.session.exec(statement.offset(offset).limit(limit))).all()
+        return users
+
+    async def get_page(
+        self,
+        after: tuple[Any, int] | None = None,
+        limit: int = 100,
+        sort_by: str = "id",
+    ) -> List[User]:
+        """Retrieve a page of users using keyset pagination.
+
+        Args:
+            after (tuple[Any, int] | None, optional): Sort key and ID of the last row
+                of the previous page. Defaults to None (first page).
+            limit (int, optional): Maximum number of records to return. Defaults to 100.
+            sort_by (str, optional): Column to order by, one of ``SORTABLE_COLUMNS``.
+                Defaults to "id".
+
+        Returns:
+            List[User]: List of users following the given position.
+        """
+        logger.debug("Fetching users after: %s sorted by: %s with limit: %s", after, sort_by, limit)
+        statement = select(User).order_by(*ordering(sort_by))
+        if after is not None:
+            statement = statement.where(keyset_filter(sort_by, after))
+        users = (await self.session.exec(statement.limit(limit))).all()
+        return users
+
+    async def get_by_id(self, user_id: int) -> User:
+        """Retrieve a user by their ID.
+
+        Args:
+            user_id (int): The ID of the user to retrieve.
+
+        Returns:
+            User: The requested user.
+
+        Raises:
+            UserNotFoundError: If no user exists with the given ID.
+        """
+        logger.debug("Fetching user with id: %s", user_id)
+        user = await self.session.get(User, user_id)
+        if not user:
+            raise UserNotFoundError(user_id)
+        return user
+
+    async def update(self, user_id: int, user_data: dict) -> User:
+        """Update a user's information.
+
+        Args:
+            user_id (int): The ID of the user to update.
+            user_data (dict): Dictionary containing the fields to update.
+
+        Returns:
+            User: The updated user.
+
+        Raises:
+            UserNotFoundError: If no user exists with the given ID.
+            UserAlreadyExistsError: If the new email belongs to another user.
+        """
+        logger.debug("Updating user with id: %s", user_id)
+        changes = {
+            key: value for key, value in user_data.items()
+            if key in UPDATABLE_FIELDS and value is not None
+        }
+        statement = update(User).where(User.id == user_id).values(
+            **changes,
+            version=User.version + 1,
+            updated_at=utcnow()
+        ).returning(User)
+        try:
+            db_user = (await self.session.exec(
+                statement, execution_options={"populate_existing": True}
+            )).scalars().one_or_none()
+        except IntegrityError as e:
+            await self.session.rollback()
+            raise UserAlreadyExistsError(changes["email"]) from e
+        if db_user is None:
+            await self.session.rollback()
+            raise UserNotFoundError(user_id)
+        self.session.add(UserChange.of("update", db_user))
+        await self.session.commit()
+        CHANGE_NOTIFIER.notify()
+        logger.info("User %s updated successfully", user_id)
+        return db_user
+
+    async def delete(self, user_id: int) -> None:
+        """Delete a user from the database.
+
+        Args:
+            user_id (int): The ID of the user to delete.
+
+        Raises:
+            UserNotFoundError: If no user exists with the given ID.
+        """
+        logger.debug("Deleting user with id: %s", user_id)
+        deleted = (await self.session.exec(
+            delete(User).where(User.id == user_id).returning(User.id)
+        )).scalars().one_or_none()
+        if deleted is None:
+            await self.session.rollback()
+            raise UserNotFoundError(user_id)
+        self.session.add(UserChange.deleted(user_id))
+        await self.session.commit()
+        CHANGE_NOTIFIER.notify()
+        logger.info("User %s deleted successfully", user_id)
@@ -0,0 +1,41 @@
+import logging
+from typing import List
+from sqlmodel import Session, select
+
+from app.models.user_change import UserChange
+
+logger = logging.getLogger(__name__)
+
+class ChangeRepository:
+    """Repository reading the user change log.
+
+    Attributes:
+        session (Session): The SQLModel session for database operations.
+    """
+
+    def __init__(self, session: Session):
+        """Initialize the ChangeRepository.
+
+        Args:
+            session (Session): Database session to use for operations.
+        """
+        self.session = session
+
+    def get_since(self, since: int = 0, limit: int = 100) -> List[UserChange]:
+        """Retrieve the changes recorded after a position, oldest first.
+
+        Args:
+            since (int, optional): Sequence number of the last change already seen.
+                Defaults to 0 (from the beginning).
+            limit (int, optional): Maximum number of changes to return. Defaults to 100.
+
+        Returns:
+            List[UserChange]: Changes with a sequence number greater than ``since``.
+        """
+        logger.debug("Fetching changes since: %s with limit: %s", since, limit)
+        changes = self.session.exec(
+            select(UserChange).where(UserChange.seq > since).order_by(UserChange.seq).limit(limit)
+        ).all()
+        # Release the connection, the caller may wait for more changes.
+        self.session.close()
+        return changes
@@ -1,29 +1,167 @@
+import importlib
 import logging
-from typing import List
+import re
+import uuid
+from typing import Any, Collection, Iterable, Iterator, List, Sequence, Set
+from sqlalchemy import and_, column, delete, false, func, insert, or_, text, tuple_, update
+from sqlalchemy.exc import IntegrityError
 from sqlmodel import Session, select
 
-from app.models.user import User
-from app.exceptions import UserNotFoundError, UserAlreadyExistsError
+from app.cache import Cache
+from app.changes.notifier import CHANGE_NOTIFIER
+from app.models.user import User, USER_SEARCH_TABLE, utcnow
+from app.models.user_change import UserChange
+from app.schemas.user import UserFilters
+from app.utils.conditional import parse_entity_tag
+from app.exceptions import (
+    UserException,
+    UserNotFoundError,
+    UserAlreadyExistsError,
+    PreconditionFailedError,
+    SearchNotSupportedError
+)
 
 logger = logging.getLogger(__name__)
 
+# Keeps IN (...) lists well below SQLite's bound parameter limit.
+BULK_CHUNK_SIZE = 500
+# Times a bulk update is applied before a conflict with concurrent writes is raised.
+BULK_UPDATE_ATTEMPTS = 3
+
+SORTABLE_COLUMNS = {
+    "id": User.id,
+    "name": User.name,
+    "email": User.email,
+}
+
+def _chunks(items: Sequence[Any], size: int = BULK_CHUNK_SIZE) -> Iterator[Sequence[Any]]:
+    for start in range(0, len(items), size):
+        yield items[start:start + size]
+
+SEARCH_TOKEN = re.compile(r"\w+")
+
+# Columns a client can change. The others are maintained by the repository.
+UPDATABLE_FIELDS = frozenset({"name", "email", "is_active"})
+
+# Dialects whose INSERT construct supports ON CONFLICT. Their modules are only
+# imported on the first upsert, so that SQLite deployments never load PostgreSQL's.
+UPSERT_DIALECTS = ("sqlite", "postgresql")
+
+def upsert_insert(dialect: str) -> Any:
+    """Get the INSERT construct supporting ON CONFLICT of a dialect"""
+    if dialect not in UPSERT_DIALECTS:
+        raise ValueError(f"Upsert is not supported with the {dialect} dialect")
+    return importlib.import_module(f"sqlalchemy.dialects.{dialect}").insert
+
+# Keys of the count cache. The total is adjusted in place by every create and
+# delete, while filtered counts are keyed by a generation token that every
+# write replaces, since there is no telling which filters a changed row matched.
+TOTAL_COUNT_KEY = "count:total"
+COUNT_GENERATION_KEY = "count:generation"
+
+def ordering(sort_by: str, descending: bool = False) -> tuple:
+    """Build a deterministic ORDER BY clause, using the ID as a tie-breaker."""
+    columns = (User.id,) if sort_by == "id" else (SORTABLE_COLUMNS[sort_by], User.id)
+    if descending:
+        return tuple(col.desc() for col in columns)
+    return columns
+
+def keyset_filter(sort_by: str, after: tuple[Any, int], descending: bool = False) -> Any:
+    """Build the WHERE clause that seeks past the row at position ``after``."""
+    if sort_by == "id":
+        return User.id < after[1] if descending else User.id > after[1]
+    key = tuple_(SORTABLE_COLUMNS[sort_by], User.id)
+    return key < tuple_(*after) if descending else key > tuple_(*after)
+
+def prefix_filter(col: Any, prefix: str) -> Any:
+    """Match values starting with ``prefix`` as a range, so the column index can be used.
+
+    ``LIKE 'prefix%'`` only uses an index on SQLite when the column collation
+    matches ``case_sensitive_like``, while ``col >= prefix AND col < successor``
+    is a plain index range scan on every database.
+    """
+    last = ord(prefix[-1])
+    if last == 0x10FFFF:
+        return col >= prefix
+    return (col >= prefix) & (col < prefix[:-1] + chr(last + 1))
+
+def search_query(q: str) -> str | None:
+    """Turn free text into an FTS5 query matching every word as a prefix.
+
+    Words are quoted so that FTS5 operators in user input are matched literally.
+    """
+    tokens = SEARCH_TOKEN.findall(q)
+    if not tokens:
+        return None
+    return " ".join(f'"{token}"*' for token in tokens)
+
+def filter_clauses(filters: UserFilters, dialect: str) -> List[Any]:
+    """Build the WHERE clauses for the given filters.
+
+    Args:
+        filters (UserFilters): Filters of the request.
+        dialect (str): Name of the database dialect the query runs on.
+
+    Returns:
+        List[Any]: Clauses to combine with AND.
+
+    Raises:
+        SearchNotSupportedError: If a full-text search is requested on a database
+            other than SQLite.
+    """
+    clauses = []
+    if filters.is_active is not None:
+        clauses.append(User.is_active == filters.is_active)
+    if filters.email is not None:
+        clauses.append(User.email == filters.email)
+    if filters.email_prefix is not None:
+        clauses.append(prefix_filter(User.email, filters.email_prefix))
+    if filters.name_prefix is not None:
+        clauses.append(prefix_filter(User.name, filters.name_prefix))
+    if filters.q is not None:
+        if dialect != "sqlite":
+            raise SearchNotSupportedError(dialect)
+        query = search_query(filters.q)
+        if query is None:
+            clauses.append(false())
+        else:
+            matches = text(
+                f"SELECT rowid FROM {USER_SEARCH_TABLE} WHERE {USER_SEARCH_TABLE} MATCH :q"
+            ).bindparams(q=query).columns(column("rowid"))
+            clauses.append(User.id.in_(matches))
+    return clauses
+
 class UserRepository:
     """Repository for managing user data in the database.
 
     This class handles all database operations related to users, following
     the repository pattern to encapsulate data access logic.
 
+    Writes release their connection when they commit, and reads as soon as
+    their rows are loaded, so no connection is held while a response is
+    serialized or streamed. Every write also appends to the user change log,
+    in the same transaction.
+
     Attributes:
         session (Session): The SQLModel session for database operations.
+        cache (Cache | None): Optional read-through cache for lookups by ID.
+        count_cache (Cache | None): Optional cache for ``count``.
     """
 
-    def __init__(self, session: Session):
+    def __init__(self, session: Session, cache: Cache | None = None, count_cache: Cache | None = None):
         """Initialize the UserRepository.
 
         Args:
             session (Session): Database session to use for operations.
+            cache (Cache | None, optional): Cache for ``get_by_id``. Entries are
+                invalidated by every write going through this repository. Defaults to None.
+            count_cache (Cache | None, optional): Cache for ``count``. Counts are kept
+                current by the writes going through this repository and recomputed when
+                they expire, which also reconciles writes made elsewhere. Defaults to None.
         """
         self.session = session
+        self.cache = cache
+        self.count_cache = count_cache
 
     def create(self, user: User) -> User:
         """Create a new user in the database.
@@ -37,34 +175,181 @@ class UserRepository:
         Raises:
             UserAlreadyExistsError: If a user with the same email already exists.
         """
-        logger.debug(f"Creating user with email: {user.email}")
-
-        existing_user = self.session.exec(
-            select(User).where(User.email == user.email)
-        ).first()
-        if existing_user:
-            raise UserAlreadyExistsError(user.email)
-
+        logger.debug("Creating user with email: %s", user.email)
+        # The unique index on email detects duplicates, which also holds for
+        # concurrent creates, instead of a SELECT before every INSERT. The user
+        # is detached before committing so that it keeps its state instead of
+        # being reloaded.
         self.session.add(user)
+        try:
+            self.session.flush()
+        except IntegrityError as e:
+            self.session.rollback()
+            raise UserAlreadyExistsError(user.email) from e
+        self.session.add(UserChange.of("create", user))
+        self.session.expunge(user)
         self.session.commit()
-        self.session.refresh(user)
-        logger.info(f"User created successfully with id: {user.id}")
+        self._counts_changed(1)
+        logger.info("User created successfully with id: %s", user.id)
         return user
 
-    def get_all(self, offset: int = 0, limit: int = 100) -> List[User]:
+    def upsert(self, user: User) -> tuple[User, bool]:
+        """Create a user, or update the user with the same email, in one statement.
+
+        Args:
+            user (User): The user to create or, if the email is taken, the values to
+                update the existing user with.
+
+        Returns:
+            tuple[User, bool]: The stored user and whether it was created.
+        """
+        logger.debug("Upserting user with email: %s", user.email)
+        dialect = self.session.get_bind().dialect.name
+        statement = upsert_insert(dialect)(User).values(**user.model_dump(exclude={"id"}))
+        statement = statement.on_conflict_do_update(
+            index_elements=[User.email],
+            set_={
+                "name": statement.excluded.name,
+                "is_active": statement.excluded.is_active,
+                "version": User.version + 1,
+                "updated_at": statement.excluded.updated_at,
+            }
+        ).returning(User)
+        stored = self.session.scalars(
+            statement, execution_options={"populate_existing": True}
+        ).one()
+        # Only an update bumps the version, so a first version means a new row.
+        created = stored.version == 1
+        self.session.add(UserChange.of("create" if created else "update", stored))
+        self.session.expunge(stored)
+        self.session.commit()
+        self._counts_changed(1 if created else 0)
+        self._invalidate([stored.id])
+        logger.info("User %s %s by upsert", stored.id, "created" if created else "updated")
+        return stored, created
+
+    def get_all(
+        self,
+        offset: int = 0,
+        limit: int = 100,
+        sort_by: str = "id",
+        descending: bool = False,
+        filters: UserFilters | None = None,
+    ) -> List[User]:
         """Retrieve all users with pagination.
 
         Args:
             offset (int, optional): Number of records to skip. Defaults to 0.
             limit (int, optional): Maximum number of records to return. Defaults to 100.
+            sort_by (str, optional): Column to order by, one of ``SORTABLE_COLUMNS``.
+                Defaults to "id".
+            descending (bool, optional): Whether to sort in descending order. Defaults to False.
+            filters (UserFilters | None, optional): Filters the users must match. Defaults to None.
 
         Returns:
             List[User]: List of users matching the pagination criteria.
+
+        Raises:
+            SearchNotSupportedError: If a full-text search is requested on a database
+                without a search index.
+        """
+        logger.debug("Fetching users with offset: %s and limit: %s", offset, limit)
+        statement = self._filtered(filters).order_by(*ordering(sort_by, descending))
+        users = self.session.exec(statement.offset(offset).limit(limit)).all()
+        self._release()
+        return users
+
+    def get_page(
+        self,
+        after: tuple[Any, int] | None = None,
+        limit: int = 100,
+        sort_by: str = "id",
+        descending: bool = False,
+        filters: UserFilters | None = None,
+    ) -> List[User]:
+        """Retrieve a page of users using keyset pagination.
+
+        Instead of skipping rows with OFFSET, the query seeks directly past the
+        last row of the previous page using the index on the sort column, so the
+        cost of a page does not depend on how deep it is.
+
+        Args:
+            after (tuple[Any, int] | None, optional): Sort key and ID of the last row
+                of the previous page. Defaults to None (first page).
+            limit (int, optional): Maximum number of records to return. Defaults to 100.
+            sort_by (str, optional): Column to order by, one of ``SORTABLE_COLUMNS``.
+                Defaults to "id".
+            descending (bool, optional): Whether to sort in descending order. Defaults to False.
+            filters (UserFilters | None, optional): Filters the users must match. Defaults to None.
+
+        Returns:
+            List[User]: List of users following the given position.
+
+        Raises:
+            SearchNotSupportedError: If a full-text search is requested on a database
+                without a search index.
         """
-        logger.debug(f"Fetching users with offset: {offset} and limit: {limit}")
-        users = self.session.exec(select(User).offset(offset).limit(limit)).all()
+        logger.debug("Fetching users after: %s sorted by: %s with limit: %s", after, sort_by, limit)
+        statement = self._filtered(filters).order_by(*ordering(sort_by, descending))
+        if after is not None:
+            statement = statement.where(keyset_filter(sort_by, after, descending))
+        users = self.session.exec(statement.limit(limit)).all()
+        self._release()
         return users
 
+    def count(self, filters: UserFilters | None = None) -> int:
+        """Count the users matching the filters.
+
+        With a count cache, the unfiltered total is served from a counter that
+        writes keep up to date, so it never scans the table while cached.
+
+        Args:
+            filters (UserFilters | None, optional): Filters the users must match. Defaults to None.
+
+        Returns:
+            int: Number of matching users.
+
+        Raises:
+            SearchNotSupportedError: If a full-text search is requested on a database
+                without a search index.
+        """
+        statement = select(func.count()).select_from(User).where(*self._clauses(filters))
+        cache_key = self._count_key(filters) if self.count_cache is not None else None
+        if cache_key is not None:
+            cached = self.count_cache.get(cache_key)
+            if cached is not None:
+                return cached
+        generation = CHANGE_NOTIFIER.generation
+        total = self.session.exec(statement).one()
+        self._release()
+        if cache_key is not None:
+            self._fill(self.count_cache, cache_key, total, generation)
+        return total
+
+    def iter_batches(self, batch_size: int = 1000) -> Iterator[List[User]]:
+        """Iterate over every user in ID order, one batch at a time.
+
+        Each batch is a keyset query seeking past the last ID of the previous
+        one, so only one batch is held in memory and no cursor stays open
+        between batches, however large the table is.
+
+        Args:
+            batch_size (int, optional): Number of users per batch. Defaults to 1000.
+
+        Yields:
+            List[User]: The next batch of users.
+        """
+        logger.debug("Iterating over users in batches of %s", batch_size)
+        after = None
+        while True:
+            users = self.get_page(after=after, limit=batch_size)
+            if not users:
+                return
+            yield users
+            if len(users) < batch_size:
+                return
+            after = (users[-1].id, users[-1].id)
+
     def get_by_id(self, user_id: int) -> User:
         """Retrieve a user by their ID.
 
@@ -77,35 +362,71 @@ class UserRepository:
         Raises:
             UserNotFoundError: If no user exists with the given ID.
         """
-        logger.debug(f"Fetching user with id: {user_id}")
-        user = self.session.get(User, user_id)
-        if not user:
-            raise UserNotFoundError(user_id)
+        logger.debug("Fetching user with id: %s", user_id)
+        if self.cache is None:
+            return self._load(user_id)
+
+        cache_key = self._cache_key(user_id)
+        cached = self.cache.get(cache_key)
+        if cached is not None:
+            return User(**cached)
+        generation = CHANGE_NOTIFIER.generation
+        user = self._load(user_id)
+        self._fill(self.cache, cache_key, user.model_dump(), generation)
         return user
 
-    def update(self, user_id: int, user_data: dict) -> User:
+    def update(self, user_id: int, user_data: dict, if_match: Collection[str] | None = None) -> User:
         """Update a user's information.
 
         Args:
             user_id (int): The ID of the user to update.
             user_data (dict): Dictionary containing the fields to update.
+            if_match (Collection[str] | None, optional): Entity tags the user must
+                currently have for the update to apply. Defaults to None (unconditional).
 
         Returns:
             User: The updated user.
 
         Raises:
             UserNotFoundError: If no user exists with the given ID.
+            PreconditionFailedError: If the user no longer matches ``if_match``.
+            UserAlreadyExistsError: If the new email belongs to another user.
         """
-        logger.debug(f"Updating user with id: {user_id}")
-        db_user = self.get_by_id(user_id)
-        
-        for key, value in user_data.items():
-            if hasattr(db_user, key) and value is not None:
-                setattr(db_user, key, value)
+        logger.debug("Updating user with id: %s", user_id)
+        changes = {
+            key: value for key, value in user_data.items()
+            if key in UPDATABLE_FIELDS and value is not None
+        }
+        # A single UPDATE ... RETURNING replaces loading the user, flushing the
+        # changes and refreshing it. The If-Match check is part of the WHERE
+        # clause, so it cannot race with a concurrent update.
+        statement = update(User).where(User.id == user_id)
+        if if_match is not None:
+            statement = statement.where(self._matches(if_match))
+        statement = statement.values(
+            **changes,
+            version=User.version + 1,
+            updated_at=utcnow()
+        ).returning(User)
+        try:
+            db_user = self.session.scalars(
+                statement, execution_options={"populate_existing": True}
+            ).one_or_none()
+        except IntegrityError as e:
+            self.session.rollback()
+            raise UserAlreadyExistsError(changes["email"]) from e
+        if db_user is None:
+            self.session.rollback()
+            if if_match is not None and self.session.get(User, user_id) is not None:
+                raise PreconditionFailedError(user_id)
+            raise UserNotFoundError(user_id)
 
+        self.session.add(UserChange.of("update", db_user))
+        self.session.expunge(db_user)
         self.session.commit()
-        self.session.refresh(db_user)
-        logger.info(f"User {user_id} updated successfully")
+        self._counts_changed(0)
+        self._invalidate([user_id])
+        logger.info("User %s updated successfully", user_id)
         return db_user
 
     def delete(self, user_id: int) -> None:
@@ -117,8 +438,269 @@ class UserRepository:
         Raises:
             UserNotFoundError: If no user exists with the given ID.
         """
-        logger.debug(f"Deleting user with id: {user_id}")
-        user = self.get_by_id(user_id)
-        self.session.delete(user)
+        logger.debug("Deleting user with id: %s", user_id)
+        deleted = self.session.scalars(
+            delete(User).where(User.id == user_id).returning(User.id)
+        ).one_or_none()
+        if deleted is None:
+            self.session.rollback()
+            raise UserNotFoundError(user_id)
+        self.session.add(UserChange.deleted(user_id))
         self.session.commit()
-        logger.info(f"User {user_id} deleted successfully") 
\ No newline at end of file
+        self._counts_changed(-1)
+        self._invalidate([user_id])
+        logger.info("User %s deleted successfully", user_id)
+
+    def bulk_create(self, users: List[User]) -> List[User | UserException]:
+        """Create many users in a single transaction.
+
+        Duplicate emails are detected with one ``IN`` query per chunk instead of
+        one SELECT per user, and the remaining rows are written with a single
+        multi-row INSERT, which skips emails registered concurrently.
+
+        Args:
+            users (List[User]): The user objects to create.
+
+        Returns:
+            List[User | UserException]: One entry per input user, in order. Either the
+            created user as stored, or the error that prevented its creation.
+        """
+        logger.debug("Bulk creating %s users", len(users))
+        existing = self._existing_emails(user.email for user in users)
+
+        results: List[User | UserException | None] = []
+        to_insert: List[User] = []
+        for user in users:
+            if user.email in existing:
+                results.append(UserAlreadyExistsError(user.email))
+                continue
+            existing.add(user.email)
+            results.append(None)
+            to_insert.append(user)
+
+        stored: List[User] = []
+        if to_insert:
+            # The stored rows are returned, not the input objects, so that the
+            # results and the change log hold what the database actually has.
+            # An email registered since the check above is skipped by the
+            # database rather than failing the batch.
+            statement = upsert_insert(self.session.get_bind().dialect.name)(User)
+            statement = statement.on_conflict_do_nothing(index_elements=[User.email]).returning(User)
+            created = {
+                user.email: user
+                for user in self.session.scalars(statement, [user.model_dump(exclude={"id"}) for user in to_insert])
+            }
+            results = [
+                result if result is not None
+                else created.get(user.email) or UserAlreadyExistsError(user.email)
+                for user, result in zip(users, results)
+            ]
+            stored = list(created.values())
+            for user in stored:
+                self.session.expunge(user)
+            self.session.add_all([UserChange.of("create", user) for user in stored])
+            self.session.commit()
+            self._counts_changed(len(stored))
+        logger.info("Bulk created %s of %s users", len(stored), len(users))
+        return results
+
+    def bulk_update(self, updates: List[dict]) -> List[User | UserException]:
+        """Update many users in a single transaction.
+
+        An email taken by a concurrent write between the check and the UPDATE
+        rolls the batch back, which is then applied again against the emails
+        registered by then, at most ``BULK_UPDATE_ATTEMPTS`` times.
+
+        Args:
+            updates (List[dict]): Dictionaries with the ``id`` of the user to update and
+                the fields to change.
+
+        Returns:
+            List[User | UserException]: One entry per update, in order. Either the
+            updated user or the error that prevented the update.
+
+        Raises:
+            IntegrityError: If every attempt conflicted with a concurrent write.
+        """
+        logger.debug("Bulk updating %s users", len(updates))
+        for attempt in range(1, BULK_UPDATE_ATTEMPTS + 1):
+            try:
+                results, db_users = self._apply_updates(updates)
+                break
+            except IntegrityError:
+                self.session.rollback()
+                if attempt == BULK_UPDATE_ATTEMPTS:
+                    raise
+                logger.info("Bulk update conflicted with a concurrent write, retrying")
+
+        updated = {user.id: user for user in results if isinstance(user, User)}
+        self.session.add_all([UserChange.of("update", user) for user in updated.values()])
+        self.session.commit()
+        self._counts_changed(0)
+        self._invalidate(db_users)
+        logger.info("Bulk updated %s users", len(updates))
+        return results
+
+    def _apply_updates(self, updates: List[dict]) -> tuple[List[User | UserException], dict[int, User]]:
+        """Apply the updates of ``bulk_update`` and flush them, returning the results and the loaded users"""
+        ids = list({data["id"] for data in updates})
+        db_users = {}
+        for chunk in _chunks(ids):
+            for user in self.session.exec(select(User).where(User.id.in_(chunk))):
+                db_users[user.id] = user
+        owners = self._email_owners(
+            data["email"] for data in updates if data.get("email") is not None
+        )
+
+        results: List[User | UserException] = []
+        for data in updates:
+            db_user = db_users.get(data["id"])
+            if db_user is None:
+                results.append(UserNotFoundError(data["id"]))
+                continue
+            email = data.get("email")
+            if email is not None and owners.get(email, db_user.id) != db_user.id:
+                results.append(UserAlreadyExistsError(email))
+                continue
+            if email is not None:
+                owners.pop(db_user.email, None)
+                owners[email] = db_user.id
+            for key, value in data.items():
+                if key != "id" and hasattr(db_user, key) and value is not None:
+                    setattr(db_user, key, value)
+            db_user.version += 1
+            db_user.updated_at = utcnow()
+            results.append(db_user)
+            if email is not None:
+                # Email changes were checked in request order, and must reach the
+                # unique index in that order too: a flush would otherwise issue
+                # them by ID, e.g. taking an email before its owner moved off it.
+                self.session.flush()
+
+        # Flush and detach before committing so the returned users keep their
+        # state instead of being expired and reloaded one by one.
+        self.session.flush()
+        for db_user in db_users.values():
+            self.session.expunge(db_user)
+        return results, db_users
+
+    def bulk_delete(self, user_ids: List[int]) -> List[int | UserException]:
+        """Delete many users in a single transaction.
+
+        Args:
+            user_ids (List[int]): IDs of the users to delete.
+
+        Returns:
+            List[int | UserException]: One entry per ID, in order. Either the deleted
+            ID or a ``UserNotFoundError``.
+        """
+        logger.debug("Bulk deleting %s users", len(user_ids))
+        deleted: Set[int] = set()
+        for chunk in _chunks(list(set(user_ids))):
+            deleted.update(self.session.scalars(
+                delete(User).where(User.id.in_(chunk)).returning(User.id)
+            ))
+        self.session.add_all([UserChange.deleted(user_id) for user_id in sorted(deleted)])
+        self.session.commit()
+        self._counts_changed(-len(deleted))
+        self._invalidate(deleted)
+        logger.info("Bulk deleted %s users", len(deleted))
+        return [
+            user_id if user_id in deleted else UserNotFoundError(user_id)
+            for user_id in user_ids
+        ]
+
+    def _clauses(self, filters: UserFilters | None) -> List[Any]:
+        """Build the WHERE clauses for the given filters on this session's database"""
+        if filters is None:
+            return []
+        return filter_clauses(filters, self.session.get_bind().dialect.name)
+
+    def _filtered(self, filters: UserFilters | None) -> Any:
+        """Build a SELECT of users restricted by the given filters"""
+        return select(User).where(*self._clauses(filters))
+
+    def _existing_emails(self, emails: Iterable[str]) -> Set[str]:
+        """Return which of the given emails are already registered."""
+        return set(self._email_owners(emails))
+
+    def _email_owners(self, emails: Iterable[str]) -> dict[str, int]:
+        """Map each of the given emails that is already registered to its user ID."""
+        owners: dict[str, int] = {}
+        for chunk in _chunks(list(set(emails))):
+            rows = self.session.exec(
+                select(User.email, User.id).where(User.email.in_(chunk))
+            )
+            owners.update({email: user_id for email, user_id in rows})
+        return owners
+
+    @staticmethod
+    def _matches(tags: Collection[str]) -> Any:
+        """Build the WHERE clause matching users whose ETag is one of ``tags``"""
+        parsed = [parse_entity_tag(tag) for tag in tags]
+        return or_(false(), *(
+            and_(User.version == version, User.updated_at == updated_at)
+            for version, updated_at in filter(None, parsed)
+        ))
+
+    def _load(self, user_id: int) -> User:
+        """Load a user, bypassing the cache"""
+        user = self.session.get(User, user_id)
+        self._release()
+        if not user:
+            raise UserNotFoundError(user_id)
+        return user
+
+    def _release(self) -> None:
+        """Return the connection of a read to the pool.
+
+        Closing the session ends its transaction and detaches the loaded users
+        with their state, so they can still be serialized without a connection.
+        The session stays usable and checks out a new connection on its next
+        statement. Nothing is released while the session has pending changes.
+        """
+        if not (self.session.new or self.session.dirty or self.session.deleted):
+            self.session.close()
+
+    @staticmethod
+    def _cache_key(user_id: int) -> str:
+        return f"user:{user_id}"
+
+    def _count_key(self, filters: UserFilters | None) -> str:
+        if filters is None or not filters.model_dump(exclude_none=True):
+            return TOTAL_COUNT_KEY
+        generation = self.count_cache.get(COUNT_GENERATION_KEY)
+        if generation is None:
+            generation = uuid.uuid4().hex
+            self.count_cache.set(COUNT_GENERATION_KEY, generation)
+        return f"count:{generation}:{filters.model_dump_json(exclude_none=True)}"
+
+    def _counts_changed(self, delta: int) -> None:
+        """Advance the write generation, wake change feed waiters, adjust the cached total by ``delta``, drop filtered counts"""
+        CHANGE_NOTIFIER.notify()
+        if self.count_cache is None:
+            return
+        if delta:
+            self.count_cache.increment(TOTAL_COUNT_KEY, delta)
+        self.count_cache.delete(COUNT_GENERATION_KEY)
+
+    @staticmethod
+    def _fill(cache: Cache, key: str, value: Any, generation: int) -> None:
+        """Cache a value read under ``generation``, unless a write of this process committed since.
+
+        Writes advance the generation before invalidating, so a value read
+        before a write is either not set, removed by the check after setting it,
+        or removed by the invalidation.
+        """
+        if CHANGE_NOTIFIER.generation != generation:
+            return
+        cache.set(key, value)
+        if CHANGE_NOTIFIER.generation != generation:
+            cache.delete(key)
+
+    def _invalidate(self, user_ids: Iterable[int]) -> None:
+        """Drop cached entries for the given users"""
+        if self.cache is None:
+            return
+        for user_id in user_ids:
+            self.cache.delete(self._cache_key(user_id))
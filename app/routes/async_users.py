@@ -0,0 +1,100 @@
+import logging
+from typing import Annotated, Literal, Optional
+from fastapi import APIRouter, Depends, Query
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from app.models.user import User
+from app.repositories.async_user_repository import AsyncUserRepository
+from app.utils.pagination import decode_cursor, next_page_cursor
+from app.utils.profiling import TimedRoute
+from app.utils.responses import ModelResponse, user_values
+from app.schemas.user import (
+    UserCreate,
+    UserUpdate,
+    UserResponse,
+    DeleteResponse,
+    UserListResponse
+)
+from app.dependencies import get_async_session
+
+logger = logging.getLogger(__name__)
+
+router = APIRouter(
+    prefix="/users",
+    tags=["users"],
+    route_class=TimedRoute
+)
+
+def get_user_repository(session: AsyncSession = Depends(get_async_session)) -> AsyncUserRepository:
+    return AsyncUserRepository(session)
+
+@router.post("/", response_model=UserResponse)
+async def create_user(
+    user_data: UserCreate,
+    user_repo: Annotated[AsyncUserRepository, Depends(get_user_repository)]
+) -> ModelResponse:
+    """Create a new user"""
+    logger.debug("Creating new user with data: %s", user_data)
+    user = User(**user_data.model_dump())
+    created_user = await user_repo.create(user)
+    logger.info("User created successfully with id: %s", created_user.id)
+    return ModelResponse(UserResponse.model_validate(user_values(created_user)), status_code=201)
+
+@router.get("/", response_model=UserListResponse)
+async def read_users(
+    user_repo: Annotated[AsyncUserRepository, Depends(get_user_repository)],
+    offset: int = 0,
+    limit: Annotated[int, Query(le=100)] = 100,
+    cursor: Optional[str] = None,
+    sort_by: Literal["id", "name", "email"] = "id",
+) -> ModelResponse:
+    """Get all users
+
+    When a ``cursor`` is given, the page is fetched with keyset pagination and
+    ``offset`` is ignored. Every full page returns a ``next_cursor``.
+    """
+    logger.debug("Fetching users with offset: %s, limit: %s, cursor: %s", offset, limit, cursor)
+    if cursor is not None:
+        users = await user_repo.get_page(after=decode_cursor(cursor, sort_by), limit=limit, sort_by=sort_by)
+    else:
+        users = await user_repo.get_all(offset=offset, limit=limit, sort_by=sort_by)
+    logger.debug("Found %s users", len(users))
+    return ModelResponse(
+        UserListResponse.model_validate({
+            "items": [user_values(user) for user in users],
+            "next_cursor": next_page_cursor(users, limit, sort_by)
+        })
+    )
+
+@router.get("/{user_id}", response_model=UserResponse)
+async def read_user(
+    user_id: int,
+    user_repo: Annotated[AsyncUserRepository, Depends(get_user_repository)]
+) -> ModelResponse:
+    """Get a specific user by ID"""
+    logger.debug("Fetching user with id: %s", user_id)
+    user = await user_repo.get_by_id(user_id)
+    return ModelResponse(UserResponse.model_validate(user_values(user)))
+
+@router.put("/{user_id}", response_model=UserResponse)
+async def update_user(
+    user_id: int,
+    user_data: UserUpdate,
+    user_repo: Annotated[AsyncUserRepository, Depends(get_user_repository)]
+) -> ModelResponse:
+    """Update a user"""
+    logger.debug("Updating user %s with data: %s", user_id, user_data)
+    updated_user = await user_repo.update(user_id, user_data.model_dump(exclude_unset=True))
+    logger.info("User %s updated successfully", user_id)
+    return ModelResponse(UserResponse.model_validate(user_values(updated_user)))
+
+@router.delete("/{user_id}", response_model=DeleteResponse)
+async def delete_user(
+    user_id: int,
+    user_repo: Annotated[AsyncUserRepository, Depends(get_user_repository)]
+) -> ModelResponse:
+    """Delete a user"""
+    logger.debug("Deleting user with id: %s", user_id)
+    await user_repo.delete(user_id)
+    logger.info("User %s deleted successfully", user_id)
+    return ModelResponse(DeleteResponse(ok=True))
@@ -1,7 +1,8 @@
+from typing import List
 from fastapi import APIRouter, Depends
 from fastapi.responses import JSONResponse
 from sqlmodel import Session, select
-from app.dependencies import db
+from app.dependencies import get_read_session, get_saturation
 from app.schemas.health import HealthResponse, ReadinessResponse
 
 router = APIRouter(
@@ -17,10 +18,28 @@ async def health_check() -> JSONResponse:
     )
 
 @router.get("/readiness", response_model=ReadinessResponse)
-async def readiness_check(session: Session = Depends(db.get_session)) -> JSONResponse:
-    """Readiness check endpoint that verifies database connectivity"""
+def readiness_check(
+    session: Session = Depends(get_read_session),
+    saturation: List[str] = Depends(get_saturation)
+) -> JSONResponse:
+    """Readiness check endpoint that verifies capacity and database connectivity
+
+    Reports "saturated" with a 503 while requests are being shed or no database
+    connection is available, so that load balancers route traffic elsewhere.
+    The database is not queried then, to not queue behind the overload.
+    """
+    if saturation:
+        return JSONResponse(
+            status_code=503,
+            content=ReadinessResponse(
+                status="saturated",
+                database="not checked",
+                error="; ".join(saturation)
+            ).model_dump()
+        )
     try:
         session.exec(select(1))
+        session.close()
         return JSONResponse(
             status_code=200,
             content=ReadinessResponse(
@@ -0,0 +1,18 @@
+from fastapi import APIRouter, Depends
+from fastapi.responses import PlainTextResponse
+
+from app.dependencies import Services, get_services
+from app.utils.metrics import REGISTRY
+
+router = APIRouter(
+    prefix="/metrics",
+    tags=["Metrics"]
+)
+
+@router.get("", response_class=PlainTextResponse)
+async def metrics(services: Services = Depends(get_services)) -> PlainTextResponse:
+    """Expose the process metrics and those of the application's services in the Prometheus text format"""
+    return PlainTextResponse(
+        content=REGISTRY.render(services.metrics()),
+        media_type="text/plain; version=0.0.4"
+    )
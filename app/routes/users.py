@@ -1,96 +1,387 @@
 import logging
-from typing import Annotated
-from fastapi import APIRouter, Depends, Query
-from fastapi.responses import JSONResponse
+from typing import Annotated, Any, AsyncIterator, Iterator, List, Literal, Optional
+import anyio
+from fastapi import APIRouter, Depends, Header, Query, Request
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import Response, StreamingResponse
 from sqlmodel import Session
 
+from app.cache import Cache
+from app.changes.notifier import CHANGE_NOTIFIER
+from app.exceptions import UserException
 from app.models.user import User
+from app.repositories.change_repository import ChangeRepository
 from app.repositories.user_repository import UserRepository
+from app.utils.conditional import list_tag, none_match, parse_etags, validators
+from app.utils.pagination import decode_cursor, next_page_cursor
+from app.utils.export import iter_csv, iter_ndjson
+from app.utils.responses import ModelResponse, render_json, user_values
+from app.utils.profiling import TimedRoute
+from app.utils.singleflight import SingleFlight
+from app.utils.user_import import ImportFormat, import_users as run_import
 from app.schemas.user import (
     UserCreate,
     UserUpdate,
+    UserPatch,
     UserResponse,
     DeleteResponse,
-    UserListResponse
+    UserListResponse,
+    UserBulkUpdate,
+    BulkDeleteRequest,
+    BulkItemResult,
+    BulkResponse,
+    ImportSummary,
+    UserFilters,
+    ChangeEvent,
+    ChangeListResponse
 )
-from app.dependencies import get_session
+from app.dependencies import Services, get_services, get_session, get_read_session, get_user_cache, get_user_count_cache
 
 logger = logging.getLogger(__name__)
 
+# Longest a change feed request may wait for new changes, in seconds.
+MAX_CHANGES_WAIT = 30.0
+# Seconds between change log checks while waiting, which picks up changes
+# committed by other processes. Changes committed here wake waiters at once.
+CHANGES_POLL_INTERVAL = 1.0
+
+# Concurrent identical reads share one query and one serialized body.
+USER_READS = SingleFlight("read_user")
+USER_LIST_READS = SingleFlight("read_users")
+
 router = APIRouter(
     prefix="/users",
-    tags=["users"]
+    tags=["users"],
+    route_class=TimedRoute
 )
 
-def get_user_repository(session: Session = Depends(get_session)) -> UserRepository:
-    return UserRepository(session)
+def get_user_repository(
+    session: Session = Depends(get_session),
+    cache: Cache | None = Depends(get_user_cache),
+    count_cache: Cache | None = Depends(get_user_count_cache)
+) -> UserRepository:
+    return UserRepository(session, cache=cache, count_cache=count_cache)
+
+def get_read_user_repository(
+    session: Session = Depends(get_read_session),
+    cache: Cache | None = Depends(get_user_cache),
+    count_cache: Cache | None = Depends(get_user_count_cache)
+) -> UserRepository:
+    return UserRepository(session, cache=cache, count_cache=count_cache)
+
+def get_change_repository(session: Session = Depends(get_session)) -> ChangeRepository:
+    return ChangeRepository(session)
+
+def get_user_filters(
+    is_active: Optional[bool] = None,
+    email: Optional[str] = None,
+    email_prefix: Annotated[Optional[str], Query(min_length=1)] = None,
+    name_prefix: Annotated[Optional[str], Query(min_length=1)] = None,
+    q: Annotated[Optional[str], Query(min_length=1)] = None,
+) -> UserFilters:
+    return UserFilters(
+        is_active=is_active,
+        email=email,
+        email_prefix=email_prefix,
+        name_prefix=name_prefix,
+        q=q
+    )
+
+def _blocking_iter(stream: AsyncIterator[bytes]) -> Iterator[bytes]:
+    """Iterate over an async stream from a worker thread, one chunk at a time"""
+    while True:
+        try:
+            yield anyio.from_thread.run(stream.__anext__)
+        except StopAsyncIteration:
+            return
+
+def _flight_key(user_repo: UserRepository, *parts: Any) -> tuple:
+    """Key of a coalesced read, shared only by reads of the same database and write generation
+
+    A read joining one started before a write of this process completed would
+    miss it, e.g. a GET right after a PUT, and a read kept on the primary after
+    a write must not join one served by a replica.
+    """
+    return (CHANGE_NOTIFIER.generation, user_repo.session.get_bind().url, *parts)
+
+def _bulk_result(index: int, result: User | int | UserException, status_code: int = 200) -> BulkItemResult:
+    """Convert the outcome of a bulk repository operation into an item result"""
+    if isinstance(result, UserException):
+        return BulkItemResult(index=index, ok=False, status_code=result.status_code, detail=result.detail)
+    if isinstance(result, User):
+        return BulkItemResult(
+            index=index,
+            ok=True,
+            status_code=status_code,
+            id=result.id,
+            user=UserResponse.model_validate(user_values(result))
+        )
+    return BulkItemResult(index=index, ok=True, status_code=status_code, id=result)
 
 @router.post("/", response_model=UserResponse)
 def create_user(
     user_data: UserCreate,
     user_repo: Annotated[UserRepository, Depends(get_user_repository)]
-) -> JSONResponse:
+) -> ModelResponse:
     """Create a new user"""
-    logger.debug("Creating new user with data: %s", user_data.model_dump())
+    logger.debug("Creating new user with data: %s", user_data)
     user = User(**user_data.model_dump())
     created_user = user_repo.create(user)
     logger.info("User created successfully with id: %s", created_user.id)
-    return JSONResponse(
-        status_code=201,
-        content=UserResponse(**created_user.model_dump()).model_dump()
+    return ModelResponse(UserResponse.model_validate(user_values(created_user)), status_code=201)
+
+@router.post("/upsert", response_model=UserResponse)
+def upsert_user(
+    user_data: UserCreate,
+    user_repo: Annotated[UserRepository, Depends(get_user_repository)]
+) -> ModelResponse:
+    """Create a user, or update the user with the same email
+
+    Returns 201 when the user was created and 200 when an existing user was updated.
+    """
+    logger.debug("Upserting user with data: %s", user_data)
+    user, created = user_repo.upsert(User(**user_data.model_dump()))
+    return ModelResponse(
+        UserResponse.model_validate(user_values(user)),
+        status_code=201 if created else 200,
+        headers=validators(user)
     )
 
 @router.get("/", response_model=UserListResponse)
 def read_users(
-    user_repo: Annotated[UserRepository, Depends(get_user_repository)],
+    user_repo: Annotated[UserRepository, Depends(get_read_user_repository)],
+    filters: Annotated[UserFilters, Depends(get_user_filters)],
     offset: int = 0,
     limit: Annotated[int, Query(le=100)] = 100,
-) -> JSONResponse:
-    """Get all users"""
-    logger.debug("Fetching users with offset: %s, limit: %s", offset, limit)
-    users = user_repo.get_all(offset=offset, limit=limit)
-    logger.debug("Found %s users", len(users))
-    return JSONResponse(
-        content=UserListResponse(
-            items=[UserResponse(**user.model_dump()) for user in users]
-        ).model_dump()
+    cursor: Optional[str] = None,
+    sort_by: Literal["id", "name", "email"] = "id",
+    order: Literal["asc", "desc"] = "asc",
+    include_total: bool = False,
+    if_none_match: Annotated[Optional[str], Header()] = None,
+) -> Response:
+    """Get all users
+
+    When a ``cursor`` is given, the page is fetched with keyset pagination and
+    ``offset`` is ignored. Every full page returns a ``next_cursor``, which must
+    be sent back with the same filters and ordering. With ``include_total``, the
+    response also carries the number of users matching the filters, served from
+    the count cache when enabled.
+
+    The response carries a weak ``ETag`` of the page. When it matches
+    ``If-None-Match``, a 304 is returned without serializing the users.
+
+    Identical requests arriving while a page is being read wait for it and
+    share its rows instead of running the same queries again.
+    """
+    logger.debug("Fetching users with offset: %s, limit: %s, cursor: %s", offset, limit, cursor)
+
+    def read_page() -> tuple[List[User], Optional[str], Optional[int], str]:
+        descending = order == "desc"
+        if cursor is not None:
+            users = user_repo.get_page(
+                after=decode_cursor(cursor, sort_by, order),
+                limit=limit,
+                sort_by=sort_by,
+                descending=descending,
+                filters=filters
+            )
+        else:
+            users = user_repo.get_all(
+                offset=offset, limit=limit, sort_by=sort_by, descending=descending, filters=filters
+            )
+        logger.debug("Found %s users", len(users))
+        next_cursor = next_page_cursor(users, limit, sort_by, order)
+        total = user_repo.count(filters) if include_total else None
+        return users, next_cursor, total, list_tag(users, next_cursor, total)
+
+    key = _flight_key(user_repo, offset, limit, cursor, sort_by, order, include_total, filters.model_dump_json())
+    users, next_cursor, total, tag = USER_LIST_READS.do(key, read_page)
+    headers = {"ETag": tag}
+    if none_match(if_none_match, tag):
+        return Response(status_code=304, headers=headers)
+    body = render_json(UserListResponse.model_validate({
+        "items": [user_values(user) for user in users],
+        "next_cursor": next_cursor,
+        "total": total
+    }))
+    return Response(content=body, media_type="application/json", headers=headers)
+
+@router.get("/export")
+def export_users(
+    user_repo: Annotated[UserRepository, Depends(get_read_user_repository)],
+    format: Literal["ndjson", "csv"] = "ndjson",
+    batch_size: Annotated[int, Query(ge=1, le=10000)] = 1000,
+) -> StreamingResponse:
+    """Stream every user as NDJSON or CSV with constant memory"""
+    logger.debug("Exporting users as %s in batches of %s", format, batch_size)
+    batches = user_repo.iter_batches(batch_size=batch_size)
+    if format == "csv":
+        content, media_type = iter_csv(batches), "text/csv"
+    else:
+        content, media_type = iter_ndjson(batches), "application/x-ndjson"
+    return StreamingResponse(
+        content,
+        media_type=media_type,
+        headers={"Content-Disposition": f"attachment; filename=users.{format}"}
+    )
+
+@router.get("/changes", response_model=ChangeListResponse)
+async def read_changes(
+    change_repo: Annotated[ChangeRepository, Depends(get_change_repository)],
+    since: Annotated[int, Query(ge=0)] = 0,
+    limit: Annotated[int, Query(ge=1, le=1000)] = 100,
+    wait: Annotated[float, Query(ge=0, le=MAX_CHANGES_WAIT)] = 0,
+) -> ModelResponse:
+    """Get the user changes recorded after the ``since`` sequence number
+
+    With ``wait``, the request long-polls: when there is no newer change, it
+    waits up to ``wait`` seconds for one before returning an empty page. The
+    response's ``next_since`` is the ``since`` of the next request.
+    """
+    logger.debug("Fetching changes since: %s with limit: %s, waiting: %s", since, limit, wait)
+    deadline = anyio.current_time() + wait
+    with CHANGE_NOTIFIER.listen() as changed:
+        while True:
+            changed.clear()
+            changes = await run_in_threadpool(change_repo.get_since, since, limit)
+            remaining = deadline - anyio.current_time()
+            if changes or remaining <= 0:
+                break
+            with anyio.move_on_after(min(remaining, CHANGES_POLL_INTERVAL)):
+                await changed.wait()
+    return ModelResponse(ChangeListResponse(
+        items=[ChangeEvent.model_validate(change) for change in changes],
+        next_since=changes[-1].seq if changes else since
+    ))
+
+@router.post("/bulk", response_model=BulkResponse)
+def create_users_bulk(
+    users_data: List[UserCreate],
+    user_repo: Annotated[UserRepository, Depends(get_user_repository)]
+) -> ModelResponse:
+    """Create many users in a single transaction"""
+    logger.debug("Bulk creating %s users", len(users_data))
+    results = user_repo.bulk_create([User(**user_data.model_dump()) for user_data in users_data])
+    return ModelResponse(
+        BulkResponse(items=[_bulk_result(index, result, status_code=201) for index, result in enumerate(results)])
+    )
+
+@router.patch("/bulk", response_model=BulkResponse)
+def update_users_bulk(
+    users_data: List[UserBulkUpdate],
+    user_repo: Annotated[UserRepository, Depends(get_user_repository)]
+) -> ModelResponse:
+    """Update many users in a single transaction"""
+    logger.debug("Bulk updating %s users", len(users_data))
+    results = user_repo.bulk_update([user_data.model_dump(exclude_unset=True) for user_data in users_data])
+    return ModelResponse(
+        BulkResponse(items=[_bulk_result(index, result) for index, result in enumerate(results)])
+    )
+
+@router.delete("/bulk", response_model=BulkResponse)
+def delete_users_bulk(
+    request: BulkDeleteRequest,
+    user_repo: Annotated[UserRepository, Depends(get_user_repository)]
+) -> ModelResponse:
+    """Delete many users in a single transaction"""
+    logger.debug("Bulk deleting %s users", len(request.ids))
+    results = user_repo.bulk_delete(request.ids)
+    return ModelResponse(
+        BulkResponse(items=[_bulk_result(index, result) for index, result in enumerate(results)])
     )
 
+@router.post("/import", response_model=ImportSummary)
+async def import_users(
+    request: Request,
+    user_repo: Annotated[UserRepository, Depends(get_user_repository)],
+    services: Annotated[Services, Depends(get_services)],
+    format: ImportFormat = "ndjson",
+    batch_size: Annotated[Optional[int], Query(ge=1, le=10000)] = None,
+) -> ModelResponse:
+    """Import users from an NDJSON or CSV request body
+
+    The body is parsed as it arrives and written in transactions of
+    ``batch_size`` rows, ``import_batch_size`` from the settings by default,
+    so memory stays bounded whatever the file size.
+    """
+    batch_size = batch_size or services.settings.import_batch_size
+    logger.debug("Importing users as %s in batches of %s", format, batch_size)
+    chunks = _blocking_iter(request.stream().__aiter__())
+    summary = await run_in_threadpool(run_import, user_repo, chunks, format, batch_size)
+    logger.info("Imported %s users, rejected %s", summary.imported, summary.rejected)
+    return ModelResponse(summary)
+
 @router.get("/{user_id}", response_model=UserResponse)
 def read_user(
     user_id: int,
-    user_repo: Annotated[UserRepository, Depends(get_user_repository)]
-) -> JSONResponse:
-    """Get a specific user by ID"""
+    user_repo: Annotated[UserRepository, Depends(get_read_user_repository)],
+    if_none_match: Annotated[Optional[str], Header()] = None,
+) -> Response:
+    """Get a specific user by ID
+
+    Returns a 304 without a body when ``If-None-Match`` matches the user's ``ETag``.
+    Concurrent requests for the same user share one lookup.
+    """
     logger.debug("Fetching user with id: %s", user_id)
-    user = user_repo.get_by_id(user_id)
-    return JSONResponse(
-        content=UserResponse(**user.model_dump()).model_dump()
-    )
+
+    def read() -> tuple[User, dict[str, str]]:
+        user = user_repo.get_by_id(user_id)
+        return user, validators(user)
+
+    user, headers = USER_READS.do(_flight_key(user_repo, user_id), read)
+    if none_match(if_none_match, headers["ETag"]):
+        return Response(status_code=304, headers=headers)
+    body = render_json(UserResponse.model_validate(user_values(user)))
+    return Response(content=body, media_type="application/json", headers=headers)
 
 @router.put("/{user_id}", response_model=UserResponse)
 def update_user(
     user_id: int,
     user_data: UserUpdate,
-    user_repo: Annotated[UserRepository, Depends(get_user_repository)]
-) -> JSONResponse:
-    """Update a user"""
-    logger.debug("Updating user %s with data: %s", user_id, user_data.model_dump())
-    updated_user = user_repo.update(user_id, user_data.model_dump(exclude_unset=True))
+    user_repo: Annotated[UserRepository, Depends(get_user_repository)],
+    if_match: Annotated[Optional[str], Header()] = None,
+) -> ModelResponse:
+    """Update a user
+
+    With ``If-Match``, the update only applies if the user still has one of the
+    given ``ETag`` values, and fails with 412 otherwise.
+    """
+    logger.debug("Updating user %s with data: %s", user_id, user_data)
+    updated_user = user_repo.update(
+        user_id,
+        user_data.model_dump(exclude_unset=True),
+        if_match=parse_etags(if_match) if if_match is not None else None
+    )
     logger.info("User %s updated successfully", user_id)
-    return JSONResponse(
-        content=UserResponse(**updated_user.model_dump()).model_dump()
+    return ModelResponse(UserResponse.model_validate(user_values(updated_user)), headers=validators(updated_user))
+
+@router.patch("/{user_id}", response_model=UserResponse)
+def patch_user(
+    user_id: int,
+    user_data: UserPatch,
+    user_repo: Annotated[UserRepository, Depends(get_user_repository)],
+    if_match: Annotated[Optional[str], Header()] = None,
+) -> ModelResponse:
+    """Partially update a user, changing only the fields present in the request
+
+    Supports ``If-Match`` like ``PUT``.
+    """
+    logger.debug("Patching user %s with data: %s", user_id, user_data)
+    updated_user = user_repo.update(
+        user_id,
+        user_data.model_dump(exclude_unset=True),
+        if_match=parse_etags(if_match) if if_match is not None else None
     )
+    logger.info("User %s patched successfully", user_id)
+    return ModelResponse(UserResponse.model_validate(user_values(updated_user)), headers=validators(updated_user))
 
 @router.delete("/{user_id}", response_model=DeleteResponse)
 def delete_user(
     user_id: int,
     user_repo: Annotated[UserRepository, Depends(get_user_repository)]
-) -> JSONResponse:
+) -> ModelResponse:
     """Delete a user"""
     logger.debug("Deleting user with id: %s", user_id)
     user_repo.delete(user_id)
     logger.info("User %s deleted successfully", user_id)
-    return JSONResponse(
-        content=DeleteResponse(ok=True).model_dump()
-    ) 
\ No newline at end of file
+    return ModelResponse(DeleteResponse(ok=True))
\ No newline at end of file
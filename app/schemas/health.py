@@ -16,8 +16,9 @@ class ReadinessResponse(BaseModel):
     This model represents the readiness status of the API and its dependencies.
 
     Attributes:
-        status (str): The overall readiness status ("ready" or "not ready").
-        database (str): The database connection status ("connected" or "disconnected").
+        status (str): The overall readiness status ("ready", "not ready" or "saturated").
+        database (str): The database connection status ("connected", "disconnected" or
+            "not checked" when saturated).
         error (str | None): Error message if any component is not ready. None if all is well.
     """
     status: str
@@ -1,5 +1,6 @@
-from pydantic import BaseModel, EmailStr
-from typing import Optional, List
+from pydantic import BaseModel, ConfigDict, EmailStr, Field, field_validator, model_validator
+from datetime import datetime
+from typing import Literal, Optional, List
 
 class UserCreate(BaseModel):
     """Schema for creating a new user.
@@ -9,11 +10,17 @@ class UserCreate(BaseModel):
     Attributes:
         name (str): The user's full name.
         email (EmailStr): The user's email address. Validated as a proper email format.
-        is_active (Optional[bool]): Flag indicating if the user account is active. Defaults to True.
+        is_active (bool): Flag indicating if the user account is active. Defaults to True,
+            also when sent as null.
     """
     name: str
     email: EmailStr
-    is_active: Optional[bool] = True
+    is_active: bool = True
+
+    @field_validator("is_active", mode="before")
+    @classmethod
+    def default_null(cls, value: Optional[bool]) -> Optional[bool]:
+        return True if value is None else value
 
 class UserUpdate(BaseModel):
     """Schema for updating an existing user.
@@ -29,10 +36,26 @@ class UserUpdate(BaseModel):
     email: Optional[EmailStr] = None
     is_active: Optional[bool] = None
 
+class UserPatch(UserUpdate):
+    """Schema for a partial update of an existing user.
+
+    Only the fields present in the request are changed. Unlike ``UserUpdate``,
+    an explicit null is rejected instead of being ignored, since none of the
+    fields can be cleared.
+    """
+
+    @model_validator(mode="after")
+    def reject_nulls(self) -> "UserPatch":
+        nulls = [name for name in self.model_fields_set if getattr(self, name) is None]
+        if nulls:
+            raise ValueError(f"Fields cannot be null: {', '.join(sorted(nulls))}")
+        return self
+
 class UserResponse(BaseModel):
     """Schema for user responses in the API.
 
-    This model defines how user data is returned in API responses.
+    This model defines how user data is returned in API responses. It can be
+    validated directly from ``User`` rows, reading their attributes.
 
     Attributes:
         id (int): The unique identifier for the user.
@@ -40,6 +63,8 @@ class UserResponse(BaseModel):
         email (str): The user's email address.
         is_active (bool): Flag indicating if the user account is active.
     """
+    model_config = ConfigDict(from_attributes=True)
+
     id: int
     name: str
     email: str
@@ -58,5 +83,126 @@ class UserListResponse(BaseModel):
 
     Attributes:
         items (List[UserResponse]): List of user objects with their details.
+        next_cursor (Optional[str]): Opaque cursor to fetch the next page. None on the last page.
+        total (Optional[int]): Number of users matching the filters. Only set when requested.
+    """
+    items: List[UserResponse]
+    next_cursor: Optional[str] = None
+    total: Optional[int] = None
+
+class UserBulkUpdate(UserUpdate):
+    """Schema for a single entry of a bulk update request.
+
+    Attributes:
+        id (int): The ID of the user to update.
+    """
+    id: int
+
+class BulkDeleteRequest(BaseModel):
+    """Schema for bulk delete requests.
+
+    Attributes:
+        ids (List[int]): IDs of the users to delete.
+    """
+    ids: List[int]
+
+class BulkItemResult(BaseModel):
+    """Schema for the outcome of a single item in a bulk operation.
+
+    Attributes:
+        index (int): Position of the item in the request.
+        ok (bool): Indicates if the operation succeeded for this item.
+        status_code (int): HTTP status code the item would have had as a single request.
+        id (Optional[int]): ID of the affected user, when known.
+        user (Optional[UserResponse]): The created or updated user.
+        detail (Optional[str]): Error message if the item failed.
+    """
+    index: int
+    ok: bool
+    status_code: int
+    id: Optional[int] = None
+    user: Optional[UserResponse] = None
+    detail: Optional[str] = None
+
+class BulkResponse(BaseModel):
+    """Schema for bulk operation responses.
+
+    Attributes:
+        items (List[BulkItemResult]): Per-item results, in request order.
+    """
+    items: List[BulkItemResult]
+
+class ImportRowError(BaseModel):
+    """Schema for a row rejected by an import.
+
+    Attributes:
+        line (int): Line number of the row in the uploaded file.
+        detail (str): Reason the row was rejected.
+        email (Optional[str]): Email of the row, when it could be read.
+    """
+    line: int
+    detail: str
+    email: Optional[str] = None
+
+class ImportSummary(BaseModel):
+    """Schema for the outcome of a user import.
+
+    Attributes:
+        processed (int): Number of rows read.
+        imported (int): Number of users created.
+        rejected (int): Number of rows rejected.
+        errors (List[ImportRowError]): Details of the first rejected rows.
+        errors_truncated (bool): Indicates if more rows were rejected than listed in ``errors``.
+    """
+    processed: int = 0
+    imported: int = 0
+    rejected: int = 0
+    errors: List[ImportRowError] = []
+    errors_truncated: bool = False
+
+class UserFilters(BaseModel):
+    """Schema for the filters of user list requests.
+
+    Every filter is translated into SQL so that it can use the indexes on
+    ``name`` and ``email``.
+
+    Attributes:
+        is_active (Optional[bool]): Only users with this active flag.
+        email (Optional[str]): Only the user with this exact email.
+        email_prefix (Optional[str]): Only users whose email starts with this prefix.
+        name_prefix (Optional[str]): Only users whose name starts with this prefix.
+        q (Optional[str]): Full-text search on name and email, matching every term as a prefix.
+    """
+    is_active: Optional[bool] = None
+    email: Optional[str] = None
+    email_prefix: Optional[str] = Field(default=None, min_length=1)
+    name_prefix: Optional[str] = Field(default=None, min_length=1)
+    q: Optional[str] = Field(default=None, min_length=1)
+
+class ChangeEvent(BaseModel):
+    """Schema for an entry of the user change feed.
+
+    Attributes:
+        seq (int): Position in the feed. Pass the last one seen as ``since`` to continue.
+        user_id (int): ID of the changed user.
+        operation (str): "create", "update" or "delete".
+        data (Optional[UserResponse]): The user after the change. None for deletes.
+        created_at (datetime): UTC time of the change.
+    """
+    seq: int
+    user_id: int
+    operation: Literal["create", "update", "delete"]
+    data: Optional[UserResponse] = None
+    created_at: datetime
+
+    model_config = ConfigDict(from_attributes=True)
+
+class ChangeListResponse(BaseModel):
+    """Schema for a page of the user change feed.
+
+    Attributes:
+        items (List[ChangeEvent]): Changes after ``since``, oldest first.
+        next_since (int): Value of ``since`` for the next request.
     """
-    items: List[UserResponse]
\ No newline at end of file
+    items: List[ChangeEvent]
+    next_since: int
@@ -0,0 +1,77 @@
+import argparse
+import logging
+import os
+import sys
+
+import uvicorn
+
+from app.config import get_settings
+from app.database import Database
+from app.database.migrations import file_lock
+from app.dependencies import Services, SCHEMA_LOCK_PATH
+from app.utils.log import configure_logging
+
+logger = logging.getLogger(__name__)
+
+def worker_count(configured: int = 0) -> int:
+    """Number of worker processes to start, one per CPU core unless configured"""
+    if configured > 0:
+        return configured
+    return os.cpu_count() or 1
+
+def init_schema(db: Database) -> None:
+    """Create the schema once, before any worker starts, and release the engine
+
+    The engine is disposed so that no connection is inherited by the workers,
+    which each open their own.
+
+    Args:
+        db (Database): Database to create the schema in.
+    """
+    with file_lock(SCHEMA_LOCK_PATH):
+        db.create_db_and_tables()
+    db.close_connection()
+
+def main(argv: list[str] | None = None) -> int:
+    settings = get_settings()
+    configure_logging(level=settings.log_level, format=settings.log_format)
+    parser = argparse.ArgumentParser(prog="python -m app.server", description="Run the User Management API")
+    parser.add_argument("--host", default="0.0.0.0")
+    parser.add_argument("--port", type=int, default=8000)
+    parser.add_argument("--workers", type=int, default=settings.web_workers, help="defaults to one per CPU core")
+    args = parser.parse_args(argv)
+
+    workers = worker_count(args.workers)
+    if workers > 1 and "user_cache_enabled" not in settings.model_fields_set:
+        # The caches are per process: a write on one worker would leave the
+        # others serving the old user until it expires.
+        logger.info("Disabling the in-process user caches, shared by no other worker")
+        os.environ["USER_CACHE_ENABLED"] = "false"
+
+    services = Services(settings)
+    if settings.database_init_schema:
+        init_schema(services.db)
+        # Workers import the application in fresh processes and read this.
+        os.environ["DATABASE_INIT_SCHEMA"] = "false"
+
+    change_dispatcher = services.change_dispatcher
+    if change_dispatcher is not None:
+        # A single dispatcher per host delivers the change log, from this process.
+        change_dispatcher.start()
+        os.environ["CHANGE_SINK_PATH"] = ""
+
+    # With a single worker, uvicorn builds the application in this process,
+    # which must not read the settings cached before the changes above.
+    get_settings.cache_clear()
+
+    logger.info("Starting %s workers on %s:%s", workers, args.host, args.port)
+    try:
+        # Each worker builds its application with the factory, from the environment.
+        uvicorn.run("app.main:create_app", factory=True, host=args.host, port=args.port, workers=workers)
+    finally:
+        if change_dispatcher is not None:
+            change_dispatcher.stop()
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,91 @@
+import asyncio
+import threading
+import time
+from collections import deque
+from typing import Deque, Dict, Tuple
+
+from app.utils.metrics import ADMISSION_QUEUE_WAIT, ADMISSION_REJECTED
+
+class AdmissionLimiter:
+    """Bounds the requests served at once, queueing a bounded number of others for a bounded time.
+
+    A request over the limit waits in a FIFO queue for a slot. It is rejected
+    right away when the queue is full, and after ``queue_timeout`` seconds when
+    no slot freed up, so the latency added by queueing stays bounded and
+    overload turns into fast rejections instead of timeouts.
+
+    Attributes:
+        name (str): Label of the budget in the metrics, e.g. "read".
+        limit (int): Requests served at once.
+        queue_size (int): Requests waiting for a slot at most.
+        queue_timeout (float): Seconds a request waits for a slot at most.
+    """
+
+    def __init__(self, name: str, limit: int, queue_size: int = 100, queue_timeout: float = 2.0) -> None:
+        self.name = name
+        self.limit = limit
+        self.queue_size = queue_size
+        self.queue_timeout = queue_timeout
+        self._active = 0
+        self._waiters: Deque[Tuple[asyncio.AbstractEventLoop, asyncio.Future]] = deque()
+        self._lock = threading.Lock()
+
+    async def acquire(self) -> bool:
+        """Wait for a slot.
+
+        Returns:
+            bool: True when admitted, in which case ``release`` must be called once
+                the request is served. False when the request is shed.
+        """
+        with self._lock:
+            if self._active < self.limit and not self._waiters:
+                self._active += 1
+                return True
+            if len(self._waiters) >= self.queue_size:
+                ADMISSION_REJECTED.inc(self.name, "queue_full")
+                return False
+            loop = asyncio.get_running_loop()
+            waiter = (loop, loop.create_future())
+            self._waiters.append(waiter)
+
+        start = time.perf_counter()
+        try:
+            # Shielded, so that a slot handed over at the deadline is not lost.
+            await asyncio.wait_for(asyncio.shield(waiter[1]), self.queue_timeout)
+        except BaseException as e:
+            timed_out = isinstance(e, asyncio.TimeoutError)
+            with self._lock:
+                queued = waiter in self._waiters
+                if queued:
+                    self._waiters.remove(waiter)
+            if queued and timed_out:
+                ADMISSION_REJECTED.inc(self.name, "queue_timeout")
+                return False
+            if not queued and timed_out:
+                # The slot was handed over right at the deadline.
+                return True
+            if not queued:
+                self.release()
+            raise
+        finally:
+            ADMISSION_QUEUE_WAIT.observe(time.perf_counter() - start, self.name)
+        return True
+
+    def release(self) -> None:
+        """Free a slot, handing it over to the oldest waiting request if any"""
+        with self._lock:
+            if not self._waiters:
+                self._active -= 1
+                return
+            loop, future = self._waiters.popleft()
+        loop.call_soon_threadsafe(future.set_result, None)
+
+    def saturated(self) -> bool:
+        """Whether every slot is taken and the queue is full, so that new requests are shed"""
+        with self._lock:
+            return self._active >= self.limit and len(self._waiters) >= self.queue_size
+
+    def stats(self) -> Dict[str, int]:
+        """Get the number of requests being served and waiting"""
+        with self._lock:
+            return {"active": self._active, "queued": len(self._waiters)}
@@ -0,0 +1,92 @@
+import hashlib
+import re
+from datetime import datetime, timedelta, timezone
+from email.utils import format_datetime
+from typing import Any, Dict, List, Sequence
+
+ENTITY_TAG = re.compile(r'^"(\d+)-([0-9a-f]+)"$')
+EPOCH = datetime(1970, 1, 1)
+
+def entity_tag(user: Any) -> str:
+    """Build the strong ETag of a user.
+
+    The version identifies the update and the modification time tells apart a
+    user recreated under the ID of a deleted one.
+
+    Args:
+        user (Any): User row with ``version`` and ``updated_at``.
+
+    Returns:
+        str: Quoted entity tag.
+    """
+    stamp = (user.updated_at - EPOCH) // timedelta(microseconds=1)
+    return f'"{user.version}-{stamp:x}"'
+
+def parse_entity_tag(tag: str) -> tuple[int, datetime] | None:
+    """Recover the version and modification time encoded by ``entity_tag``.
+
+    Args:
+        tag (str): Entity tag sent by the client.
+
+    Returns:
+        tuple[int, datetime] | None: Version and naive UTC modification time, or
+        None if the tag was not produced by ``entity_tag``.
+    """
+    match = ENTITY_TAG.match(tag)
+    if match is None:
+        return None
+    return int(match.group(1)), EPOCH + timedelta(microseconds=int(match.group(2), 16))
+
+def list_tag(users: Sequence[Any], *extra: Any) -> str:
+    """Build a weak ETag for a page of users.
+
+    Args:
+        users (Sequence[Any]): Users of the page, in order.
+        *extra (Any): Other values the response depends on, e.g. the next cursor.
+
+    Returns:
+        str: Weak entity tag, changing whenever a user of the page changes.
+    """
+    digest = hashlib.blake2b(digest_size=16)
+    for user in users:
+        digest.update(f"{user.id}:{entity_tag(user)};".encode())
+    digest.update(repr(extra).encode())
+    return f'W/"{digest.hexdigest()}"'
+
+def last_modified(user: Any) -> str:
+    """Format the modification time of a user as an HTTP date"""
+    return format_datetime(user.updated_at.replace(tzinfo=timezone.utc, microsecond=0), usegmt=True)
+
+def validators(user: Any) -> Dict[str, str]:
+    """Build the ``ETag`` and ``Last-Modified`` headers of a user"""
+    return {"ETag": entity_tag(user), "Last-Modified": last_modified(user)}
+
+def parse_etags(header: str) -> List[str] | None:
+    """Split an ``If-Match`` or ``If-None-Match`` header into entity tags.
+
+    Args:
+        header (str): Header value.
+
+    Returns:
+        List[str] | None: Entity tags, or None for ``*``, which matches any.
+    """
+    if header.strip() == "*":
+        return None
+    return [tag.strip() for tag in header.split(",") if tag.strip()]
+
+def none_match(header: str | None, tag: str) -> bool:
+    """Check an ``If-None-Match`` header, using weak comparison.
+
+    Args:
+        header (str | None): Header value sent by the client.
+        tag (str): Current entity tag of the resource.
+
+    Returns:
+        bool: True if the client's copy is current and a 304 can be returned.
+    """
+    if header is None:
+        return False
+    tags = parse_etags(header)
+    if tags is None:
+        return True
+    return tag.removeprefix("W/") in {candidate.removeprefix("W/") for candidate in tags}
@@ -0,0 +1,33 @@
+import csv
+import io
+from typing import Iterable, Iterator, List
+
+from pydantic import TypeAdapter
+
+from app.models.user import User
+from app.schemas.user import UserResponse
+from app.utils.responses import user_values
+
+EXPORT_FIELDS = list(UserResponse.model_fields)
+
+_USER_LIST = TypeAdapter(List[UserResponse])
+
+def iter_ndjson(batches: Iterable[List[User]]) -> Iterator[bytes]:
+    """Render batches of users as newline-delimited JSON, one chunk per batch"""
+    for batch in batches:
+        users = _USER_LIST.validate_python([user_values(user) for user in batch])
+        yield b"".join(user.model_dump_json().encode() + b"\n" for user in users)
+
+def iter_csv(batches: Iterable[List[User]]) -> Iterator[bytes]:
+    """Render batches of users as CSV with a header row, one chunk per batch"""
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(EXPORT_FIELDS)
+    for batch in batches:
+        for user in _USER_LIST.validate_python([user_values(user) for user in batch]):
+            writer.writerow([getattr(user, field) for field in EXPORT_FIELDS])
+        yield buffer.getvalue().encode()
+        buffer.seek(0)
+        buffer.truncate()
+    if buffer.tell():
+        yield buffer.getvalue().encode()
@@ -0,0 +1,76 @@
+import atexit
+import json
+import logging
+import queue
+from logging.handlers import QueueHandler, QueueListener
+
+from app.utils.request_context import request_id
+
+TEXT_FORMAT = "%(asctime)s - %(name)s - %(levelname)s - [%(request_id)s] %(message)s"
+
+# Listener started by the last ``configure_logging``, one per process.
+_listener: QueueListener | None = None
+
+class RequestIdFilter(logging.Filter):
+    """Add the ID of the request being served to every record as ``request_id``"""
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        record.request_id = request_id.get()
+        return True
+
+class JsonFormatter(logging.Formatter):
+    """Format records as one JSON object per line"""
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "time": self.formatTime(record),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+            "request_id": getattr(record, "request_id", None),
+        }
+        if record.exc_info:
+            entry["exception"] = self.formatException(record.exc_info)
+        return json.dumps(entry, default=str)
+
+def configure_logging(level: str = "INFO", format: str = "text") -> QueueListener:
+    """Route every log record through a queue to a background writer thread.
+
+    Request handlers only put records on an in-memory queue, so slow log
+    output no longer adds to their latency. The listener is stopped at exit,
+    writing out the records still queued. Calling it again, e.g. for every
+    application built in a process, replaces the previous listener.
+
+    Args:
+        level (str, optional): Level of the root logger. Defaults to "INFO".
+        format (str, optional): "text" for human readable lines or "json" for one
+            JSON object per line. Defaults to "text".
+
+    Returns:
+        QueueListener: The started listener writing the records.
+    """
+    handler = logging.StreamHandler()
+    handler.setFormatter(JsonFormatter() if format == "json" else logging.Formatter(TEXT_FORMAT))
+
+    log_queue: queue.SimpleQueue = queue.SimpleQueue()
+    queue_handler = QueueHandler(log_queue)
+    # Handler filters run in the thread that logs, where the request ID is set,
+    # rather than in the listener thread.
+    queue_handler.addFilter(RequestIdFilter())
+
+    global _listener
+    root = logging.getLogger()
+    root.handlers = [queue_handler]
+    root.setLevel(level.upper())
+
+    if _listener is None:
+        atexit.register(_stop_listener)
+    else:
+        _listener.stop()
+    _listener = QueueListener(log_queue, handler, respect_handler_level=True)
+    _listener.start()
+    return _listener
+
+def _stop_listener() -> None:
+    if _listener is not None:
+        _listener.stop()
@@ -0,0 +1,203 @@
+import threading
+from abc import ABC, abstractmethod
+from typing import Callable, Dict, Iterable, List, Sequence, Tuple
+
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+DB_BUCKETS = (0.0001, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 1.0)
+COUNT_BUCKETS = (0, 1, 2, 3, 5, 10, 20, 50, 100)
+
+def _format_labels(names: Sequence[str], values: Sequence[str], extra: str = "") -> str:
+    pairs = [f'{name}="{value}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+class Metric(ABC):
+    """Base class for metrics kept in process and rendered in the Prometheus text format.
+
+    Attributes:
+        name (str): Metric name.
+        description (str): Help text.
+        label_names (Tuple[str, ...]): Names of the labels every sample must provide.
+    """
+    type_name = "untyped"
+
+    def __init__(self, name: str, description: str, label_names: Sequence[str] = ()) -> None:
+        self.name = name
+        self.description = description
+        self.label_names = tuple(label_names)
+        self._lock = threading.Lock()
+
+    def header(self) -> List[str]:
+        return [f"# HELP {self.name} {self.description}", f"# TYPE {self.name} {self.type_name}"]
+
+    @abstractmethod
+    def render(self) -> List[str]:
+        """Render the metric and its samples as lines of the text format"""
+        pass
+
+class Counter(Metric):
+    """Monotonically increasing value per label set"""
+    type_name = "counter"
+
+    def __init__(self, name: str, description: str, label_names: Sequence[str] = ()) -> None:
+        super().__init__(name, description, label_names)
+        self._values: Dict[Tuple[str, ...], float] = {}
+
+    def inc(self, *labels: str, amount: float = 1.0) -> None:
+        with self._lock:
+            self._values[labels] = self._values.get(labels, 0.0) + amount
+
+    def value(self, *labels: str) -> float:
+        return self._values.get(labels, 0.0)
+
+    def render(self) -> List[str]:
+        with self._lock:
+            items = list(self._values.items())
+        return self.header() + [
+            f"{self.name}{_format_labels(self.label_names, labels)} {value}" for labels, value in items
+        ]
+
+class Gauge(Counter):
+    """Value that can go up and down per label set"""
+    type_name = "gauge"
+
+    def dec(self, *labels: str, amount: float = 1.0) -> None:
+        self.inc(*labels, amount=-amount)
+
+    def set(self, value: float, *labels: str) -> None:
+        with self._lock:
+            self._values[labels] = value
+
+class Histogram(Metric):
+    """Distribution of observed values in cumulative buckets per label set"""
+    type_name = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        description: str,
+        label_names: Sequence[str] = (),
+        buckets: Sequence[float] = DEFAULT_BUCKETS
+    ) -> None:
+        super().__init__(name, description, label_names)
+        self.buckets = tuple(sorted(buckets))
+        self._series: Dict[Tuple[str, ...], List[float]] = {}
+
+    def observe(self, value: float, *labels: str) -> None:
+        with self._lock:
+            # Per-bucket counts followed by the total count and the sum.
+            series = self._series.get(labels)
+            if series is None:
+                series = self._series[labels] = [0.0] * (len(self.buckets) + 2)
+            for index, bound in enumerate(self.buckets):
+                if value <= bound:
+                    series[index] += 1
+                    break
+            series[-2] += 1
+            series[-1] += value
+
+    def count(self, *labels: str) -> int:
+        series = self._series.get(labels)
+        return int(series[-2]) if series else 0
+
+    def render(self) -> List[str]:
+        with self._lock:
+            items = [(labels, list(series)) for labels, series in self._series.items()]
+        lines = self.header()
+        for labels, series in items:
+            cumulative = 0.0
+            plain = _format_labels(self.label_names, labels)
+            for bound, count in zip(self.buckets, series):
+                cumulative += count
+                bucket = _format_labels(self.label_names, labels, f'le="{bound}"')
+                lines.append(f"{self.name}_bucket{bucket} {cumulative}")
+            bucket = _format_labels(self.label_names, labels, 'le="+Inf"')
+            lines.append(f"{self.name}_bucket{bucket} {series[-2]}")
+            lines.append(f"{self.name}_count{plain} {series[-2]}")
+            lines.append(f"{self.name}_sum{plain} {series[-1]}")
+        return lines
+
+class Registry:
+    """Collection of metrics and collector callbacks rendered together"""
+
+    def __init__(self) -> None:
+        self._metrics: List[Metric] = []
+        self._collectors: List[Callable[[], Iterable[Metric]]] = []
+
+    def register(self, metric: Metric) -> Metric:
+        self._metrics.append(metric)
+        return metric
+
+    def register_collector(self, collector: Callable[[], Iterable[Metric]]) -> None:
+        """Register a callback producing metrics computed at scrape time"""
+        self._collectors.append(collector)
+
+    def render(self, extra: Iterable[Metric] = ()) -> str:
+        """Render the registered metrics, then ``extra`` metrics such as those of one application"""
+        lines: List[str] = []
+        for metric in self._metrics:
+            lines.extend(metric.render())
+        for collector in self._collectors:
+            for metric in collector():
+                lines.extend(metric.render())
+        for metric in extra:
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+def cache_metrics(prefix: str, stats: Dict[str, int]) -> List[Metric]:
+    """Turn the counters returned by ``Cache.stats`` into metrics"""
+    metrics: List[Metric] = []
+    for key, value in stats.items():
+        if key == "size":
+            metric = Gauge(f"{prefix}_size", "Entries currently cached")
+        else:
+            metric = Counter(f"{prefix}_{key}_total", f"Total cache {key}")
+        metric.inc(amount=value)
+        metrics.append(metric)
+    return metrics
+
+REGISTRY = Registry()
+
+HTTP_REQUESTS = REGISTRY.register(Counter(
+    "http_requests_total", "Total HTTP requests", ("method", "route", "status")
+))
+HTTP_IN_FLIGHT = REGISTRY.register(Gauge(
+    "http_requests_in_flight", "HTTP requests currently being served"
+))
+HTTP_LATENCY = REGISTRY.register(Histogram(
+    "http_request_duration_seconds", "HTTP request latency", ("method", "route")
+))
+DB_QUERIES = REGISTRY.register(Counter(
+    "db_queries_total", "Total SQL statements executed"
+))
+DB_QUERY_LATENCY = REGISTRY.register(Histogram(
+    "db_query_duration_seconds", "SQL statement latency", buckets=DB_BUCKETS
+))
+DB_QUERIES_PER_REQUEST = REGISTRY.register(Histogram(
+    "db_queries_per_request", "SQL statements executed per HTTP request", ("route",), buckets=COUNT_BUCKETS
+))
+DB_TIME_PER_REQUEST = REGISTRY.register(Histogram(
+    "db_request_duration_seconds", "Time spent in SQL statements per HTTP request", ("route",), buckets=DB_BUCKETS
+))
+DB_POOL_CHECKOUT = REGISTRY.register(Histogram(
+    "db_pool_checkout_seconds", "Time waiting for a connection from the pool", buckets=DB_BUCKETS
+))
+DB_CONNECTION_HOLD = REGISTRY.register(Histogram(
+    "db_connection_hold_seconds", "Time a connection is checked out of the pool", buckets=DB_BUCKETS
+))
+CHANGES_DISPATCHED = REGISTRY.register(Counter(
+    "user_changes_dispatched_total", "User changes delivered to the change sink"
+))
+REQUESTS_COALESCED = REGISTRY.register(Counter(
+    "http_requests_coalesced_total", "Requests served by an identical request already in flight", ("route",)
+))
+ADMISSION_REJECTED = REGISTRY.register(Counter(
+    "http_requests_shed_total", "Requests rejected with 503 by admission control", ("budget", "reason")
+))
+ADMISSION_QUEUE_WAIT = REGISTRY.register(Histogram(
+    "http_admission_queue_seconds", "Time requests waited for an admission slot", ("budget",)
+))
+STARTUP_PHASE = REGISTRY.register(Gauge(
+    "app_startup_seconds", "Time taken by each phase of the last application start", ("phase",)
+))
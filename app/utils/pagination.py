@@ -0,0 +1,75 @@
+import base64
+import binascii
+import json
+from typing import Any, Sequence
+
+from app.exceptions import InvalidCursorError
+
+# Type of the sort key a cursor may carry, per sort column. For "id", the key
+# is the ID itself and may be omitted.
+KEY_TYPES = {
+    "id": (int, type(None)),
+    "name": (str,),
+    "email": (str,),
+}
+
+def _valid_key(sort_by: str, key: Any) -> bool:
+    # bool is an int subclass, but never a valid key.
+    return isinstance(key, KEY_TYPES.get(sort_by, ())) and not isinstance(key, bool)
+
+def encode_cursor(sort_by: str, key: Any, user_id: int, order: str = "asc") -> str:
+    """Encode the position of the last row of a page into an opaque cursor.
+
+    Args:
+        sort_by (str): Column the page is ordered by.
+        key (Any): Value of the sort column for the last row.
+        user_id (int): ID of the last row, used as a tie-breaker.
+        order (str, optional): Direction of the ordering, "asc" or "desc". Defaults to "asc".
+
+    Returns:
+        str: URL-safe cursor to pass back as the ``cursor`` query parameter.
+    """
+    payload = json.dumps({"s": sort_by, "o": order, "k": key, "i": user_id}, separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+def decode_cursor(cursor: str, sort_by: str, order: str = "asc") -> tuple[Any, int]:
+    """Decode a cursor produced by ``encode_cursor``.
+
+    Args:
+        cursor (str): Cursor received from the client.
+        sort_by (str): Column the current request is ordered by.
+        order (str, optional): Direction the current request is ordered in. Defaults to "asc".
+
+    Returns:
+        tuple[Any, int]: Sort key and ID of the row to continue after.
+
+    Raises:
+        InvalidCursorError: If the cursor is malformed or was issued for another sort order.
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        if payload["s"] != sort_by or payload.get("o", "asc") != order or not isinstance(payload["i"], int):
+            raise ValueError("cursor does not match the requested sort order")
+        if not _valid_key(sort_by, payload["k"]):
+            raise ValueError("cursor sort key has the wrong type")
+        return payload["k"], payload["i"]
+    except (binascii.Error, ValueError, KeyError, TypeError) as e:
+        raise InvalidCursorError(cursor) from e
+
+def next_page_cursor(rows: Sequence[Any], limit: int, sort_by: str, order: str = "asc") -> str | None:
+    """Build the cursor for the page following ``rows``.
+
+    Args:
+        rows (Sequence[Any]): Rows of the current page, in order.
+        limit (int): Page size that was requested.
+        sort_by (str): Column the page is ordered by.
+        order (str, optional): Direction the page is ordered in. Defaults to "asc".
+
+    Returns:
+        str | None: Cursor after the last row, or None if the page is not full.
+    """
+    if not rows or len(rows) < limit:
+        return None
+    last = rows[-1]
+    return encode_cursor(sort_by, getattr(last, sort_by), last.id, order)
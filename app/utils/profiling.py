@@ -0,0 +1,187 @@
+import asyncio
+import functools
+import hmac
+import io
+import logging
+import os
+import random
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Any, Callable, Iterator
+
+from fastapi import Request, Response
+from fastapi.routing import APIRoute
+
+from app.utils.request_context import RequestStats, request_id, request_stats
+
+if TYPE_CHECKING:
+    import cProfile
+
+logger = logging.getLogger(__name__)
+
+PROFILE_HEADER = "x-profile"
+# Functions listed in the logged report, by cumulative time.
+PROFILE_REPORT_LINES = 30
+
+# Held by the request being profiled. Only one profiler may be active in a
+# process: from Python 3.12 enabling a second one raises, and an enabled one
+# records every thread.
+_profiler_lock = threading.Lock()
+
+@dataclass
+class ProfilingConfig:
+    """When to profile a request and where the profiles go.
+
+    Attributes:
+        sample_rate (float): Fraction of requests profiled at random.
+        token (str): Value of the ``X-Profile`` header that gets a request profiled.
+            Empty to ignore the header.
+        directory (str): Directory the ``.prof`` files are written to, named after
+            the request ID. Empty to only log the report.
+    """
+    sample_rate: float = 0.0
+    token: str = ""
+    directory: str = ""
+
+    def wanted(self, header: str | None) -> bool:
+        """Whether a request with the given ``X-Profile`` header is profiled"""
+        # Compared as bytes: headers are latin-1, and compare_digest rejects non-ASCII str.
+        if self.token and header is not None and hmac.compare_digest(header.encode("latin-1"), self.token.encode()):
+            return True
+        return self.sample_rate > 0 and random.random() < self.sample_rate
+
+# Used by applications without a profiling config in their state.
+NO_PROFILING = ProfilingConfig()
+
+def configure_profiling(sample_rate: float = 0.0, token: str = "", directory: str = "") -> ProfilingConfig:
+    """Build the config of an application's ``app.state.profiling``, creating its directory"""
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    return ProfilingConfig(sample_rate=sample_rate, token=token, directory=directory)
+
+class TimedRoute(APIRoute):
+    """Route recording how long validation, the endpoint and serialization take.
+
+    The phases are added to the stats of the request, from which the
+    ``Server-Timing`` header is built, and the endpoint of a request picked by
+    the ``ProfilingConfig`` of ``app.state.profiling`` runs under cProfile.
+    For sync endpoints, that is the worker thread running them. For async
+    endpoints, the event loop also runs other requests while the endpoint
+    awaits, which then appear in the profile.
+    """
+
+    def __init__(self, path: str, endpoint: Callable[..., Any], **kwargs: Any) -> None:
+        super().__init__(path, _timed_endpoint(endpoint), **kwargs)
+
+    def get_route_handler(self) -> Callable[[Request], Any]:
+        handler = super().get_route_handler()
+
+        async def timed_handler(request: Request) -> Response:
+            stats = request_stats.get()
+            if stats is None:
+                return await handler(request)
+            config = getattr(request.app.state, "profiling", NO_PROFILING)
+            stats.profile = config.wanted(request.headers.get(PROFILE_HEADER))
+            stats.profile_dir = config.directory
+            stats.route_start = time.perf_counter()
+            response = await handler(request)
+            # FastAPI validates and renders returned values after the endpoint.
+            if stats.endpoint_end is not None:
+                stats.serialize_time += time.perf_counter() - stats.endpoint_end
+            return response
+
+        return timed_handler
+
+def _timed_endpoint(endpoint: Callable[..., Any]) -> Callable[..., Any]:
+    """Wrap an endpoint in ``_endpoint_phase``, keeping its signature and kind
+
+    ``include_router`` builds the routes again from their endpoints, which are
+    then already wrapped and kept as they are.
+    """
+    if getattr(endpoint, "_timed", False):
+        return endpoint
+    if asyncio.iscoroutinefunction(endpoint):
+        @functools.wraps(endpoint)
+        async def timed_async(*args: Any, **kwargs: Any) -> Any:
+            with _endpoint_phase(endpoint.__name__):
+                return await endpoint(*args, **kwargs)
+        timed_async._timed = True  # type: ignore[attr-defined]
+        return timed_async
+
+    @functools.wraps(endpoint)
+    def timed(*args: Any, **kwargs: Any) -> Any:
+        with _endpoint_phase(endpoint.__name__):
+            return endpoint(*args, **kwargs)
+    timed._timed = True  # type: ignore[attr-defined]
+    return timed
+
+@contextmanager
+def _endpoint_phase(name: str) -> Iterator[None]:
+    stats = request_stats.get()
+    if stats is None:
+        yield
+        return
+    start = time.perf_counter()
+    if stats.route_start is not None:
+        stats.validation_time = start - stats.route_start
+    outside = stats.db_time + stats.pool_wait + stats.serialize_time
+    profiler = None
+    if stats.profile:
+        if _profiler_lock.acquire(blocking=False):
+            # Imported on first use, most processes never profile.
+            import cProfile
+
+            profiler = cProfile.Profile()
+            try:
+                profiler.enable()
+            except ValueError:
+                # Another profiling tool is active in the process.
+                logger.info("Not profiling %s, another profiler is active", name)
+                profiler = None
+                _profiler_lock.release()
+        else:
+            logger.info("Not profiling %s, another request is being profiled", name)
+    try:
+        yield
+    finally:
+        end = time.perf_counter()
+        if profiler is not None:
+            profiler.disable()
+            _profiler_lock.release()
+            _report(name, profiler, stats.profile_dir)
+        stats.endpoint_end = end
+        inside = stats.db_time + stats.pool_wait + stats.serialize_time - outside
+        stats.app_time = max(0.0, end - start - inside)
+
+def _report(name: str, profiler: "cProfile.Profile", directory: str) -> None:
+    """Log the functions the endpoint spent the most time in, and save the profile to ``directory`` if set"""
+    import pstats
+
+    output = io.StringIO()
+    pstats.Stats(profiler, stream=output).sort_stats("cumulative").print_stats(PROFILE_REPORT_LINES)
+    logger.info("Profile of %s:\n%s", name, output.getvalue())
+    if directory:
+        path = os.path.join(directory, f"{request_id.get()}.prof")
+        profiler.dump_stats(path)
+        logger.info("Profile of %s saved to: %s", name, path)
+
+def server_timing(stats: RequestStats, total: float) -> str:
+    """Build a ``Server-Timing`` header value from the stats of a request.
+
+    Args:
+        stats (RequestStats): Work recorded while serving the request.
+        total (float): Seconds since the request was received.
+
+    Returns:
+        str: Durations in milliseconds, e.g. ``validate;dur=0.41, db;dur=1.20;desc="2 queries", ...``.
+    """
+    return ", ".join([
+        f"validate;dur={stats.validation_time * 1000:.2f}",
+        f"app;dur={stats.app_time * 1000:.2f}",
+        f'db;dur={stats.db_time * 1000:.2f};desc="{stats.db_queries} queries"',
+        f"pool;dur={stats.pool_wait * 1000:.2f}",
+        f"serialize;dur={stats.serialize_time * 1000:.2f}",
+        f"total;dur={total * 1000:.2f}",
+    ])
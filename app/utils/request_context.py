@@ -0,0 +1,36 @@
+from contextvars import ContextVar
+from dataclasses import dataclass
+
+@dataclass
+class RequestStats:
+    """Work accumulated while serving a single request.
+
+    Attributes:
+        db_queries (int): Number of SQL statements executed.
+        db_time (float): Seconds spent executing SQL statements.
+        pool_wait (float): Seconds spent waiting for pooled connections.
+        validation_time (float): Seconds spent reading and validating the request
+            and resolving dependencies, before the endpoint runs.
+        app_time (float): Seconds spent in the endpoint, outside of the database
+            and serialization.
+        serialize_time (float): Seconds spent rendering the response.
+        profile (bool): Whether the endpoint is run under the profiler.
+        profile_dir (str): Directory the profile is saved to. Empty to only log it.
+        route_start (float | None): ``perf_counter`` time the route started handling
+            the request.
+        endpoint_end (float | None): ``perf_counter`` time the endpoint returned.
+    """
+    db_queries: int = 0
+    db_time: float = 0.0
+    pool_wait: float = 0.0
+    validation_time: float = 0.0
+    app_time: float = 0.0
+    serialize_time: float = 0.0
+    profile: bool = False
+    profile_dir: str = ""
+    route_start: float | None = None
+    endpoint_end: float | None = None
+
+request_stats: ContextVar[RequestStats | None] = ContextVar("request_stats", default=None)
+
+request_id: ContextVar[str] = ContextVar("request_id", default="-")
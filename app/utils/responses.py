@@ -0,0 +1,57 @@
+import time
+from typing import Any, Mapping
+
+from fastapi.responses import Response
+from pydantic import BaseModel
+
+from app.models.user import User
+from app.schemas.user import UserResponse
+from app.utils.request_context import request_stats
+
+class ModelResponse(Response):
+    """JSON response rendering a pydantic model straight to bytes.
+
+    Serialization happens in pydantic-core, skipping the intermediate dict and
+    the stdlib encoder that ``JSONResponse(content=model.model_dump())`` goes through.
+    """
+    media_type = "application/json"
+
+    def __init__(
+        self,
+        content: BaseModel,
+        status_code: int = 200,
+        headers: Mapping[str, str] | None = None,
+        **kwargs: Any
+    ) -> None:
+        super().__init__(content=content, status_code=status_code, headers=headers, **kwargs)
+
+    def render(self, content: BaseModel) -> bytes:
+        return render_json(content)
+
+def render_json(content: BaseModel) -> bytes:
+    """Serialize a model to JSON bytes, counting the time against the request being served"""
+    start = time.perf_counter()
+    body = content.model_dump_json().encode()
+    stats = request_stats.get()
+    if stats is not None:
+        stats.serialize_time += time.perf_counter() - start
+    return body
+
+_USER_FIELDS = UserResponse.model_fields.keys()
+
+def user_values(user: User) -> Any:
+    """Get the input to validate a ``UserResponse`` from a ``User`` row.
+
+    Reading the loaded column values from the instance ``__dict__`` avoids going
+    through SQLAlchemy's instrumented attributes one field at a time, which
+    dominates the cost of serializing ORM rows. Rows with expired attributes are
+    returned as is and read through their attributes instead.
+
+    Args:
+        user (User): The user row to serialize.
+
+    Returns:
+        Any: A dict of column values, or the row itself.
+    """
+    data = user.__dict__
+    return data if data.keys() >= _USER_FIELDS else user
@@ -0,0 +1,60 @@
+import threading
+from concurrent.futures import Future
+from typing import Callable, Dict, Hashable, TypeVar
+
+from app.utils.metrics import REQUESTS_COALESCED
+
+T = TypeVar("T")
+
+class SingleFlight:
+    """Runs a call once for every caller asking for the same key at the same time.
+
+    The first caller runs the function, the callers arriving while it runs wait
+    for it and get its result, or its exception. Nothing is kept afterwards, so
+    a caller arriving once the call finished runs it again. A caller joining a
+    running call may get a result read before it arrived, so the key must tell
+    apart calls whose results a caller cannot accept, e.g. ones started before
+    a write it has seen complete.
+
+    Attributes:
+        name (str): Label of the coalesced requests counter.
+    """
+
+    def __init__(self, name: str) -> None:
+        self.name = name
+        self._calls: Dict[Hashable, Future] = {}
+        self._lock = threading.Lock()
+
+    def do(self, key: Hashable, function: Callable[[], T]) -> T:
+        """Run ``function``, or wait for the call already running for ``key``.
+
+        Args:
+            key (Hashable): Identifies calls that produce the same result.
+            function (Callable[[], T]): Produces the result.
+
+        Returns:
+            T: The result of the call.
+        """
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = Future()
+        if not leader:
+            REQUESTS_COALESCED.inc(self.name)
+            return call.result()
+        try:
+            result = function()
+        except BaseException as e:
+            call.set_exception(e)
+            raise
+        else:
+            call.set_result(result)
+            return result
+        finally:
+            with self._lock:
+                del self._calls[key]
+
+    def in_flight(self) -> int:
+        """Get the number of calls currently running"""
+        return len(self._calls)
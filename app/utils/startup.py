@@ -0,0 +1,50 @@
+import logging
+import time
+from contextlib import contextmanager
+from typing import Dict, Iterator
+
+from app.utils.metrics import STARTUP_PHASE
+
+logger = logging.getLogger(__name__)
+
+class StartupTimer:
+    """Times the phases of an application start, from the import of its modules to ready.
+
+    Every phase is logged and exported as ``app_startup_seconds{phase=...}``,
+    along with the total once the application is ready.
+
+    Attributes:
+        started (float): ``perf_counter`` time the start began.
+        phases (Dict[str, float]): Seconds taken by each phase, in order.
+    """
+
+    def __init__(self, started: float) -> None:
+        self.started = started
+        self.phases: Dict[str, float] = {}
+
+    def record(self, phase: str, seconds: float) -> None:
+        """Record a phase timed elsewhere"""
+        self.phases[phase] = seconds
+        STARTUP_PHASE.set(seconds, phase)
+        logger.debug("Startup phase %s took %.1f ms", phase, seconds * 1000)
+
+    @contextmanager
+    def phase(self, name: str) -> Iterator[None]:
+        """Time the block as the phase ``name``"""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(name, time.perf_counter() - start)
+
+    def ready(self) -> float:
+        """Record the total time since the start began and log the breakdown.
+
+        Returns:
+            float: Seconds since the start began.
+        """
+        total = time.perf_counter() - self.started
+        STARTUP_PHASE.set(total, "total")
+        breakdown = ", ".join(f"{phase} {seconds * 1000:.1f} ms" for phase, seconds in self.phases.items())
+        logger.info("Application ready in %.1f ms (%s)", total * 1000, breakdown)
+        return total
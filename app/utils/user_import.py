@@ -0,0 +1,166 @@
+import codecs
+import csv
+import json
+import logging
+from typing import Any, Dict, Iterable, Iterator, List, Literal
+
+from pydantic import TypeAdapter, ValidationError
+from sqlalchemy.exc import SQLAlchemyError
+
+from app.exceptions import UserException
+from app.models.user import User
+from app.repositories.user_repository import UserRepository
+from app.schemas.user import ImportRowError, ImportSummary, UserCreate
+
+logger = logging.getLogger(__name__)
+
+ImportFormat = Literal["ndjson", "csv"]
+
+# A parsed row: its line number and either the raw record or a parse error.
+Record = tuple[int, Dict[str, Any] | str]
+
+_USER_CREATE_LIST = TypeAdapter(List[UserCreate])
+
+def iter_lines(chunks: Iterable[bytes]) -> Iterator[str]:
+    """Decode a stream of UTF-8 byte chunks into lines, keeping line endings"""
+    decoder = codecs.getincrementaldecoder("utf-8-sig")()
+    pending = ""
+    for chunk in chunks:
+        # Only split on "\n": str.splitlines would also split on characters such
+        # as U+2028 that may appear unescaped inside JSON strings.
+        lines = (pending + decoder.decode(chunk)).split("\n")
+        pending = lines.pop()
+        for line in lines:
+            yield line + "\n"
+    pending += decoder.decode(b"", final=True)
+    if pending:
+        yield pending
+
+def parse_ndjson(lines: Iterable[str]) -> Iterator[Record]:
+    """Parse one JSON object per line, skipping blank lines"""
+    for line_number, line in enumerate(lines, start=1):
+        if not line.strip():
+            continue
+        try:
+            record = json.loads(line)
+        except ValueError as e:
+            yield line_number, f"Invalid JSON: {e}"
+            continue
+        if not isinstance(record, dict):
+            yield line_number, "Expected a JSON object"
+            continue
+        yield line_number, record
+
+def parse_csv(lines: Iterable[str]) -> Iterator[Record]:
+    """Parse CSV rows with a header line, treating empty cells as missing"""
+    reader = csv.DictReader(lines)
+    for row in reader:
+        yield reader.line_num, {key: value for key, value in row.items() if key and value not in ("", None)}
+
+PARSERS = {
+    "ndjson": parse_ndjson,
+    "csv": parse_csv,
+}
+
+class UserImporter:
+    """Imports users from parsed records in chunked transactions.
+
+    Records are validated against ``UserCreate`` a batch at a time and each
+    batch is written with ``UserRepository.bulk_create``, which commits the
+    valid rows of the batch in a single transaction. Only one batch is held in
+    memory, and at most ``max_errors`` rejected rows are kept for the summary.
+
+    Attributes:
+        repository (UserRepository): Repository used to write the users.
+        batch_size (int): Number of rows validated and written per transaction.
+        max_errors (int): Maximum number of rejected rows listed in the summary.
+        summary (ImportSummary): Counters of the import so far.
+    """
+
+    def __init__(self, repository: UserRepository, batch_size: int = 1000, max_errors: int = 100) -> None:
+        self.repository = repository
+        self.batch_size = batch_size
+        self.max_errors = max_errors
+        self.summary = ImportSummary()
+
+    def run(self, records: Iterable[Record]) -> ImportSummary:
+        """Import every record and return the summary"""
+        batch: List[tuple[int, Dict[str, Any]]] = []
+        for line, record in records:
+            self.summary.processed += 1
+            if isinstance(record, str):
+                self._reject(line, record)
+                continue
+            batch.append((line, record))
+            if len(batch) >= self.batch_size:
+                self._import_batch(batch)
+                batch = []
+        if batch:
+            self._import_batch(batch)
+        logger.info(
+            "Imported %s of %s users, rejected %s",
+            self.summary.imported, self.summary.processed, self.summary.rejected
+        )
+        return self.summary
+
+    def _import_batch(self, batch: List[tuple[int, Dict[str, Any]]]) -> None:
+        valid = self._validate(batch)
+        if not valid:
+            return
+        try:
+            results = self.repository.bulk_create([User(**user.model_dump()) for _, user in valid])
+        except SQLAlchemyError as e:
+            self.repository.session.rollback()
+            logger.exception("Import batch failed, rolled back")
+            for line, user in valid:
+                self._reject(line, f"Batch rolled back: {e.__class__.__name__}", user.email)
+            return
+        for (line, user), result in zip(valid, results):
+            if isinstance(result, UserException):
+                self._reject(line, result.detail, user.email)
+            else:
+                self.summary.imported += 1
+
+    def _validate(self, batch: List[tuple[int, Dict[str, Any]]]) -> List[tuple[int, UserCreate]]:
+        """Validate a whole batch at once, falling back to row by row to locate errors"""
+        try:
+            users = _USER_CREATE_LIST.validate_python([record for _, record in batch])
+            return [(line, user) for (line, _), user in zip(batch, users)]
+        except ValidationError:
+            pass
+        valid = []
+        for line, record in batch:
+            try:
+                valid.append((line, UserCreate.model_validate(record)))
+            except ValidationError as e:
+                detail = "; ".join(f"{'.'.join(map(str, error['loc']))}: {error['msg']}" for error in e.errors())
+                email = record.get("email")
+                self._reject(line, detail, email if isinstance(email, str) else None)
+        return valid
+
+    def _reject(self, line: int, detail: str, email: str | None = None) -> None:
+        self.summary.rejected += 1
+        if len(self.summary.errors) < self.max_errors:
+            self.summary.errors.append(ImportRowError(line=line, detail=detail, email=email))
+        else:
+            self.summary.errors_truncated = True
+
+def import_users(
+    repository: UserRepository,
+    chunks: Iterable[bytes],
+    format: ImportFormat = "ndjson",
+    batch_size: int = 1000,
+) -> ImportSummary:
+    """Import users from a stream of NDJSON or CSV bytes.
+
+    Args:
+        repository (UserRepository): Repository used to write the users.
+        chunks (Iterable[bytes]): The file contents, in chunks of any size.
+        format (ImportFormat, optional): "ndjson" or "csv". Defaults to "ndjson".
+        batch_size (int, optional): Rows per transaction. Defaults to 1000.
+
+    Returns:
+        ImportSummary: Counters and the first rejected rows.
+    """
+    records = PARSERS[format](iter_lines(chunks))
+    return UserImporter(repository, batch_size=batch_size).run(records)
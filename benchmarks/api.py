@@ -0,0 +1,250 @@
+"""Benchmark the user API endpoints in-process or against a live server.
+
+Seeds N users, then drives POST /users/, GET /users/, GET /users/{id},
+PUT /users/{id} and DELETE /users/{id}, reporting throughput, latency
+percentiles and allocations per scenario as JSON.
+
+Usage:
+    python -m benchmarks.api --users 10000 --requests 2000 --output results.json
+    python -m benchmarks.api --live --concurrency 32 --output live.json
+    python -m benchmarks.api --compare baseline.json --output results.json
+"""
+import argparse
+import itertools
+import json
+import os
+import random
+import socket
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import tracemalloc
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Any, Callable, Dict, List
+
+import httpx
+
+SCENARIOS = ["create", "list", "get", "update", "delete"]
+
+def percentile(samples: List[float], q: float) -> float:
+    """Nearest-rank percentile of an unsorted list of samples"""
+    ordered = sorted(samples)
+    index = min(len(ordered) - 1, max(0, round(q / 100 * len(ordered)) - 1))
+    return ordered[index]
+
+def summarize(latencies: List[float], wall: float, errors: int) -> Dict[str, Any]:
+    return {
+        "requests": len(latencies),
+        "errors": errors,
+        "throughput_rps": round(len(latencies) / wall, 1),
+        "mean_ms": round(sum(latencies) / len(latencies) * 1000, 3),
+        "p50_ms": round(percentile(latencies, 50) * 1000, 3),
+        "p95_ms": round(percentile(latencies, 95) * 1000, 3),
+        "p99_ms": round(percentile(latencies, 99) * 1000, 3),
+    }
+
+class Workload:
+    """Builds the request for each scenario, tracking which users exist"""
+
+    def __init__(self, user_ids: List[int]) -> None:
+        self.user_ids = user_ids
+        self.deletable: List[int] = []
+        self._sequence = itertools.count()
+        self._lock = threading.Lock()
+        self._rng = random.Random(42)
+
+    def request(self, client: Any, scenario: str) -> Any:
+        if scenario == "create":
+            n = next(self._sequence)
+            response = client.post("/users/", json={"name": f"Bench {n}", "email": f"bench{n}@example.com"})
+            if response.status_code == 201:
+                with self._lock:
+                    self.deletable.append(response.json()["id"])
+            return response
+        if scenario == "list":
+            return client.get("/users/", params={"offset": self._rng.randrange(len(self.user_ids)), "limit": 100})
+        if scenario == "get":
+            return client.get(f"/users/{self._rng.choice(self.user_ids)}")
+        if scenario == "update":
+            n = next(self._sequence)
+            return client.put(f"/users/{self._rng.choice(self.user_ids)}", json={"name": f"Updated {n}"})
+        with self._lock:
+            user_id = self.deletable.pop() if self.deletable else self.user_ids.pop()
+        return client.delete(f"/users/{user_id}")
+
+def run_scenario(make_client: Callable[[], Any], workload: Workload, scenario: str, requests: int, concurrency: int) -> Dict[str, Any]:
+    """Send ``requests`` requests for a scenario over ``concurrency`` workers"""
+    latencies: List[float] = []
+    errors = 0
+    lock = threading.Lock()
+    per_worker = max(1, requests // concurrency)
+
+    def worker() -> None:
+        nonlocal errors
+        client = make_client()
+        local: List[float] = []
+        failed = 0
+        for _ in range(per_worker):
+            start = time.perf_counter()
+            response = workload.request(client, scenario)
+            local.append(time.perf_counter() - start)
+            failed += response.status_code >= 400
+        with lock:
+            latencies.extend(local)
+            errors += failed
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        for future in [executor.submit(worker) for _ in range(concurrency)]:
+            future.result()
+    return summarize(latencies, time.perf_counter() - start, errors)
+
+def measure_allocations(client: Any, workload: Workload, scenario: str, requests: int) -> Dict[str, Any]:
+    """Trace Python allocations for a short sequential run of a scenario"""
+    tracemalloc.start()
+    blocks_before = sys.getallocatedblocks()
+    for _ in range(requests):
+        workload.request(client, scenario)
+    _, peak = tracemalloc.get_traced_memory()
+    snapshot = tracemalloc.take_snapshot()
+    tracemalloc.stop()
+    return {
+        "alloc_peak_kib": round(peak / 1024, 1),
+        "alloc_retained_blocks_per_request": round((sys.getallocatedblocks() - blocks_before) / requests, 1),
+        "alloc_traced_blocks": sum(stat.count for stat in snapshot.statistics("filename")),
+    }
+
+def seed(client: Any, users: int) -> List[int]:
+    """Create users through the bulk endpoint and return their IDs"""
+    ids: List[int] = []
+    for start in range(0, users, 1000):
+        batch = [
+            {"name": f"Seed {i}", "email": f"seed{i}@example.com"}
+            for i in range(start, min(users, start + 1000))
+        ]
+        response = client.post("/users/bulk", json=batch)
+        ids.extend(item["id"] for item in response.json()["items"] if item["ok"])
+    return ids
+
+def in_process_client_factory(database_path: Path) -> Callable[[], Any]:
+    """Serve the app through TestClient, backed by a fresh database file"""
+    from fastapi.testclient import TestClient
+
+    from app.database.sqlite import SQLiteDatabase, PERFORMANCE_PRAGMAS
+    from app.dependencies import get_session, get_read_session
+    from app.main import app
+
+    db = SQLiteDatabase(
+        url=f"sqlite:///{database_path}",
+        pragmas=PERFORMANCE_PRAGMAS,
+        connect_args={"check_same_thread": False},
+        pool_size=64,
+    )
+    db.create_db_and_tables()
+    app.dependency_overrides[get_session] = db.get_session
+    app.dependency_overrides[get_read_session] = db.get_session
+    return lambda: TestClient(app)
+
+def live_client_factory(url: str | None, database_path: Path) -> tuple[Callable[[], Any], subprocess.Popen | None]:
+    """Use a running server, or start uvicorn on a free port with a fresh database"""
+    process = None
+    if url is None:
+        with socket.socket() as sock:
+            sock.bind(("127.0.0.1", 0))
+            port = sock.getsockname()[1]
+        env = {**os.environ, "DATABASE_URL": f"sqlite:///{database_path}", "LOG_LEVEL": "WARNING"}
+        process = subprocess.Popen(
+            [sys.executable, "-m", "uvicorn", "app.main:app", "--port", str(port), "--log-level", "warning"],
+            env=env,
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL,
+        )
+        url = f"http://127.0.0.1:{port}"
+        deadline = time.monotonic() + 30
+        while True:
+            try:
+                httpx.get(f"{url}/health")
+                break
+            except httpx.TransportError:
+                if time.monotonic() > deadline:
+                    process.terminate()
+                    raise RuntimeError("uvicorn did not start within 30 seconds")
+                time.sleep(0.1)
+    return (lambda: httpx.Client(base_url=url, timeout=30)), process
+
+def git_revision() -> str | None:
+    try:
+        return subprocess.check_output(["git", "rev-parse", "--short", "HEAD"], text=True).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+def compare(current: Dict[str, Any], baseline: Dict[str, Any], threshold: float) -> bool:
+    """Print p95 and throughput deltas against a baseline, returning False on regression"""
+    ok = True
+    for scenario, result in current["scenarios"].items():
+        previous = baseline["scenarios"].get(scenario)
+        if previous is None:
+            continue
+        p95_change = (result["p95_ms"] - previous["p95_ms"]) / previous["p95_ms"] * 100
+        rps_change = (result["throughput_rps"] - previous["throughput_rps"]) / previous["throughput_rps"] * 100
+        regressed = p95_change > threshold
+        ok = ok and not regressed
+        print(f"{scenario:>7}: p95 {p95_change:+.1f}%  throughput {rps_change:+.1f}%{'  REGRESSION' if regressed else ''}")
+    return ok
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--users", type=int, default=10000, help="users to seed before measuring")
+    parser.add_argument("--requests", type=int, default=2000, help="requests per scenario")
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--scenarios", nargs="+", choices=SCENARIOS, default=SCENARIOS)
+    parser.add_argument("--live", action="store_true", help="drive a uvicorn server over HTTP")
+    parser.add_argument("--url", help="base URL of an already running server (implies --live)")
+    parser.add_argument("--allocation-requests", type=int, default=200, help="sequential requests traced per scenario, 0 to skip")
+    parser.add_argument("--output", help="write the JSON results to this file")
+    parser.add_argument("--compare", help="baseline JSON results to compare against")
+    parser.add_argument("--threshold", type=float, default=10.0, help="p95 increase in percent counted as a regression")
+    args = parser.parse_args()
+
+    live = args.live or args.url is not None
+    with tempfile.TemporaryDirectory() as directory:
+        database_path = Path(directory) / "bench.db"
+        process = None
+        if live:
+            make_client, process = live_client_factory(args.url, database_path)
+        else:
+            make_client = in_process_client_factory(database_path)
+        try:
+            workload = Workload(seed(make_client(), args.users))
+            scenarios = {}
+            for scenario in args.scenarios:
+                result = run_scenario(make_client, workload, scenario, args.requests, args.concurrency)
+                if args.allocation_requests and not live:
+                    result.update(measure_allocations(make_client(), workload, scenario, args.allocation_requests))
+                scenarios[scenario] = result
+                print(f"{scenario:>7}: {json.dumps(result)}", file=sys.stderr)
+        finally:
+            if process is not None:
+                process.terminate()
+                process.wait()
+
+    results = {
+        "revision": git_revision(),
+        "mode": "live" if live else "in-process",
+        "users": args.users,
+        "requests": args.requests,
+        "concurrency": args.concurrency,
+        "scenarios": scenarios,
+    }
+    if args.output:
+        Path(args.output).write_text(json.dumps(results, indent=2))
+    else:
+        print(json.dumps(results, indent=2))
+    if args.compare and not compare(results, json.loads(Path(args.compare).read_text()), args.threshold):
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,51 @@
+"""Compare the previous and current serialization paths of user list responses.
+
+Usage:
+    python -m benchmarks.serialization --users 100 --repeat 2000
+"""
+import argparse
+import json
+import timeit
+
+from fastapi.responses import JSONResponse
+from sqlmodel import Session, SQLModel, create_engine, select
+
+from app.models.user import User
+from app.schemas.user import UserListResponse, UserResponse
+from app.utils.responses import ModelResponse, user_values
+
+def previous(users: list) -> bytes:
+    """ORM -> dict -> pydantic -> dict -> stdlib JSON, as the routes used to do"""
+    return JSONResponse(
+        content=UserListResponse(
+            items=[UserResponse(**user.model_dump()) for user in users]
+        ).model_dump()
+    ).body
+
+def current(users: list) -> bytes:
+    """Loaded column values -> pydantic-core -> JSON bytes"""
+    return ModelResponse(UserListResponse.model_validate({"items": [user_values(user) for user in users]})).body
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--users", type=int, default=100)
+    parser.add_argument("--repeat", type=int, default=2000)
+    args = parser.parse_args()
+
+    engine = create_engine("sqlite://")
+    SQLModel.metadata.create_all(engine)
+    session = Session(engine)
+    session.add_all([User(name=f"User {i}", email=f"user{i}@example.com") for i in range(args.users)])
+    session.commit()
+    users = session.exec(select(User)).all()
+    assert json.loads(previous(users)) == json.loads(current(users))
+
+    results = {}
+    for name, function in [("previous", previous), ("current", current)]:
+        seconds = min(timeit.repeat(lambda: function(users), number=args.repeat, repeat=3))
+        results[name] = round(seconds / args.repeat * 1e6, 1)
+    results["speedup"] = round(results["previous"] / results["current"], 2)
+    print(json.dumps({"users": args.users, "us_per_response": results}))
+
+if __name__ == "__main__":
+    main()
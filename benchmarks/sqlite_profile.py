@@ -0,0 +1,89 @@
+"""Compare SQLite throughput under mixed read/write load for each pragma profile.
+
+Usage:
+    python -m benchmarks.sqlite_profile --threads 16 --duration 5 --write-ratio 0.2
+"""
+import argparse
+import json
+import random
+import tempfile
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict
+
+from sqlalchemy.exc import OperationalError
+from sqlmodel import Session
+
+from app.database.sqlite import SQLiteDatabase, SQLITE_PROFILES
+from app.models.user import User
+from app.repositories.user_repository import UserRepository
+
+def run_profile(profile: str, threads: int, duration: float, write_ratio: float, seed_users: int) -> Dict[str, Any]:
+    """Run a mixed workload against a fresh database file using the given profile"""
+    with tempfile.TemporaryDirectory() as directory:
+        db = SQLiteDatabase(
+            url=f"sqlite:///{Path(directory) / 'bench.db'}",
+            pragmas=SQLITE_PROFILES[profile],
+            connect_args={"check_same_thread": False},
+            pool_size=threads,
+            max_overflow=0,
+        )
+        db.create_db_and_tables()
+        with Session(db.get_engine()) as session:
+            UserRepository(session).bulk_create(
+                [User(name=f"User {i}", email=f"seed{i}@example.com") for i in range(seed_users)]
+            )
+
+        counters = {"reads": 0, "writes": 0, "locked": 0}
+        lock = threading.Lock()
+        deadline = time.perf_counter() + duration
+
+        def worker(worker_id: int) -> None:
+            rng = random.Random(worker_id)
+            sequence = 0
+            while time.perf_counter() < deadline:
+                is_write = rng.random() < write_ratio
+                try:
+                    with Session(db.get_engine()) as session:
+                        repo = UserRepository(session)
+                        if is_write:
+                            sequence += 1
+                            repo.create(User(name="Writer", email=f"w{worker_id}-{sequence}@example.com"))
+                        else:
+                            repo.get_by_id(rng.randint(1, seed_users))
+                    key = "writes" if is_write else "reads"
+                except OperationalError as e:
+                    if "locked" not in str(e):
+                        raise
+                    key = "locked"
+                with lock:
+                    counters[key] += 1
+
+        workers = [threading.Thread(target=worker, args=(i,)) for i in range(threads)]
+        for thread in workers:
+            thread.start()
+        for thread in workers:
+            thread.join()
+        db.close_connection()
+
+    return {
+        "profile": profile,
+        "reads_per_second": round(counters["reads"] / duration, 1),
+        "writes_per_second": round(counters["writes"] / duration, 1),
+        "locked_errors": counters["locked"],
+    }
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--threads", type=int, default=16)
+    parser.add_argument("--duration", type=float, default=5.0)
+    parser.add_argument("--write-ratio", type=float, default=0.2)
+    parser.add_argument("--seed-users", type=int, default=1000)
+    args = parser.parse_args()
+
+    for profile in SQLITE_PROFILES:
+        print(json.dumps(run_profile(profile, args.threads, args.duration, args.write_ratio, args.seed_users)))
+
+if __name__ == "__main__":
+    main()
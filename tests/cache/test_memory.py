@@ -0,0 +1,54 @@
+import time
+
+from app.cache.memory import InMemoryCache
+
+def test_get_and_set():
+    cache = InMemoryCache(max_size=10, ttl=60)
+    assert cache.get("a") is None
+    cache.set("a", {"id": 1})
+    assert cache.get("a") == {"id": 1}
+    assert cache.stats()["hits"] == 1
+    assert cache.stats()["misses"] == 1
+
+def test_evicts_least_recently_used():
+    cache = InMemoryCache(max_size=2, ttl=60)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    cache.get("a")
+    cache.set("c", 3)
+
+    assert cache.get("b") is None
+    assert cache.get("a") == 1
+    assert cache.get("c") == 3
+    assert cache.stats()["evictions"] == 1
+    assert cache.stats()["size"] == 2
+
+def test_entries_expire():
+    cache = InMemoryCache(max_size=10, ttl=0.01)
+    cache.set("a", 1)
+    time.sleep(0.02)
+
+    assert cache.get("a") is None
+    assert cache.stats()["expirations"] == 1
+
+def test_delete_and_clear():
+    cache = InMemoryCache(max_size=10, ttl=60)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    cache.delete("a")
+    assert cache.get("a") is None
+
+    cache.clear()
+    assert cache.stats()["size"] == 0
+
+def test_increment_keeps_expiry():
+    cache = InMemoryCache(max_size=10, ttl=0.05)
+    cache.increment("a")
+    assert cache.get("a") is None
+
+    cache.set("a", 1)
+    time.sleep(0.03)
+    cache.increment("a", 2)
+    assert cache.get("a") == 3
+    time.sleep(0.03)
+    assert cache.get("a") is None
@@ -0,0 +1,50 @@
+from pathlib import Path
+
+from app.changes.dispatcher import ChangeDispatcher
+from app.changes.file import FileSink
+from app.changes.memory import QueueSink
+from app.database.sqlite import SQLiteDatabase
+from app.models.user import User
+from app.repositories.user_repository import UserRepository
+
+def make_database(tmp_path: Path) -> SQLiteDatabase:
+    db = SQLiteDatabase(url=f"sqlite:///{tmp_path / 'test.db'}")
+    db.create_db_and_tables()
+    for session in db.get_session():
+        repository = UserRepository(session)
+        user = repository.create(User(name="Alice", email="alice@example.com"))
+        repository.update(user.id, {"name": "Alice Smith"})
+        repository.bulk_create([User(name=f"User {i}", email=f"user{i}@example.com") for i in range(3)])
+        repository.delete(user.id)
+    return db
+
+def test_dispatch_delivers_batches_in_order(tmp_path: Path):
+    db = make_database(tmp_path)
+    sink = QueueSink()
+
+    assert ChangeDispatcher(db, sink, batch_size=2).dispatch() == 6
+
+    batches = [sink.queue.get_nowait() for _ in range(sink.queue.qsize())]
+    assert [len(batch) for batch in batches] == [2, 2, 2]
+    changes = [change for batch in batches for change in batch]
+    assert [change.seq for change in changes] == [1, 2, 3, 4, 5, 6]
+    assert [change.operation for change in changes] == ["create", "update", "create", "create", "create", "delete"]
+    assert changes[1].data.name == "Alice Smith"
+    assert changes[-1].data is None
+    assert sink.position() == 6
+    db.close_connection()
+
+def test_file_sink_resumes_from_last_line(tmp_path: Path):
+    db = make_database(tmp_path)
+    path = tmp_path / "changes.ndjson"
+
+    assert ChangeDispatcher(db, FileSink(str(path)), batch_size=4).dispatch() == 6
+    assert len(path.read_text().splitlines()) == 6
+    # An interrupted write leaves a partial last line, which is not a delivered change.
+    with open(path, "a") as file:
+        file.write('{"seq": 7, "us')
+
+    sink = FileSink(str(path))
+    assert sink.position() == 6
+    assert ChangeDispatcher(db, sink).dispatch() == 0
+    db.close_connection()
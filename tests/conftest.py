@@ -1,29 +1,66 @@
+import sqlite3
 import pytest
+from fastapi import FastAPI
 from fastapi.testclient import TestClient
+from sqlalchemy.ext.asyncio import create_async_engine
 from sqlmodel import Session, SQLModel, create_engine
+from sqlmodel.ext.asyncio.session import AsyncSession
 from sqlmodel.pool import StaticPool
 
-from app.main import app
-from app.dependencies import get_session
+from app.main import create_app
+from app.cache.memory import InMemoryCache
+from app.dependencies import (
+    get_session,
+    get_read_session,
+    get_async_session,
+    get_user_cache,
+    get_user_count_cache
+)
 from app.models.user import User
+from app.routes import async_users
 
-@pytest.fixture(name="session")
-def session_fixture():
-    engine = create_engine(
-        "sqlite://",
-        connect_args={"check_same_thread": False},
-        poolclass=StaticPool,
-    )
+def memory_engine(connection: sqlite3.Connection):
+    return create_engine("sqlite://", creator=lambda: connection, poolclass=StaticPool)
+
+@pytest.fixture(name="template_database", scope="session")
+def template_database_fixture():
+    """In-memory database with the schema, created once and cloned by every test"""
+    connection = sqlite3.connect(":memory:", check_same_thread=False)
+    engine = memory_engine(connection)
     SQLModel.metadata.create_all(engine)
+    yield connection
+    engine.dispose()
+
+@pytest.fixture(name="session")
+def session_fixture(template_database: sqlite3.Connection):
+    connection = sqlite3.connect(":memory:", check_same_thread=False)
+    template_database.backup(connection)
+    engine = memory_engine(connection)
     with Session(engine) as session:
         yield session
+    engine.dispose()
+
+@pytest.fixture(name="app", scope="session")
+def app_fixture() -> FastAPI:
+    return create_app()
+
+@pytest.fixture(name="user_cache")
+def user_cache_fixture():
+    return InMemoryCache(max_size=100, ttl=60)
+
+@pytest.fixture(name="count_cache")
+def count_cache_fixture():
+    return InMemoryCache(max_size=100, ttl=60)
 
 @pytest.fixture(name="client")
-def client_fixture(session: Session):
+def client_fixture(app: FastAPI, session: Session, user_cache: InMemoryCache, count_cache: InMemoryCache):
     def get_session_override():
         return session
 
     app.dependency_overrides[get_session] = get_session_override
+    app.dependency_overrides[get_read_session] = get_session_override
+    app.dependency_overrides[get_user_cache] = lambda: user_cache
+    app.dependency_overrides[get_user_count_cache] = lambda: count_cache
     client = TestClient(app)
     yield client
     app.dependency_overrides.clear()
@@ -34,4 +71,26 @@ def test_user_fixture(session: Session) -> User:
     session.add(user)
     session.commit()
     session.refresh(user)
-    return user 
\ No newline at end of file
+    return user
+
+@pytest.fixture(name="async_client")
+def async_client_fixture():
+    engine = create_async_engine(
+        "sqlite+aiosqlite://",
+        connect_args={"check_same_thread": False},
+        poolclass=StaticPool,
+    )
+
+    async def create_tables():
+        async with engine.begin() as connection:
+            await connection.run_sync(SQLModel.metadata.create_all)
+
+    async def get_async_session_override():
+        async with AsyncSession(engine, expire_on_commit=False) as session:
+            yield session
+
+    async_app = FastAPI(on_startup=[create_tables])
+    async_app.include_router(async_users.router)
+    async_app.dependency_overrides[get_async_session] = get_async_session_override
+    with TestClient(async_app) as client:
+        yield client
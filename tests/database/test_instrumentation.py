@@ -0,0 +1,40 @@
+from pathlib import Path
+
+from sqlalchemy import text
+
+from app.database.sqlite import SQLiteDatabase
+from app.utils.metrics import DB_CONNECTION_HOLD, DB_POOL_CHECKOUT, DB_QUERIES
+from app.utils.request_context import RequestStats, request_stats
+
+def test_engine_records_queries_and_pool_checkout(tmp_path: Path):
+    db = SQLiteDatabase(url=f"sqlite:///{tmp_path / 'test.db'}")
+    queries_before = DB_QUERIES.value()
+    checkouts_before = DB_POOL_CHECKOUT.count()
+    holds_before = DB_CONNECTION_HOLD.count()
+
+    stats = RequestStats()
+    token = request_stats.set(stats)
+    try:
+        with db.get_engine().connect() as connection:
+            connection.execute(text("SELECT 1"))
+            connection.execute(text("SELECT 2"))
+    finally:
+        request_stats.reset(token)
+    db.close_connection()
+
+    assert stats.db_queries == 2
+    assert stats.db_time > 0
+    assert DB_QUERIES.value() == queries_before + 2
+    assert DB_POOL_CHECKOUT.count() == checkouts_before + 1
+    assert DB_CONNECTION_HOLD.count() == holds_before + 1
+
+def test_slow_queries_are_logged_with_parameters(tmp_path: Path, caplog):
+    db = SQLiteDatabase(url=f"sqlite:///{tmp_path / 'test.db'}", slow_query_threshold=0.0)
+    with caplog.at_level("WARNING", logger="app.database.slow_queries"):
+        with db.get_engine().connect() as connection:
+            connection.execute(text("SELECT :value"), {"value": 42})
+    db.close_connection()
+
+    [record] = [record for record in caplog.records if record.name == "app.database.slow_queries"]
+    assert "SELECT ?" in record.getMessage()
+    assert "(42,)" in record.getMessage()
@@ -0,0 +1,39 @@
+import pytest
+from sqlalchemy import inspect, text
+from sqlmodel import create_engine
+
+from app.database.migrations import create_schema, file_lock
+
+def test_create_schema_adds_missing_columns(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'old.db'}")
+    with engine.begin() as connection:
+        connection.exec_driver_sql(
+            'CREATE TABLE "user" (id INTEGER PRIMARY KEY, name VARCHAR NOT NULL, '
+            'email VARCHAR NOT NULL UNIQUE, is_active BOOLEAN NOT NULL)'
+        )
+        connection.exec_driver_sql(
+            "INSERT INTO \"user\" (name, email, is_active) VALUES ('Old', 'old@example.com', 1)"
+        )
+
+    with engine.begin() as connection:
+        create_schema(connection)
+    with engine.begin() as connection:
+        create_schema(connection)
+
+    columns = {column["name"] for column in inspect(engine).get_columns("user")}
+    assert {"version", "updated_at"} <= columns
+    with engine.connect() as connection:
+        version, updated_at = connection.execute(text('SELECT version, updated_at FROM "user"')).one()
+    assert version == 1
+    assert updated_at is not None
+    engine.dispose()
+
+def test_file_lock_is_exclusive(tmp_path):
+    fcntl = pytest.importorskip("fcntl")
+    path = tmp_path / "schema.lock"
+    with file_lock(str(path)):
+        with open(path) as other:
+            with pytest.raises(BlockingIOError):
+                fcntl.flock(other, fcntl.LOCK_EX | fcntl.LOCK_NB)
+    with open(path) as other:
+        fcntl.flock(other, fcntl.LOCK_EX | fcntl.LOCK_NB)
@@ -0,0 +1,44 @@
+from pathlib import Path
+
+from sqlmodel import Session
+
+from app.database.replicated import ReplicatedDatabase
+from app.database.sqlite import SQLiteDatabase
+from app.models.user import User
+
+def _sqlite(path: Path) -> SQLiteDatabase:
+    return SQLiteDatabase(url=f"sqlite:///{path}", connect_args={"check_same_thread": False})
+
+def _bind_url(session_generator) -> str:
+    session = next(session_generator)
+    return str(session.get_bind().url)
+
+def test_reads_rotate_over_replicas(tmp_path: Path):
+    primary = _sqlite(tmp_path / "primary.db")
+    replicas = [_sqlite(tmp_path / "replica1.db"), _sqlite(tmp_path / "replica2.db")]
+    db = ReplicatedDatabase(primary=primary, replicas=replicas)
+
+    urls = [_bind_url(db.get_read_session()) for _ in range(3)]
+    assert urls == [replicas[0].url, replicas[1].url, replicas[0].url]
+    assert _bind_url(db.get_session()) == primary.url
+
+def test_reads_use_primary_without_replicas(tmp_path: Path):
+    primary = _sqlite(tmp_path / "primary.db")
+    db = ReplicatedDatabase(primary=primary)
+    assert _bind_url(db.get_read_session()) == primary.url
+
+def test_read_your_writes_window(tmp_path: Path):
+    primary = _sqlite(tmp_path / "primary.db")
+    replica = SQLiteDatabase(url=f"sqlite:///file:{tmp_path / 'primary.db'}?mode=ro&uri=true")
+    db = ReplicatedDatabase(primary=primary, replicas=[replica], read_your_writes=60)
+    db.create_db_and_tables()
+
+    assert _bind_url(db.get_read_session()) == replica.url
+
+    session: Session = next(db.get_session())
+    session.add(User(name="Writer", email="writer@example.com"))
+    session.commit()
+    session.close()
+
+    assert _bind_url(db.get_read_session()) == primary.url
+    db.close_connection()
@@ -0,0 +1,20 @@
+from pathlib import Path
+
+from sqlalchemy import text
+
+from app.database.sqlite import SQLiteDatabase, PERFORMANCE_PRAGMAS
+
+def test_performance_pragmas_are_applied(tmp_path: Path):
+    db = SQLiteDatabase(url=f"sqlite:///{tmp_path / 'test.db'}", pragmas=PERFORMANCE_PRAGMAS)
+    with db.get_engine().connect() as connection:
+        assert connection.execute(text("PRAGMA journal_mode")).scalar() == "wal"
+        assert connection.execute(text("PRAGMA synchronous")).scalar() == 1
+        assert connection.execute(text("PRAGMA busy_timeout")).scalar() == 5000
+        assert connection.execute(text("PRAGMA temp_store")).scalar() == 2
+    db.close_connection()
+
+def test_default_profile_keeps_rollback_journal(tmp_path: Path):
+    db = SQLiteDatabase(url=f"sqlite:///{tmp_path / 'test.db'}")
+    with db.get_engine().connect() as connection:
+        assert connection.execute(text("PRAGMA journal_mode")).scalar() == "delete"
+    db.close_connection()
@@ -0,0 +1,43 @@
+from fastapi.testclient import TestClient
+
+def test_async_crud_roundtrip(async_client: TestClient):
+    response = async_client.post(
+        "/users/",
+        json={"name": "John Doe", "email": "john@example.com"}
+    )
+    assert response.status_code == 201
+    user_id = response.json()["id"]
+
+    response = async_client.get(f"/users/{user_id}")
+    assert response.status_code == 200
+    assert response.json()["email"] == "john@example.com"
+
+    response = async_client.put(f"/users/{user_id}", json={"name": "Updated Name"})
+    assert response.status_code == 200
+    assert response.json()["name"] == "Updated Name"
+
+    response = async_client.delete(f"/users/{user_id}")
+    assert response.status_code == 200
+    assert response.json()["ok"] is True
+
+    response = async_client.get(f"/users/{user_id}")
+    assert response.status_code == 404
+
+def test_async_create_user_duplicate_email(async_client: TestClient):
+    payload = {"name": "John Doe", "email": "john@example.com"}
+    assert async_client.post("/users/", json=payload).status_code == 201
+
+    response = async_client.post("/users/", json=payload)
+    assert response.status_code == 400
+    assert "already exists" in response.json()["detail"]
+
+def test_async_read_users_cursor_pagination(async_client: TestClient):
+    for i in range(3):
+        async_client.post("/users/", json={"name": f"User {i}", "email": f"user{i}@example.com"})
+
+    first = async_client.get("/users/", params={"limit": 2}).json()
+    assert len(first["items"]) == 2
+
+    second = async_client.get("/users/", params={"limit": 2, "cursor": first["next_cursor"]}).json()
+    assert [item["email"] for item in second["items"]] == ["user2@example.com"]
+    assert second["next_cursor"] is None
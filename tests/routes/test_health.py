@@ -0,0 +1,20 @@
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from app.dependencies import get_saturation
+
+def test_readiness(app: FastAPI, client: TestClient):
+    app.dependency_overrides[get_saturation] = lambda: []
+    response = client.get("/health/readiness")
+    assert response.status_code == 200
+    assert response.json()["status"] == "ready"
+
+def test_readiness_reports_saturation(app: FastAPI, client: TestClient):
+    app.dependency_overrides[get_saturation] = lambda: ["read requests over capacity"]
+    response = client.get("/health/readiness")
+    assert response.status_code == 503
+    assert response.json() == {
+        "status": "saturated",
+        "database": "not checked",
+        "error": "read requests over capacity"
+    }
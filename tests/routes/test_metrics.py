@@ -0,0 +1,24 @@
+from fastapi.testclient import TestClient
+
+from app.models.user import User
+from app.utils.metrics import HTTP_REQUESTS, HTTP_LATENCY
+
+def test_metrics_are_labelled_by_route_template(client: TestClient, test_user: User):
+    before = HTTP_REQUESTS.value("GET", "/users/{user_id}", "200")
+    client.get(f"/users/{test_user.id}")
+    client.get("/users/999")
+
+    assert HTTP_REQUESTS.value("GET", "/users/{user_id}", "200") == before + 1
+    assert HTTP_REQUESTS.value("GET", "/users/{user_id}", "404") >= 1
+    assert HTTP_LATENCY.count("GET", "/users/{user_id}") >= 2
+
+def test_metrics_endpoint(client: TestClient, test_user: User):
+    client.get(f"/users/{test_user.id}")
+    response = client.get("/metrics")
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/plain")
+    body = response.text
+    assert "# TYPE http_request_duration_seconds histogram" in body
+    assert 'http_requests_total{method="GET",route="/users/{user_id}",status="200"}' in body
+    assert 'db_queries_per_request_count{route="/users/{user_id}"}' in body
+    assert "http_requests_in_flight" in body
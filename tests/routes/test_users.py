@@ -1,8 +1,17 @@
+import json
+import time
+from concurrent.futures import ThreadPoolExecutor
 import pytest
 from fastapi.testclient import TestClient
-from sqlmodel import Session
+from sqlalchemy import event, text
+from sqlmodel import Session, select
 
+from app.cache.memory import InMemoryCache
 from app.models.user import User
+from app.repositories.user_repository import UserRepository
+from app.routes import users
+from app.schemas.user import UserFilters
+from app.utils.pagination import encode_cursor
 
 def test_create_user(client: TestClient):
     response = client.post(
@@ -23,6 +32,29 @@ def test_create_user_duplicate_email(client: TestClient, test_user: User):
     assert response.status_code == 400
     assert "already exists" in response.json()["detail"]
 
+def test_update_user_duplicate_email(client: TestClient, test_user: User):
+    other = client.post("/users/", json={"name": "Other", "email": "other@example.com"}).json()
+    response = client.put(f"/users/{other['id']}", json={"email": test_user.email})
+    assert response.status_code == 400
+    assert "already exists" in response.json()["detail"]
+    assert client.get(f"/users/{other['id']}").json()["email"] == "other@example.com"
+
+def test_upsert_user(client: TestClient, test_user: User, user_cache: InMemoryCache):
+    response = client.post("/users/upsert", json={"name": "New", "email": "new@example.com"})
+    assert response.status_code == 201
+    assert response.json()["name"] == "New"
+
+    client.get(f"/users/{test_user.id}")
+    response = client.post(
+        "/users/upsert",
+        json={"name": "Updated", "email": test_user.email, "is_active": False}
+    )
+    assert response.status_code == 200
+    assert response.json()["id"] == test_user.id
+    assert response.json()["is_active"] is False
+    assert client.get(f"/users/{test_user.id}").json()["name"] == "Updated"
+    assert client.get("/users/", params={"include_total": True}).json()["total"] == 2
+
 def test_read_users(client: TestClient, test_user: User):
     response = client.get("/users/")
     assert response.status_code == 200
@@ -57,6 +89,103 @@ def test_update_user(client: TestClient, test_user: User):
     assert data["name"] == "Updated Name"
     assert data["email"] == "updated@example.com"
 
+def test_patch_user(client: TestClient, test_user: User):
+    response = client.patch(f"/users/{test_user.id}", json={"is_active": False})
+    assert response.status_code == 200
+    data = response.json()
+    assert data["is_active"] is False
+    assert data["name"] == test_user.name
+
+    response = client.patch(f"/users/{test_user.id}", json={"name": None})
+    assert response.status_code == 422
+
+    response = client.patch("/users/999", json={"name": "Nobody"})
+    assert response.status_code == 404
+
+def test_update_and_delete_run_one_statement_plus_change_log(client: TestClient, test_user: User, session: Session):
+    statements = []
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    engine = session.get_bind()
+    event.listen(engine, "before_cursor_execute", record)
+    try:
+        assert client.put(f"/users/{test_user.id}", json={"name": "Renamed"}).status_code == 200
+        assert [statement.split()[0] for statement in statements] == ["UPDATE", "INSERT"]
+
+        statements.clear()
+        assert client.delete(f"/users/{test_user.id}").status_code == 200
+        assert [statement.split()[0] for statement in statements] == ["DELETE", "INSERT"]
+    finally:
+        event.remove(engine, "before_cursor_execute", record)
+
+def test_changes_feed(client: TestClient):
+    user = client.post("/users/", json={"name": "Alice", "email": "alice@example.com"}).json()
+    client.patch(f"/users/{user['id']}", json={"name": "Alice Smith"})
+    client.delete(f"/users/{user['id']}")
+
+    response = client.get("/users/changes")
+    assert response.status_code == 200
+    changes = response.json()
+    assert [item["operation"] for item in changes["items"]] == ["create", "update", "delete"]
+    assert changes["items"][1]["data"]["name"] == "Alice Smith"
+    assert changes["items"][2]["data"] is None
+    assert changes["next_since"] == changes["items"][-1]["seq"]
+
+    response = client.get("/users/changes", params={"since": changes["items"][0]["seq"], "limit": 1})
+    assert [item["operation"] for item in response.json()["items"]] == ["update"]
+
+    response = client.get("/users/changes", params={"since": changes["next_since"]})
+    assert response.json() == {"items": [], "next_since": changes["next_since"]}
+
+def test_changes_feed_records_stored_rows(client: TestClient, session: Session):
+    client.post(
+        "/users/import",
+        content=json.dumps({"name": "Jane", "email": "jane@example.com", "is_active": None}),
+        headers={"Content-Type": "application/x-ndjson"}
+    )
+    # Written without the request schema, the log still holds the row as stored.
+    UserRepository(session).bulk_create([User(name="Max", email="max@example.com", is_active=None)])
+
+    response = client.get("/users/changes")
+    assert response.status_code == 200
+    assert [item["data"]["is_active"] for item in response.json()["items"]] == [True, True]
+
+def test_changes_long_poll_wakes_up_on_write(client: TestClient, monkeypatch):
+    # Only the notification can end the wait early.
+    monkeypatch.setattr(users, "CHANGES_POLL_INTERVAL", 30.0)
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        started = time.monotonic()
+        poll = executor.submit(client.get, "/users/changes", params={"wait": 10})
+        time.sleep(0.3)
+        client.post("/users/", json={"name": "Alice", "email": "alice@example.com"})
+        response = poll.result()
+    assert time.monotonic() - started < 5
+    assert [item["operation"] for item in response.json()["items"]] == ["create"]
+
+def test_reads_release_connection(session: Session, test_user: User):
+    repository = UserRepository(session)
+    repository.get_all()
+    assert not session.in_transaction()
+    repository.get_by_id(test_user.id)
+    assert not session.in_transaction()
+
+def test_cached_read_skips_pool(client: TestClient, test_user: User, session: Session):
+    client.get(f"/users/{test_user.id}")
+    checkouts = []
+
+    def record(dbapi_connection, connection_record, connection_proxy):
+        checkouts.append(connection_record)
+
+    engine = session.get_bind()
+    event.listen(engine, "checkout", record)
+    try:
+        assert client.get(f"/users/{test_user.id}").status_code == 200
+    finally:
+        event.remove(engine, "checkout", record)
+    assert checkouts == []
+
 def test_update_user_not_found(client: TestClient):
     response = client.put(
         "/users/999",
@@ -74,4 +203,416 @@ def test_delete_user(client: TestClient, test_user: User):
 
 def test_delete_user_not_found(client: TestClient):
     response = client.delete("/users/999")
-    assert response.status_code == 404
\ No newline at end of file
+    assert response.status_code == 404
+def test_read_user_conditional(client: TestClient, test_user: User):
+    response = client.get(f"/users/{test_user.id}")
+    etag = response.headers["etag"]
+    assert response.headers["last-modified"].endswith("GMT")
+
+    response = client.get(f"/users/{test_user.id}", headers={"If-None-Match": etag})
+    assert response.status_code == 304
+    assert response.content == b""
+
+    client.put(f"/users/{test_user.id}", json={"name": "Renamed"})
+    response = client.get(f"/users/{test_user.id}", headers={"If-None-Match": etag})
+    assert response.status_code == 200
+    assert response.headers["etag"] != etag
+
+def test_read_users_conditional(client: TestClient, test_user: User):
+    etag = client.get("/users/").headers["etag"]
+    assert client.get("/users/", headers={"If-None-Match": etag}).status_code == 304
+
+    client.put(f"/users/{test_user.id}", json={"is_active": False})
+    assert client.get("/users/", headers={"If-None-Match": etag}).status_code == 200
+
+def test_not_modified_is_not_serialized(client: TestClient, test_user: User, monkeypatch):
+    user_etag = client.get(f"/users/{test_user.id}").headers["etag"]
+    list_etag = client.get("/users/").headers["etag"]
+    rendered = []
+    render_json = users.render_json
+    monkeypatch.setattr(users, "render_json", lambda model: rendered.append(model) or render_json(model))
+
+    assert client.get(f"/users/{test_user.id}", headers={"If-None-Match": user_etag}).status_code == 304
+    assert client.get("/users/", headers={"If-None-Match": list_etag}).status_code == 304
+    assert rendered == []
+
+def test_update_user_if_match(client: TestClient, test_user: User):
+    etag = client.get(f"/users/{test_user.id}").headers["etag"]
+
+    response = client.put(f"/users/{test_user.id}", json={"name": "First"}, headers={"If-Match": etag})
+    assert response.status_code == 200
+    assert response.headers["etag"] != etag
+
+    response = client.put(f"/users/{test_user.id}", json={"name": "Second"}, headers={"If-Match": etag})
+    assert response.status_code == 412
+    assert client.get(f"/users/{test_user.id}").json()["name"] == "First"
+
+    response = client.put(f"/users/{test_user.id}", json={"name": "Third"}, headers={"If-Match": "*"})
+    assert response.status_code == 200
+
+def test_read_users_cursor_pagination(client: TestClient, session: Session):
+    for i in range(5):
+        session.add(User(name=f"User {i}", email=f"user{i}@example.com"))
+    session.commit()
+
+    response = client.get("/users/", params={"limit": 2})
+    assert response.status_code == 200
+    data = response.json()
+    assert [item["id"] for item in data["items"]] == [1, 2]
+    assert data["next_cursor"] is not None
+
+    seen = [item["id"] for item in data["items"]]
+    cursor = data["next_cursor"]
+    while cursor:
+        data = client.get("/users/", params={"limit": 2, "cursor": cursor}).json()
+        seen.extend(item["id"] for item in data["items"])
+        cursor = data["next_cursor"]
+    assert seen == [1, 2, 3, 4, 5]
+
+def test_read_users_cursor_sorted_by_name(client: TestClient, session: Session):
+    for i, name in enumerate(["Carol", "Alice", "Bob", "Alice"]):
+        session.add(User(name=name, email=f"user{i}@example.com"))
+    session.commit()
+
+    first = client.get("/users/", params={"limit": 2, "sort_by": "name"}).json()
+    assert [item["name"] for item in first["items"]] == ["Alice", "Alice"]
+
+    second = client.get(
+        "/users/",
+        params={"limit": 2, "sort_by": "name", "cursor": first["next_cursor"]}
+    ).json()
+    assert [item["name"] for item in second["items"]] == ["Bob", "Carol"]
+
+def test_read_users_invalid_cursor(client: TestClient):
+    response = client.get("/users/", params={"cursor": "not-a-cursor"})
+    assert response.status_code == 400
+    assert "Invalid pagination cursor" in response.json()["detail"]
+
+def test_read_users_cursor_key_type(client: TestClient):
+    for sort_by, key in (("name", {"x": 1}), ("name", 1), ("id", "1"), ("id", True)):
+        cursor = encode_cursor(sort_by, key, 1)
+        response = client.get("/users/", params={"cursor": cursor, "sort_by": sort_by})
+        assert response.status_code == 400
+
+def test_read_users_filters(client: TestClient, session: Session):
+    session.add(User(name="Alice Smith", email="alice@example.com"))
+    session.add(User(name="Alicia Keys", email="alicia@example.org", is_active=False))
+    session.add(User(name="Bob", email="bob@example.com"))
+    session.commit()
+
+    def names(**params):
+        return [item["name"] for item in client.get("/users/", params=params).json()["items"]]
+
+    assert names(name_prefix="Ali") == ["Alice Smith", "Alicia Keys"]
+    assert names(name_prefix="Ali", is_active=True) == ["Alice Smith"]
+    assert names(email="bob@example.com") == ["Bob"]
+    assert names(email_prefix="alic") == ["Alice Smith", "Alicia Keys"]
+    assert names(sort_by="name", order="desc") == ["Bob", "Alicia Keys", "Alice Smith"]
+
+def test_read_users_descending_cursor(client: TestClient, session: Session):
+    for i in range(5):
+        session.add(User(name=f"User {i}", email=f"user{i}@example.com"))
+    session.commit()
+
+    first = client.get("/users/", params={"limit": 3, "order": "desc"}).json()
+    second = client.get(
+        "/users/",
+        params={"limit": 3, "order": "desc", "cursor": first["next_cursor"]}
+    ).json()
+    assert [item["name"] for item in first["items"] + second["items"]] == [
+        "User 4", "User 3", "User 2", "User 1", "User 0"
+    ]
+
+    response = client.get("/users/", params={"cursor": first["next_cursor"]})
+    assert response.status_code == 400
+
+def test_read_users_search(client: TestClient, session: Session):
+    session.add(User(name="Alice Smith", email="alice@example.com"))
+    session.add(User(name="Bob Smithers", email="bob@example.org"))
+    session.commit()
+
+    def names(q):
+        return [item["name"] for item in client.get("/users/", params={"q": q}).json()["items"]]
+
+    assert names("smith") == ["Alice Smith", "Bob Smithers"]
+    assert names("smith example.org") == ["Bob Smithers"]
+    assert names('"OR*') == ["Bob Smithers"]
+    assert names("***") == []
+
+    bob = session.exec(select(User).where(User.name == "Bob Smithers")).one()
+    client.put(f"/users/{bob.id}", json={"name": "Robert Jones"})
+    assert names("smith") == ["Alice Smith"]
+    assert names("rob") == ["Robert Jones"]
+
+    client.delete(f"/users/{bob.id}")
+    assert names("rob") == []
+
+def test_prefix_filter_uses_index(session: Session):
+    statement = UserRepository(session)._filtered(UserFilters(email_prefix="ali"))
+    compiled = statement.compile(session.get_bind(), compile_kwargs={"literal_binds": True})
+    plan = " ".join(str(row) for row in session.exec(text(f"EXPLAIN QUERY PLAN {compiled}")))
+    assert "USING INDEX ix_user_email" in plan
+
+def test_read_users_total(client: TestClient, test_user: User, count_cache: InMemoryCache):
+    assert client.get("/users/").json()["total"] is None
+    assert client.get("/users/", params={"include_total": True}).json()["total"] == 1
+
+    client.post("/users/", json={"name": "Jane", "email": "jane@example.com"})
+    client.post("/users/bulk", json=[
+        {"name": "Max", "email": "max@example.com", "is_active": False},
+        {"name": "Ann", "email": "ann@example.com"},
+    ])
+    assert client.get("/users/", params={"include_total": True}).json()["total"] == 4
+    assert client.get("/users/", params={"include_total": True, "is_active": False}).json()["total"] == 1
+
+    client.put(f"/users/{test_user.id}", json={"is_active": False})
+    client.delete(f"/users/{test_user.id}")
+    assert client.get("/users/", params={"include_total": True}).json()["total"] == 3
+    assert client.get("/users/", params={"include_total": True, "is_active": False}).json()["total"] == 1
+
+    # The total is maintained by the writes, only the first request counted rows.
+    assert count_cache.stats()["hits"] >= 2
+
+def test_create_users_bulk(client: TestClient, test_user: User):
+    response = client.post(
+        "/users/bulk",
+        json=[
+            {"name": "Jane", "email": "jane@example.com"},
+            {"name": "Dup", "email": test_user.email},
+            {"name": "Jane Again", "email": "jane@example.com"},
+            {"name": "Max", "email": "max@example.com", "is_active": False},
+        ]
+    )
+    assert response.status_code == 200
+    items = response.json()["items"]
+    assert [item["ok"] for item in items] == [True, False, False, True]
+    assert [item["status_code"] for item in items] == [201, 400, 400, 201]
+    assert items[0]["user"]["email"] == "jane@example.com"
+    assert items[3]["user"]["is_active"] is False
+    assert "already exists" in items[1]["detail"]
+
+    ids = [item["id"] for item in client.get("/users/").json()["items"]]
+    assert ids == [test_user.id, items[0]["id"], items[3]["id"]]
+
+def test_create_users_bulk_null_is_active(client: TestClient):
+    response = client.post("/users/bulk", json=[{"name": "Jane", "email": "jane@example.com", "is_active": None}])
+    assert response.status_code == 200
+    item = response.json()["items"][0]
+    assert item["ok"] is True
+    assert item["user"]["is_active"] is True
+    assert client.get(f"/users/{item['id']}").json()["is_active"] is True
+
+def test_update_users_bulk(client: TestClient, test_user: User, session: Session):
+    other = User(name="Other", email="other@example.com")
+    session.add(other)
+    session.commit()
+    session.refresh(other)
+
+    response = client.patch(
+        "/users/bulk",
+        json=[
+            {"id": test_user.id, "name": "Renamed"},
+            {"id": other.id, "email": test_user.email},
+            {"id": 999, "name": "Ghost"},
+        ]
+    )
+    assert response.status_code == 200
+    items = response.json()["items"]
+    assert [item["status_code"] for item in items] == [200, 400, 404]
+    assert items[0]["user"]["name"] == "Renamed"
+    assert items[0]["user"]["email"] == "test@example.com"
+
+    assert client.get(f"/users/{test_user.id}").json()["name"] == "Renamed"
+    assert client.get(f"/users/{other.id}").json()["email"] == "other@example.com"
+
+def test_update_users_bulk_email_chain(client: TestClient, test_user: User, session: Session):
+    other = User(name="Other", email="other@example.com")
+    session.add(other)
+    session.commit()
+    session.refresh(other)
+
+    # The higher ID frees its email for the lower one, so ID order would collide.
+    response = client.patch(
+        "/users/bulk",
+        json=[
+            {"id": other.id, "email": "moved@example.com"},
+            {"id": test_user.id, "email": "other@example.com"},
+        ]
+    )
+    assert response.status_code == 200
+    assert [item["status_code"] for item in response.json()["items"]] == [200, 200]
+    assert client.get(f"/users/{test_user.id}").json()["email"] == "other@example.com"
+    assert client.get(f"/users/{other.id}").json()["email"] == "moved@example.com"
+
+def test_create_users_bulk_email_taken_after_check(client: TestClient, test_user: User, monkeypatch):
+    # As if another writer registered the email between the check and the INSERT.
+    monkeypatch.setattr(UserRepository, "_existing_emails", lambda self, emails: set())
+    response = client.post(
+        "/users/bulk",
+        json=[{"name": "Dup", "email": test_user.email}, {"name": "Jane", "email": "jane@example.com"}]
+    )
+    assert response.status_code == 200
+    items = response.json()["items"]
+    assert [item["status_code"] for item in items] == [400, 201]
+    assert items[1]["user"]["email"] == "jane@example.com"
+
+def test_update_users_bulk_email_taken_after_check(client: TestClient, test_user: User, session: Session, monkeypatch):
+    other = User(name="Other", email="other@example.com")
+    session.add(other)
+    session.commit()
+    session.refresh(other)
+    # The first check misses the owner, as if it took the email after it.
+    checks = []
+    email_owners = UserRepository._email_owners
+    monkeypatch.setattr(
+        UserRepository, "_email_owners",
+        lambda self, emails: checks.append(1) or ({} if len(checks) == 1 else email_owners(self, emails))
+    )
+
+    response = client.patch(
+        "/users/bulk",
+        json=[{"id": test_user.id, "name": "Renamed"}, {"id": other.id, "email": test_user.email}]
+    )
+    assert response.status_code == 200
+    assert [item["status_code"] for item in response.json()["items"]] == [200, 400]
+    assert len(checks) == 2
+    assert client.get(f"/users/{test_user.id}").json()["name"] == "Renamed"
+    assert client.get(f"/users/{other.id}").json()["email"] == "other@example.com"
+
+def test_delete_users_bulk(client: TestClient, test_user: User):
+    response = client.request("DELETE", "/users/bulk", json={"ids": [test_user.id, 999]})
+    assert response.status_code == 200
+    items = response.json()["items"]
+    assert [item["ok"] for item in items] == [True, False]
+    assert items[0]["id"] == test_user.id
+    assert items[1]["status_code"] == 404
+
+    assert client.get(f"/users/{test_user.id}").status_code == 404
+
+def test_reads_after_a_write_do_not_join_earlier_reads(client: TestClient, test_user: User, monkeypatch):
+    keys = []
+    do = users.USER_READS.do
+    monkeypatch.setattr(users.USER_READS, "do", lambda key, function: keys.append(key) or do(key, function))
+
+    client.get(f"/users/{test_user.id}")
+    client.get(f"/users/{test_user.id}")
+    client.put(f"/users/{test_user.id}", json={"name": "Updated Name"})
+    client.get(f"/users/{test_user.id}")
+    assert keys[0] == keys[1]
+    assert keys[2] != keys[1]
+
+def test_read_racing_a_write_is_not_cached(session: Session, test_user: User, user_cache: InMemoryCache, monkeypatch):
+    load = UserRepository._load
+
+    def load_then_update(self, user_id):
+        user = load(self, user_id)
+        # The update commits and invalidates before the read fills the cache.
+        UserRepository(session, cache=user_cache).update(user_id, {"name": "Updated Name"})
+        return user
+
+    repo = UserRepository(session, cache=user_cache)
+    monkeypatch.setattr(UserRepository, "_load", load_then_update)
+    assert repo.get_by_id(test_user.id).name == "Test User"
+    monkeypatch.setattr(UserRepository, "_load", load)
+    assert repo.get_by_id(test_user.id).name == "Updated Name"
+
+def test_count_racing_a_write_is_not_cached(session: Session, count_cache: InMemoryCache, monkeypatch):
+    release = UserRepository._release
+    created = []
+
+    def release_then_create(self):
+        release(self)
+        if not created:
+            created.append(UserRepository(session, count_cache=count_cache).create(User(name="New", email="new@example.com")))
+
+    repo = UserRepository(session, count_cache=count_cache)
+    monkeypatch.setattr(UserRepository, "_release", release_then_create)
+    assert repo.count() == 0
+    monkeypatch.setattr(UserRepository, "_release", release)
+    assert repo.count() == 1
+
+def test_read_user_is_cached_and_invalidated(client: TestClient, test_user: User, user_cache: InMemoryCache):
+    client.get(f"/users/{test_user.id}")
+    client.get(f"/users/{test_user.id}")
+    assert user_cache.stats()["hits"] == 1
+
+    client.put(f"/users/{test_user.id}", json={"name": "Updated Name"})
+    response = client.get(f"/users/{test_user.id}")
+    assert response.json()["name"] == "Updated Name"
+
+    client.delete(f"/users/{test_user.id}")
+    assert client.get(f"/users/{test_user.id}").status_code == 404
+
+def test_export_users_ndjson(client: TestClient, session: Session):
+    for i in range(5):
+        session.add(User(name=f"User {i}", email=f"user{i}@example.com"))
+    session.commit()
+
+    response = client.get("/users/export", params={"batch_size": 2})
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "application/x-ndjson"
+    lines = [json.loads(line) for line in response.text.splitlines()]
+    assert [line["email"] for line in lines] == [f"user{i}@example.com" for i in range(5)]
+    assert set(lines[0]) == {"id", "name", "email", "is_active"}
+
+def test_export_users_csv(client: TestClient, test_user: User):
+    response = client.get("/users/export", params={"format": "csv"})
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/csv")
+    assert response.text.splitlines() == [
+        "id,name,email,is_active",
+        f"{test_user.id},Test User,test@example.com,True",
+    ]
+
+def test_export_users_csv_empty(client: TestClient):
+    response = client.get("/users/export", params={"format": "csv"})
+    assert response.text.splitlines() == ["id,name,email,is_active"]
+
+def test_import_users_ndjson(client: TestClient, test_user: User):
+    body = "\n".join([
+        json.dumps({"name": "Jane", "email": "jane@example.com"}),
+        json.dumps({"name": "Bad", "email": "not-an-email"}),
+        "",
+        json.dumps({"name": "Dup", "email": test_user.email}),
+        "{broken",
+        json.dumps({"name": "Max", "email": "max@example.com", "is_active": False}),
+    ])
+    response = client.post(
+        "/users/import",
+        params={"batch_size": 2},
+        content=body,
+        headers={"Content-Type": "application/x-ndjson"}
+    )
+    assert response.status_code == 200
+    summary = response.json()
+    assert summary["processed"] == 5
+    assert summary["imported"] == 2
+    assert summary["rejected"] == 3
+    assert [error["line"] for error in summary["errors"]] == [2, 5, 4]
+    assert summary["errors"][2]["email"] == test_user.email
+
+    emails = [item["email"] for item in client.get("/users/").json()["items"]]
+    assert emails == [test_user.email, "jane@example.com", "max@example.com"]
+
+def test_import_users_batch_size_defaults_to_settings(client: TestClient, monkeypatch):
+    services = client.app.state.services
+    monkeypatch.setattr(services, "settings", services.settings.model_copy(update={"import_batch_size": 7}))
+    batch_sizes = []
+    run_import = users.run_import
+    monkeypatch.setattr(
+        users, "run_import",
+        lambda repo, chunks, format, batch_size: batch_sizes.append(batch_size) or run_import(repo, chunks, format, batch_size)
+    )
+
+    client.post("/users/import", content="")
+    client.post("/users/import", params={"batch_size": 2}, content="")
+    assert batch_sizes == [7, 2]
+
+def test_import_users_csv(client: TestClient):
+    body = "name,email,is_active\nJane,jane@example.com,\nMax,max@example.com,false\n"
+    response = client.post("/users/import", params={"format": "csv"}, content=body)
+    assert response.status_code == 200
+    assert response.json()["imported"] == 2
+
+    items = client.get("/users/").json()["items"]
+    assert [item["is_active"] for item in items] == [True, False]
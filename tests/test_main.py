@@ -0,0 +1,51 @@
+from pathlib import Path
+
+from fastapi.testclient import TestClient
+
+from app.config import Settings
+from app.main import create_app
+from app.utils import log
+from app.utils.metrics import STARTUP_PHASE
+
+def test_create_app_from_settings(tmp_path: Path):
+    settings = Settings(database_url=f"sqlite:///{tmp_path / 'test.db'}", user_cache_enabled=False)
+    app = create_app(settings)
+
+    assert app.state.services.settings is settings
+    assert app.state.services.async_db is None
+    with TestClient(app) as client:
+        assert client.post("/users/", json={"name": "A", "email": "a@example.com"}).status_code == 201
+        assert client.get("/health/readiness").status_code == 200
+
+    for phase in ("import", "services", "routers", "schema", "total"):
+        assert STARTUP_PHASE.value(phase) > 0
+    assert STARTUP_PHASE.value("total") >= STARTUP_PHASE.value("schema")
+
+def test_create_async_app(tmp_path: Path):
+    settings = Settings(
+        database_url=f"sqlite:///{tmp_path / 'test.db'}",
+        database_async=True,
+        user_cache_enabled=False
+    )
+    app = create_app(settings)
+
+    assert app.state.services.async_db is not None
+    assert "/users/bulk" not in {route.path for route in app.routes}
+    with TestClient(app) as client:
+        assert client.post("/users/", json={"name": "A", "email": "a@example.com"}).status_code == 201
+
+def test_create_app_twice_shares_no_state(tmp_path: Path):
+    first = create_app(Settings(database_url=f"sqlite:///{tmp_path / 'first.db'}", profile_token="secret"))
+    first_listener = log._listener
+    second = create_app(Settings(database_url=f"sqlite:///{tmp_path / 'second.db'}"))
+
+    assert first.state.profiling.token == "secret"
+    assert second.state.profiling.token == ""
+    # The logging of the first application is handed over, not left running.
+    assert log._listener is not first_listener
+    with TestClient(second) as client:
+        client.get("/users/1")
+        lines = client.get("/metrics").text.splitlines()
+    helps = [line for line in lines if line.startswith("# HELP")]
+    assert len(helps) == len(set(helps))
+    assert "user_cache_misses_total 1.0" in lines
@@ -0,0 +1,65 @@
+import os
+
+import pytest
+
+from app import server
+
+@pytest.fixture(autouse=True)
+def environ(monkeypatch):
+    """Restore the variables ``main`` sets for its workers, and the settings read from them"""
+    for name in ("DATABASE_INIT_SCHEMA", "CHANGE_SINK_PATH", "USER_CACHE_ENABLED"):
+        monkeypatch.setenv(name, "")
+        monkeypatch.delenv(name)
+    server.get_settings.cache_clear()
+    yield
+    server.get_settings.cache_clear()
+
+def test_worker_count(monkeypatch):
+    monkeypatch.setattr(os, "cpu_count", lambda: 8)
+    assert server.worker_count() == 8
+    assert server.worker_count(3) == 3
+
+def test_main_initializes_schema_once_before_workers(monkeypatch):
+    calls = []
+    monkeypatch.setattr(server, "configure_logging", lambda **kwargs: calls.append("configure_logging"))
+    monkeypatch.setattr(server, "init_schema", lambda db: calls.append("init_schema"))
+    monkeypatch.setattr(server.uvicorn, "run", lambda app, **kwargs: calls.append((app, kwargs)))
+    monkeypatch.setattr(os, "cpu_count", lambda: 4)
+    monkeypatch.delenv("DATABASE_INIT_SCHEMA", raising=False)
+
+    assert server.main(["--port", "9000"]) == 0
+
+    assert calls == [
+        "configure_logging",
+        "init_schema",
+        ("app.main:create_app", {"factory": True, "host": "0.0.0.0", "port": 9000, "workers": 4}),
+    ]
+    assert os.environ["DATABASE_INIT_SCHEMA"] == "false"
+
+def test_main_in_process_app_reads_updated_settings(monkeypatch):
+    settings = []
+    monkeypatch.setattr(server, "init_schema", lambda db: None)
+    monkeypatch.setattr(server.uvicorn, "run", lambda app, **kwargs: settings.append(server.get_settings()))
+    assert server.get_settings().database_init_schema is True
+
+    server.main(["--workers", "1"])
+
+    assert settings[0].database_init_schema is False
+
+def test_main_disables_caches_with_several_workers(monkeypatch):
+    monkeypatch.setattr(server, "init_schema", lambda db: None)
+    monkeypatch.setattr(server.uvicorn, "run", lambda app, **kwargs: None)
+
+    server.main(["--workers", "1"])
+    assert "USER_CACHE_ENABLED" not in os.environ
+
+    server.main(["--workers", "2"])
+    assert os.environ["USER_CACHE_ENABLED"] == "false"
+
+def test_main_keeps_configured_caches(monkeypatch):
+    monkeypatch.setattr(server, "init_schema", lambda db: None)
+    monkeypatch.setattr(server.uvicorn, "run", lambda app, **kwargs: None)
+    monkeypatch.setenv("USER_CACHE_ENABLED", "true")
+
+    server.main(["--workers", "2"])
+    assert os.environ["USER_CACHE_ENABLED"] == "true"
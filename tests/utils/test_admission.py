@@ -0,0 +1,86 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from app.middleware.admission import AdmissionControlMiddleware
+from app.utils.admission import AdmissionLimiter
+from app.utils.metrics import ADMISSION_REJECTED
+
+def make_client(reads: AdmissionLimiter | None, writes: AdmissionLimiter | None, release: threading.Event) -> TestClient:
+    app = FastAPI()
+
+    @app.get("/slow")
+    def slow() -> dict:
+        release.wait(5)
+        return {"ok": True}
+
+    @app.post("/write")
+    def write() -> dict:
+        return {"ok": True}
+
+    @app.get("/health")
+    def health() -> dict:
+        return {"status": "healthy"}
+
+    app.add_middleware(AdmissionControlMiddleware, reads=reads, writes=writes, retry_after=3)
+    return TestClient(app)
+
+def wait_until(condition, timeout: float = 5.0) -> None:
+    deadline = time.monotonic() + timeout
+    while not condition():
+        assert time.monotonic() < deadline
+        time.sleep(0.001)
+
+def test_sheds_when_queue_is_full():
+    release = threading.Event()
+    reads = AdmissionLimiter("test_full", limit=1, queue_size=0)
+    client = make_client(reads, AdmissionLimiter("test_full_write", limit=1), release)
+
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        first = executor.submit(client.get, "/slow")
+        wait_until(lambda: reads.stats()["active"] == 1)
+        assert reads.saturated()
+
+        shed = client.get("/slow")
+        assert shed.status_code == 503
+        assert shed.headers["Retry-After"] == "3"
+        # Writes and exempt paths have their own budget.
+        assert client.post("/write").status_code == 200
+        assert client.get("/health").status_code == 200
+
+        release.set()
+        assert first.result().status_code == 200
+    assert reads.stats() == {"active": 0, "queued": 0}
+    assert ADMISSION_REJECTED.value("test_full", "queue_full") == 1
+
+def test_queued_request_gets_the_freed_slot():
+    release = threading.Event()
+    reads = AdmissionLimiter("test_queue", limit=1, queue_size=1, queue_timeout=5)
+    client = make_client(reads, None, release)
+
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        first = executor.submit(client.get, "/slow")
+        wait_until(lambda: reads.stats()["active"] == 1)
+        second = executor.submit(client.get, "/slow")
+        wait_until(lambda: reads.stats()["queued"] == 1)
+        release.set()
+        assert first.result().status_code == 200
+        assert second.result().status_code == 200
+    assert reads.stats() == {"active": 0, "queued": 0}
+
+def test_sheds_after_queue_timeout():
+    release = threading.Event()
+    reads = AdmissionLimiter("test_timeout", limit=1, queue_size=1, queue_timeout=0.05)
+    client = make_client(reads, None, release)
+
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        first = executor.submit(client.get, "/slow")
+        wait_until(lambda: reads.stats()["active"] == 1)
+        assert client.get("/slow").status_code == 503
+        release.set()
+        assert first.result().status_code == 200
+    assert reads.stats() == {"active": 0, "queued": 0}
+    assert ADMISSION_REJECTED.value("test_timeout", "queue_timeout") == 1
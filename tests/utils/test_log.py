@@ -0,0 +1,33 @@
+import json
+import logging
+
+from fastapi.testclient import TestClient
+
+from app.utils.log import JsonFormatter, RequestIdFilter
+from app.utils.request_context import request_id
+
+def test_json_formatter_includes_request_id():
+    record = logging.LogRecord("app.test", logging.INFO, __file__, 1, "User %s created", (42,), None)
+    token = request_id.set("abc-123")
+    try:
+        RequestIdFilter().filter(record)
+    finally:
+        request_id.reset(token)
+
+    entry = json.loads(JsonFormatter().format(record))
+    assert entry["message"] == "User 42 created"
+    assert entry["level"] == "INFO"
+    assert entry["request_id"] == "abc-123"
+
+def test_request_id_header(client: TestClient):
+    response = client.get("/health", headers={"X-Request-ID": "req-1"})
+    assert response.headers["x-request-id"] == "req-1"
+
+    generated = client.get("/health", headers={"X-Request-ID": "not valid\n"}).headers["x-request-id"]
+    assert len(generated) == 32
+
+def test_request_id_reaches_logs(client: TestClient, test_user, caplog):
+    caplog.handler.addFilter(RequestIdFilter())
+    with caplog.at_level(logging.DEBUG, logger="app.repositories.user_repository"):
+        client.get(f"/users/{test_user.id}", headers={"X-Request-ID": "req-2"})
+    assert any(getattr(record, "request_id", None) == "req-2" for record in caplog.records)
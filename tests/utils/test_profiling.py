@@ -0,0 +1,85 @@
+import re
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+import pytest
+from fastapi import APIRouter, FastAPI
+from fastapi.testclient import TestClient
+
+from app.middleware.metrics import MetricsMiddleware
+from app.middleware.request_id import RequestIdMiddleware
+from app.utils.profiling import TimedRoute, configure_profiling, server_timing
+from app.utils.request_context import RequestStats
+
+@pytest.fixture(name="profiled_client")
+def profiled_client_fixture():
+    router = APIRouter(route_class=TimedRoute)
+    overlap = threading.Barrier(2, timeout=5)
+
+    @router.get("/items/{item_id}")
+    def read_item(item_id: int) -> dict:
+        return {"id": item_id}
+
+    @router.get("/overlap")
+    def read_overlapping() -> dict:
+        overlap.wait()
+        return {"ok": True}
+
+    @router.get("/async")
+    async def read_async() -> dict:
+        return {"ok": True}
+
+    app = FastAPI()
+    app.include_router(router)
+    app.add_middleware(MetricsMiddleware, server_timing=True)
+    app.add_middleware(RequestIdMiddleware)
+    return TestClient(app)
+
+def profile_reports(caplog) -> list[str]:
+    return [record.getMessage() for record in caplog.records if record.name == "app.utils.profiling"]
+
+def test_server_timing_header(profiled_client: TestClient):
+    for path in ("/items/1", "/async"):
+        response = profiled_client.get(path)
+        assert response.status_code == 200
+        names = re.findall(r"(\w+);dur=[\d.]+", response.headers["Server-Timing"])
+        assert names == ["validate", "app", "db", "pool", "serialize", "total"]
+
+def test_server_timing_format():
+    stats = RequestStats(db_queries=2, db_time=0.0012, validation_time=0.0004)
+    assert server_timing(stats, 0.005) == (
+        'validate;dur=0.40, app;dur=0.00, db;dur=1.20;desc="2 queries", '
+        "pool;dur=0.00, serialize;dur=0.00, total;dur=5.00"
+    )
+
+def test_profile_requested_by_header(profiled_client: TestClient, tmp_path: Path, caplog):
+    profiled_client.app.state.profiling = configure_profiling(token="secret", directory=str(tmp_path))
+    with caplog.at_level("INFO", logger="app.utils.profiling"):
+        profiled_client.get("/items/1", headers={"X-Profile": "wrong"})
+        response = profiled_client.get("/items/1", headers={"X-Profile": "s\xe9cret".encode("latin-1")})
+        assert response.status_code == 200
+        assert not profile_reports(caplog)
+        response = profiled_client.get("/items/1", headers={"X-Profile": "secret"})
+
+    assert "Profile of read_item:" in profile_reports(caplog)[0]
+    assert (tmp_path / f"{response.headers['X-Request-ID']}.prof").exists()
+
+def test_profile_sampling(profiled_client: TestClient, caplog):
+    profiled_client.app.state.profiling = configure_profiling(sample_rate=1.0)
+    assert profiled_client.app.state.profiling.wanted(None)
+    with caplog.at_level("INFO", logger="app.utils.profiling"):
+        profiled_client.get("/async")
+    assert "Profile of read_async:" in profile_reports(caplog)[0]
+
+def test_overlapping_requests_are_profiled_one_at_a_time(profiled_client: TestClient, caplog):
+    profiled_client.app.state.profiling = configure_profiling(token="secret")
+    with caplog.at_level("INFO", logger="app.utils.profiling"), ThreadPoolExecutor(2) as pool:
+        responses = list(pool.map(
+            lambda _: profiled_client.get("/overlap", headers={"X-Profile": "secret"}), range(2)
+        ))
+
+    assert [response.status_code for response in responses] == [200, 200]
+    reports = profile_reports(caplog)
+    assert len([report for report in reports if report.startswith("Profile of read_overlapping:")]) == 1
+    assert "Not profiling read_overlapping, another request is being profiled" in reports
@@ -0,0 +1,22 @@
+import json
+
+from sqlmodel import Session
+
+from app.models.user import User
+from app.schemas.user import UserResponse
+from app.utils.responses import ModelResponse, user_values
+
+def test_user_values_reads_loaded_columns(test_user: User):
+    assert user_values(test_user) is test_user.__dict__
+    assert UserResponse.model_validate(user_values(test_user)).email == "test@example.com"
+
+def test_user_values_falls_back_to_expired_rows(session: Session, test_user: User):
+    session.expire(test_user)
+    assert user_values(test_user) is test_user
+    assert UserResponse.model_validate(user_values(test_user)).email == "test@example.com"
+
+def test_model_response_renders_json():
+    response = ModelResponse(UserResponse(id=1, name="A", email="a@example.com", is_active=True), status_code=201)
+    assert response.status_code == 201
+    assert response.headers["content-type"] == "application/json"
+    assert json.loads(response.body) == {"id": 1, "name": "A", "email": "a@example.com", "is_active": True}
@@ -0,0 +1,69 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from app.utils.metrics import REQUESTS_COALESCED
+from app.utils.singleflight import SingleFlight
+
+def wait_until(condition, timeout: float = 5.0) -> None:
+    deadline = time.monotonic() + timeout
+    while not condition():
+        assert time.monotonic() < deadline
+        time.sleep(0.001)
+
+def test_concurrent_calls_share_one_run():
+    flight = SingleFlight("test_share")
+    release = threading.Event()
+    calls = []
+
+    def read():
+        calls.append(1)
+        release.wait()
+        return b"body"
+
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        leader = executor.submit(flight.do, "key", read)
+        wait_until(lambda: flight.in_flight() == 1)
+        followers = [executor.submit(flight.do, "key", read) for _ in range(3)]
+        wait_until(lambda: REQUESTS_COALESCED.value("test_share") == 3)
+        release.set()
+        results = [leader.result()] + [follower.result() for follower in followers]
+
+    assert results == [b"body"] * 4
+    assert len(calls) == 1
+    assert flight.in_flight() == 0
+    # Once finished, the next call runs again.
+    assert flight.do("key", lambda: b"fresh") == b"fresh"
+
+def test_followers_get_the_leader_exception():
+    flight = SingleFlight("test_error")
+    release = threading.Event()
+
+    def fail():
+        release.wait()
+        raise LookupError("missing")
+
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        leader = executor.submit(flight.do, "key", fail)
+        wait_until(lambda: flight.in_flight() == 1)
+        follower = executor.submit(flight.do, "key", fail)
+        wait_until(lambda: REQUESTS_COALESCED.value("test_error") == 1)
+        release.set()
+        for future in (leader, follower):
+            with pytest.raises(LookupError):
+                future.result()
+    assert flight.in_flight() == 0
+
+def test_different_keys_do_not_wait_for_each_other():
+    flight = SingleFlight("test_keys")
+    release = threading.Event()
+
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        blocked = executor.submit(flight.do, 1, release.wait)
+        wait_until(lambda: flight.in_flight() == 1)
+        assert flight.do(2, lambda: "other") == "other"
+        release.set()
+        assert blocked.result() is True
+    assert REQUESTS_COALESCED.value("test_keys") == 0
@@ -0,0 +1,18 @@
+from app.utils.user_import import iter_lines, parse_csv, parse_ndjson
+
+def test_iter_lines_across_chunks():
+    chunks = [b'{"a": 1}\r', b'\n{"b": "\xc3', b'\xa9"}\n{"c"', b": 3}"]
+    assert list(iter_lines(chunks)) == ['{"a": 1}\r\n', '{"b": "é"}\n', '{"c": 3}']
+
+def test_parse_ndjson_reports_line_numbers():
+    records = list(parse_ndjson(['{"a": 1}\n', "\n", "[1]\n", "{oops\n"]))
+    assert records[0] == (1, {"a": 1})
+    assert records[1] == (3, "Expected a JSON object")
+    assert records[2][0] == 4
+    assert records[2][1].startswith("Invalid JSON")
+
+def test_parse_csv_drops_empty_cells():
+    lines = ["name,email,is_active\n", "A,a@example.com,\n", '"Multi\n', 'line",b@example.com,true\n']
+    records = list(parse_csv(lines))
+    assert records[0] == (2, {"name": "A", "email": "a@example.com"})
+    assert records[1] == (4, {"name": "Multi\nline", "email": "b@example.com", "is_active": "true"})